@@ -0,0 +1,71 @@
+import calendar
+from datetime import date, datetime
+
+from rest_framework.exceptions import ParseError
+
+from common.cache import bump_versions, get_versions
+from .models import BookedDay
+
+MAX_MONTHS = 12
+
+
+def calendar_version_name(room_pk):
+    return f"room-calendar:{room_pk}"
+
+
+def bump_calendars(*room_pks):
+    bump_versions(*(calendar_version_name(pk) for pk in room_pks if pk is not None))
+
+
+def get_calendar_version(room_pk):
+    (version,) = get_versions(calendar_version_name(room_pk))
+    return version
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise ParseError("month should be YYYY-MM.")
+
+
+def parse_months(value):
+    try:
+        months = int(value)
+    except ValueError:
+        raise ParseError("months should be an integer.")
+    if not 1 <= months <= MAX_MONTHS:
+        raise ParseError(f"months should be between 1 and {MAX_MONTHS}.")
+    return months
+
+
+def iter_months(first, count):
+    year, month = first.year, first.month
+    for _ in range(count):
+        yield date(year, month, 1), calendar.monthrange(year, month)[1]
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def build_calendar(room_pk, first, count):
+    """
+    first 달부터 count 달 동안의 예약 현황을 달마다 "0"/"1" 문자열(하루 한 글자, 1 = 예약됨)로 만든다.
+    BookedDay 의 (room, day) 유니크 인덱스로 범위 쿼리 한 번만 한다.
+    """
+    months = list(iter_months(first, count))
+    last_month, last_days = months[-1]
+    booked = set(
+        BookedDay.objects.filter(
+            room_id=room_pk,
+            day__range=(first, last_month.replace(day=last_days)),
+        ).values_list("day", flat=True)
+    )
+    return [
+        {
+            "month": month.strftime("%Y-%m"),
+            "days": "".join(
+                "1" if month.replace(day=day) in booked else "0"
+                for day in range(1, days + 1)
+            ),
+        }
+        for month, days in months
+    ]
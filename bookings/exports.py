@@ -0,0 +1,31 @@
+from common.exports import Export
+from .models import Booking
+
+# 재무/데이터 팀용 전체 예약 내보내기. 방/체험/예약자 정보는 JOIN 으로 한 번에 읽는다.
+BOOKING_EXPORT = Export(
+    "bookings",
+    Booking.objects.all(),
+    [
+        ("id", "id"),
+        ("kind", "kind"),
+        ("user_id", "user_id"),
+        ("username", "user__username"),
+        ("user_email", "user__email"),
+        ("room_id", "room_id"),
+        ("room_name", "room__name"),
+        ("room_city", "room__city"),
+        ("room_price", "room__price"),
+        ("room_owner_id", "room__owner_id"),
+        ("experience_id", "experience_id"),
+        ("experience_name", "experience__name"),
+        ("experience_city", "experience__city"),
+        ("experience_price", "experience__price"),
+        ("experience_host_id", "experience__host_id"),
+        ("check_in", "check_in"),
+        ("check_out", "check_out"),
+        ("experience_time", "experience_time"),
+        ("guests", "guests"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    ],
+)
@@ -0,0 +1,141 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test import RequestFactory
+from django.utils import timezone
+
+from bookings.filters import BookingRangeFilter
+from bookings.models import Booking
+from rooms.models import Room
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_filter(queryset, params, now):
+    """예전 DayFilter, MonthFilter, YearFilter 를 차례로 쌓았을 때와 같은 조건. (비교용)"""
+    for name, format, delta in (
+        ("day", "%Y-%m-%d", relativedelta(days=1)),
+        ("month", "%Y-%m", relativedelta(months=1)),
+        ("year", "%Y", relativedelta(years=1)),
+    ):
+        value = params.get(name)
+        if value:
+            start = datetime.strptime(value, format).date()
+            end = start + delta - relativedelta(days=1)
+            queryset = queryset.filter(
+                Q(check_in__range=[start, end]) |
+                Q(check_out__range=[start, end]) |
+                (Q(check_in__lte=start) & Q(check_out__gte=end))
+            )
+        else:
+            queryset = queryset.filter(check_in__gt=now)
+    return queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic room bookings and compare the stacked legacy date filters "
+        "with BookingRangeFilter. Data is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=1000)
+        parser.add_argument("--bookings", type=int, default=500_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                room_pks = self.seed(options)
+                self.run(options, room_pks)
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Rolled back seeded data.")
+
+    def seed(self, options):
+        owner = User.objects.create(username=f"benchmark-{time.time_ns()}")
+        Room.objects.bulk_create(
+            [
+                Room(
+                    name=f"Room {i}",
+                    price=1000,
+                    rooms=1,
+                    toilets=1,
+                    description="benchmark",
+                    address="benchmark",
+                    kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                    owner=owner,
+                )
+                for i in range(options["rooms"])
+            ],
+            batch_size=options["batch_size"],
+        )
+        room_pks = list(Room.objects.filter(owner=owner).values_list("pk", flat=True))
+        today = timezone.localdate()
+        bookings = []
+        for _ in range(options["bookings"]):
+            check_in = today + timedelta(days=random.randint(-730, 730))
+            bookings.append(
+                Booking(
+                    kind=Booking.BookingKindChoices.ROOM,
+                    user=owner,
+                    room_id=random.choice(room_pks),
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=random.randint(1, 6)),
+                    guests=1,
+                )
+            )
+        # 필터는 Booking 만 읽으므로 BookedDay 는 만들지 않는다.
+        Booking.objects.bulk_create(bookings, batch_size=options["batch_size"])
+        self.stdout.write(f"Seeded {len(room_pks)} rooms / {len(bookings)} bookings on {connection.vendor}.")
+        return room_pks
+
+    def time(self, build, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = len(build())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), count
+
+    def run(self, options, room_pks):
+        today = timezone.localdate()
+        now = timezone.localtime(timezone.now()).date()
+        factory = RequestFactory()
+        backend = BookingRangeFilter()
+        scenarios = {
+            "no params": {},
+            "day": {"day": str(today + timedelta(days=10))},
+            "month": {"month": (today + relativedelta(months=1)).strftime("%Y-%m")},
+            "year": {"year": str(today.year)},
+        }
+        for name, params in scenarios.items():
+            room_pk = random.choice(room_pks)
+            bookings = Booking.objects.filter(room_id=room_pk, kind=Booking.BookingKindChoices.ROOM)
+            # DRF 는 Request 의 query_params 를 읽으므로 같은 dict 를 가진 간단한 객체로 넘긴다.
+            request = factory.get("/", params)
+            request.query_params = request.GET
+
+            legacy, legacy_count = self.time(lambda: list(legacy_filter(bookings, params, now)), options["repeat"])
+            current, count = self.time(
+                lambda: list(backend.filter_queryset(request, bookings, view=None)),
+                options["repeat"],
+            )
+            self.stdout.write(
+                f"{name}: legacy {legacy:.2f}ms ({legacy_count} rows), "
+                f"range filter {current:.2f}ms ({count} rows)"
+            )
@@ -0,0 +1,7 @@
+from bookings.exports import BOOKING_EXPORT
+from common.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every booking with its room, experience and user fields to CSV or JSONL."
+    export = BOOKING_EXPORT
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bookings.models import Booking, BookedDay
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day room occupancy table (BookedDay) from room bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        # 제약(0004) 이전에 겹쳐 저장된 예약이 있으면 마이그레이션처럼 먼저 저장된 예약의 점유일만 남긴다.
+        bookings = (
+            Booking.objects.filter(
+                kind=Booking.BookingKindChoices.ROOM,
+                room__isnull=False,
+            )
+            .order_by("pk")
+            .only("pk", "kind", "room_id", "check_in", "check_out")
+        )
+        total = 0
+        with transaction.atomic():
+            BookedDay.objects.all().delete()
+            days = []
+            for booking in bookings.iterator(chunk_size=chunk_size):
+                days.extend(booking.booked_days())
+                if len(days) >= chunk_size:
+                    BookedDay.objects.bulk_create(days, batch_size=chunk_size, ignore_conflicts=True)
+                    total += len(days)
+                    days = []
+            BookedDay.objects.bulk_create(days, batch_size=chunk_size, ignore_conflicts=True)
+            total += len(days)
+            rebuilt = BookedDay.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rebuilt} booked days ({total - rebuilt} overlapping days skipped).")
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_room_rating_sum_room_review_count'),
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookedDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'kind', 'check_in', 'check_out'], name='booking_room_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['experience', 'kind', 'experience_time'], name='booking_experience_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='bookedday',
+            name='booking',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='days', to='bookings.booking'),
+        ),
+        migrations.AddField(
+            model_name='bookedday',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_days', to='rooms.room'),
+        ),
+        migrations.AddIndex(
+            model_name='bookedday',
+            index=models.Index(fields=['room', 'day'], name='booked_day_room_day_idx'),
+        ),
+    ]
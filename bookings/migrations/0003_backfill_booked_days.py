@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import F
+
+BATCH_SIZE = 2000
+
+
+def backfill_booked_days(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    BookedDay = apps.get_model("bookings", "BookedDay")
+    bookings = Booking.objects.filter(
+        kind="room",
+        room__isnull=False,
+        check_in__isnull=False,
+        check_out__gte=F("check_in"),
+    ).only("pk", "room_id", "check_in", "check_out")
+    days = []
+    for booking in bookings.iterator(chunk_size=BATCH_SIZE):
+        for offset in range((booking.check_out - booking.check_in).days + 1):
+            days.append(
+                BookedDay(booking_id=booking.pk, room_id=booking.room_id, day=booking.check_in + timedelta(days=offset))
+            )
+        # rebuild_booked_days 처럼 batch 단위로 쓰고 비워서 메모리가 예약 수에 비례해 늘지 않게 한다.
+        if len(days) >= BATCH_SIZE:
+            BookedDay.objects.bulk_create(days, batch_size=BATCH_SIZE)
+            days = []
+    BookedDay.objects.bulk_create(days, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_bookedday_booking_booking_room_range_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_booked_days, migrations.RunPython.noop),
+    ]
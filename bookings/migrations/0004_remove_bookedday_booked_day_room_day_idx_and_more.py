@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:23
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def drop_duplicate_days(apps, schema_editor):
+    # 제약 이전에 이미 겹쳐 저장된 예약이 있으면 먼저 저장된 예약의 점유일만 남긴다.
+    BookedDay = apps.get_model("bookings", "BookedDay")
+    keep = (
+        BookedDay.objects.values("room", "day")
+        .annotate(keep=Min("pk"))
+        .values("keep")
+    )
+    BookedDay.objects.exclude(pk__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_backfill_booked_days'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_days, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='bookedday',
+            name='booked_day_room_day_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='bookedday',
+            constraint=models.UniqueConstraint(fields=('room', 'day'), name='unique_booked_day'),
+        ),
+    ]
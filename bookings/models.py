@@ -1,4 +1,6 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, transaction
 
 from common.models import DateTimeModel
 from config import settings
@@ -46,5 +48,58 @@ class Booking(DateTimeModel):
     )
     guests = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "kind", "check_in", "check_out"],
+                name="booking_room_range_idx",
+            ),
+            models.Index(
+                fields=["experience", "kind", "experience_time"],
+                name="booking_experience_time_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.kind.title()} booking for: {self.user}"
+
+    def save(self, *args, **kwargs):
+        # post_save 에서 BookedDay 를 다시 만드는 작업이 예약과 같은 트랜잭션에 묶이도록 한다.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def booked_days(self):
+        # 겹침 검사가 check_in, check_out 을 모두 포함하므로 점유일도 양 끝을 포함한다.
+        if self.kind != self.BookingKindChoices.ROOM or not self.room_id:
+            return []
+        if not self.check_in or not self.check_out or self.check_out < self.check_in:
+            return []
+        return [
+            BookedDay(booking=self, room_id=self.room_id, day=self.check_in + timedelta(days=offset))
+            for offset in range((self.check_out - self.check_in).days + 1)
+        ]
+
+
+class BookedDay(models.Model):
+    """방 예약이 점유하는 날짜를 하루에 한 행씩 펼쳐둔 테이블. (room, day) 유니크 인덱스로 겹침/달력 조회를 한다."""
+
+    booking = models.ForeignKey(
+        "bookings.Booking",
+        on_delete=models.CASCADE,
+        related_name="days",
+    )
+    room = models.ForeignKey(
+        "rooms.Room",
+        on_delete=models.CASCADE,
+        related_name="booked_days",
+    )
+    day = models.DateField()
+
+    class Meta:
+        # 같은 방의 같은 날짜는 한 예약만 점유할 수 있다. 동시 예약의 경합은 이 제약이 가른다.
+        constraints = [
+            models.UniqueConstraint(fields=["room", "day"], name="unique_booked_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} / {self.day}"
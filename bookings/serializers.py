@@ -1,6 +1,7 @@
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from rest_framework import serializers
-from .models import Booking
+from .models import Booking, BookedDay
 
 
 class CreateRoomBookingSerializer(serializers.ModelSerializer):
@@ -30,16 +31,27 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
                 "Check in should be smaller than check out."
             )
 
-        if Booking.objects.filter(
+        # 예약 기간을 하루 단위로 펼친 BookedDay 의 (room, day) 인덱스로 겹침을 확인한다.
+        if BookedDay.objects.filter(
             room=self.context["room"],
-            check_in__lte=data["check_out"],
-            check_out__gte=data["check_in"],
+            day__range=(data["check_in"], data["check_out"]),
         ).exists():
             raise serializers.ValidationError(
                 "Those (or some) of those dates are already taken."
             )
         return data
 
+    def create(self, validated_data):
+        # validate 의 확인과 저장 사이에 다른 요청이 먼저 예약할 수 있다.
+        # BookedDay 의 (room, day) 유니크 제약에 걸리면 예약 전체를 롤백하고 400 으로 돌려준다.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                "Those (or some) of those dates are already taken."
+            )
+
 
 class PublicBookingSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rooms.models import Room
+from .calendar import bump_calendars
+from .models import Booking, BookedDay
+
+
+@receiver(post_save, sender=Booking)
+def sync_booked_days(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if not created:
+        # 방이 바뀌었으면 예전 방의 달력도 무효화한다.
+        bump_calendars(*instance.days.values_list("room_id", flat=True).distinct())
+        instance.days.all().delete()
+    BookedDay.objects.bulk_create(instance.booked_days())
+    bump_calendars(instance.room_id)
+
+
+@receiver(post_delete, sender=Booking)
+def invalidate_calendar_on_delete(sender, instance, **kwargs):
+    bump_calendars(instance.room_id)
+
+
+@receiver(post_delete, sender=Room)
+def invalidate_calendar_on_room_delete(sender, instance, **kwargs):
+    # 방을 지우면 예약은 SET_NULL 로 남고(시그널 없음) BookedDay 만 지워진다.
+    bump_calendars(instance.pk)
@@ -1,3 +1,279 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import threading
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from rooms.models import Room
+from users.models import User
+from .exports import BOOKING_EXPORT
+from .models import Booking, BookedDay
+from .views import BookingExport
+
+
+class TestRoomBookings(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}/bookings"
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def book(self, check_in, check_out):
+        return self.client.post(
+            self.url,
+            data={
+                "check_in": check_in,
+                "check_out": check_out,
+                "guests": 1,
+            },
+        )
+
+    def test_booked_days_follow_booking(self):
+        booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=self.today,
+            check_out=self.today + timedelta(days=2),
+            guests=1,
+        )
+        self.assertEqual(BookedDay.objects.filter(room=self.room).count(), 3)
+
+        booking.check_out = self.today + timedelta(days=4)
+        booking.save()
+        self.assertEqual(BookedDay.objects.filter(room=self.room).count(), 5)
+
+        booking.delete()
+        self.assertFalse(BookedDay.objects.exists())
+
+    def test_overlapping_booking_rejected(self):
+        self.client.force_login(self.user)
+        response = self.book(self.today + timedelta(days=1), self.today + timedelta(days=3))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.book(self.today + timedelta(days=3), self.today + timedelta(days=5))
+        self.assertEqual(response.status_code, 400)
+
+        response = self.book(self.today + timedelta(days=4), self.today + timedelta(days=5))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Booking.objects.filter(room=self.room).count(), 2)
+
+    def test_rebuild_skips_overlapping_days(self):
+        # 제약 이전에 저장된 겹치는 예약. (bulk_create 는 signal 을 보내지 않는다)
+        first, second = Booking.objects.bulk_create(
+            [
+                Booking(kind=Booking.BookingKindChoices.ROOM, user=self.user, room=self.room, check_in=check_in,
+                        check_out=check_in + timedelta(days=2), guests=1)
+                for check_in in (self.today, self.today + timedelta(days=1))
+            ]
+        )
+        out = io.StringIO()
+        call_command("rebuild_booked_days", chunk_size=2, stdout=out)
+        self.assertIn("Rebuilt 4 booked days (2 overlapping days skipped)", out.getvalue())
+        self.assertEqual(
+            list(BookedDay.objects.order_by("day").values_list("booking_id", flat=True)),
+            [first.pk] * 3 + [second.pk],
+        )
+
+    @override_settings(ALLOWED_HOSTS=["localhost"])
+    def test_benchmark_seeds_without_overlaps(self):
+        out = io.StringIO()
+        call_command("benchmark_room_search", rooms=5, bookings=500, repeat=1, stdout=out)
+        self.assertIn("Rolled back seeded data.", out.getvalue())
+
+
+class TestBookingRangeFilter(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}/bookings"
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def create(self, check_in, check_out):
+        return Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=check_in,
+            check_out=check_out,
+            guests=1,
+        )
+
+    def get_pks(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return {booking["pk"] for booking in response.json()["results"]}
+
+    def test_overlap_by_range_and_calendar_units(self):
+        spanning = self.create(date(2026, 1, 28), date(2026, 2, 3))
+        inside = self.create(date(2026, 2, 10), date(2026, 2, 12))
+        next_year = self.create(date(2027, 1, 1), date(2027, 1, 2))
+
+        self.assertEqual(self.get_pks("month=2026-02"), {spanning.pk, inside.pk})
+        self.assertEqual(self.get_pks("day=2026-02-03"), {spanning.pk})
+        self.assertEqual(self.get_pks("year=2027"), {next_year.pk})
+        self.assertEqual(self.get_pks("from=2026-02-04&to=2026-02-10"), {inside.pk})
+        self.assertEqual(self.get_pks("from=2026-02-13"), {next_year.pk})
+
+    def test_default_includes_ongoing_stays(self):
+        past = self.create(self.today - timedelta(days=5), self.today - timedelta(days=2))
+        ongoing = self.create(self.today - timedelta(days=1), self.today + timedelta(days=1))
+        upcoming = self.create(self.today + timedelta(days=3), self.today + timedelta(days=4))
+        pks = self.get_pks()
+        self.assertNotIn(past.pk, pks)
+        self.assertIn(ongoing.pk, pks)
+        self.assertIn(upcoming.pk, pks)
+
+    def test_invalid_range(self):
+        self.assertEqual(self.client.get(f"{self.url}?month=2026-13").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.url}?from=2026-02-10&to=2026-02-01").status_code, 400)
+
+
+class TestBookingExport(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="guest", email="guest@example.com")
+        self.staff = User.objects.create(username="staff", is_staff=True)
+        self.room = Room.objects.create(
+            name="한옥",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.staff,
+        )
+        start = date(2030, 1, 1)
+        for week in range(5):
+            Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.user,
+                room=self.room,
+                check_in=start + timedelta(weeks=week),
+                check_out=start + timedelta(weeks=week, days=2),
+                guests=2,
+            )
+
+    def test_batches_follow_primary_keys(self):
+        with self.assertNumQueries(3):
+            batches = list(BOOKING_EXPORT.batches(chunk_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        pks = [row[0] for batch in batches for row in batch]
+        self.assertEqual(pks, sorted(Booking.objects.values_list("pk", flat=True)))
+
+    def test_staff_only_streaming_csv(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/v1/bookings/export").status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get("/api/v1/bookings/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="bookings.csv"')
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["room_name"], "한옥")
+        self.assertEqual(rows[0]["user_email"], "guest@example.com")
+        self.assertEqual(rows[0]["check_in"], "2030-01-01")
+        self.assertEqual(rows[0]["experience_id"], "")
+
+        self.assertEqual(self.client.get("/api/v1/bookings/export?file_format=xlsx").status_code, 400)
+
+    async def test_asgi_streams_batches_asynchronously(self):
+        with mock.patch.object(BookingExport, "chunk_size", 2):
+            response = await self.async_client.get(
+                "/api/v1/bookings/export?file_format=jsonl",
+                headers={"Trust-Me": "staff"},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        # 헤더 없음(jsonl) + 2 + 2 + 1
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [0, 2, 2, 1])
+        self.assertEqual(json.loads(chunks[1].splitlines()[0])["room_name"], "한옥")
+
+
+class TestConcurrentRoomBookings(TransactionTestCase):
+    THREADS = 16
+    ATTEMPTS = 5
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def post(self, client, data):
+        # 파일 DB 의 busy timeout 동안 잠금을 기다리므로 다시 시도하지 않는다. 500 은 그대로 실패로 본다.
+        return client.post(f"/api/v1/rooms/{self.room.pk}/bookings", data=data)
+
+    def test_no_double_booking_under_contention(self):
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+
+        def book(offset):
+            # 테스트 클라이언트의 got_request_exception 수신은 스레드를 가리지 않으므로 예외를 다시 던지지 않게 한다.
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                for attempt in range(self.ATTEMPTS):
+                    # 모든 요청이 서로 겹치도록 같은 날을 포함하는 기간을 고른다.
+                    check_in = self.today + timedelta(days=10 + (offset + attempt) % 3)
+                    response = self.post(
+                        client,
+                        {
+                            "check_in": check_in,
+                            "check_out": check_in + timedelta(days=2),
+                            "guests": 1,
+                        },
+                    )
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(statuses), self.THREADS * self.ATTEMPTS)
+        # 하나만 성공하고 나머지는 모두 겹침으로 거절(400)되어야 한다. 500 이 섞이면 실패다.
+        self.assertEqual(sorted(set(statuses)), [200, 400])
+        self.assertEqual(statuses.count(200), 1)
+        self.assertEqual(Booking.objects.filter(room=self.room).count(), 1)
+        self.assertEqual(BookedDay.objects.filter(room=self.room).count(), 3)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import BookingExport
+
+urlpatterns = [
+    path("export", BookingExport.as_view()),
+]
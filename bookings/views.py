@@ -1,3 +1,6 @@
-from django.shortcuts import render
+from common.exports import ExportView
+from .exports import BOOKING_EXPORT
 
-# Create your views here.
+
+class BookingExport(ExportView):
+    export = BOOKING_EXPORT
@@ -1,11 +1,18 @@
 from rest_framework.viewsets import ModelViewSet
+
+from common.conditional import ConditionalGetMixin, row_validators, table_validators
 from .models import Category
 from .serializers import CategorySerializer
 
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, ModelViewSet):
 
     serializer_class = CategorySerializer
     queryset = Category.objects.filter(
         kind=Category.CategoryKindChoices.ROOMS,
     )
+
+    def get_validators(self, request, pk=None):
+        if self.action == "retrieve":
+            return row_validators(self.get_queryset(), pk=pk)
+        return table_validators(self.get_queryset())
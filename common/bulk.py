@@ -0,0 +1,35 @@
+from django.core.exceptions import ValidationError
+
+BULK_CHUNK_SIZE = 1000
+
+
+def chunked(values, size=BULK_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def chunked_pks(queryset, size=BULK_CHUNK_SIZE):
+    """
+    queryset 의 pk 를 size 개씩 나눠 돌려준다. 관리자 일괄 작업은 이 단위로 UPDATE ... WHERE pk IN (...) 을 보내
+    한 문장의 파라미터 수와 잠금 범위를 제한한다.
+    """
+    return chunked(queryset.order_by("pk").values_list("pk", flat=True), size)
+
+
+def action_value(model_admin, request, field):
+    """
+    변경 목록의 액션 폼(action_form)에 입력한 field 값. 비어 있거나 잘못되었으면 오류 메시지를 남기고 None.
+    (폼 전체를 검증하면 action 선택지가 비어 있어 실패하므로 필드 하나만 검증한다)
+    """
+    form_field = model_admin.action_form.base_fields[field]
+    try:
+        value = form_field.clean(request.POST.get(field))
+    except ValidationError as error:
+        value = None
+        message = f"{form_field.label}: {' '.join(error.messages)}"
+    else:
+        message = f"Fill in {form_field.label} to run this action."
+    if value is None:
+        model_admin.message_user(request, message, level="error")
+    return value
@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(name):
+    return f"version:{name}"
+
+
+def bump_versions(*names):
+    """
+    names 에 해당하는 버전을 올려서 그 버전으로 만든 캐시 키를 모두 무효화한다.
+    커밋 전에 올리면 다른 요청이 커밋 전 데이터로 캐시를 다시 채울 수 있으므로 커밋 후에 올린다.
+    """
+    names = set(names)
+    if names:
+        transaction.on_commit(lambda: _bump_versions(names))
+
+
+# 이보다 많은 객체를 한꺼번에 무효화할 때는 객체별 버전 대신 namespace 버전을 한 번만 올린다.
+BULK_BUMP_LIMIT = 500
+
+
+def list_version_name(namespace):
+    """namespace 의 객체가 하나라도 바뀌면 올라가는 버전. 목록 응답의 ETag 에 쓴다."""
+    return f"{namespace}:list"
+
+
+def bump_objects(namespace, pks):
+    """pks 객체들의 상세 캐시와 namespace 목록 버전을 무효화한다. 많으면 namespace 버전을 한 번만 올린다."""
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    if len(pks) > BULK_BUMP_LIMIT:
+        bump_versions(namespace, list_version_name(namespace))
+    else:
+        bump_versions(list_version_name(namespace), *(f"{namespace}:{pk}" for pk in pks))
+
+
+def _bump_versions(names):
+    for name in names:
+        try:
+            cache.incr(version_key(name))
+        except ValueError:
+            # 버전 키가 없으면(만료/축출) 어떤 예전 값과도 겹치지 않는 값으로 새로 시작한다.
+            cache.set(version_key(name), time.time_ns(), settings.VERSION_CACHE_TIMEOUT)
+
+
+def get_versions(*names):
+    """names 의 현재 버전. 없으면 새로 만든다. 버전 키는 VERSION_CACHE_TIMEOUT 뒤에 만료된다."""
+    keys = [version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, settings.VERSION_CACHE_TIMEOUT)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def detail_cache_key(namespace, pk):
+    """namespace 전체(카테고리/편의시설 등 공유 객체 변경)와 객체 하나의 버전을 모두 키에 넣는다."""
+    namespace_version, object_version = get_versions(namespace, f"{namespace}:{pk}")
+    return f"{namespace}:detail:{pk}:{namespace_version}:{object_version}"
+
+
+def get_or_build(key, build, timeout=None):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, settings.DETAIL_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
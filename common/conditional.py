@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import md5
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalResponse(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def make_etag(parts):
+    return quote_etag(md5(":".join(map(str, parts)).encode(), usedforsecurity=False).hexdigest())
+
+
+def table_validators(queryset):
+    """
+    목록의 검증값. 행 수(삭제)와 MAX(updated_at)(추가/수정)를 한 번의 집계로 구한다.
+    삭제는 MAX(updated_at) 을 바꾸지 않으므로 Last-Modified 는 주지 않는다.
+    """
+    stats = queryset.order_by().aggregate(count=Count("pk"), updated=Max("updated_at"))
+    return [stats["count"], stats["updated"]], None
+
+
+def row_validators(queryset, **lookup):
+    """객체 하나의 검증값. updated_at 만 읽는다. 없으면 (None, None) 이라 뷰가 404 를 돌려준다."""
+    updated = queryset.filter(**lookup).values_list("updated_at", flat=True).first()
+    if updated is None:
+        return None, None
+    return [updated], updated
+
+
+class ConditionalGetMixin:
+    """
+    GET/HEAD 응답에 ETag(와 Last-Modified)를 붙이고, 클라이언트가 가진 것과 같으면 조회/직렬화 없이 304 를 돌려준다.
+    검증값은 뷰의 get_validators() 가 캐시 버전이나 MAX(updated_at) 처럼 싸게 구한다. 인증/권한 확인 뒤에 계산한다.
+    캐시 버전을 쓰는 뷰는 versioned = True 로 두고, CACHE_VERSION_ETAGS 가 꺼져 있으면 검증값 없이 응답한다.
+    """
+
+    versioned = False
+
+    def get_validators(self, request, *args, **kwargs):
+        """(ETag 를 만들 값 목록, Last-Modified datetime) 을 돌려준다. 검증값이 없으면 (None, None)."""
+        return None, None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validator_headers = {}
+        if request.method not in ("GET", "HEAD"):
+            return
+        if self.versioned and not settings.CACHE_VERSION_ETAGS:
+            return
+        parts, last_modified = self.get_validators(request, *args, **kwargs)
+        if parts is None:
+            return
+        etag = make_etag(parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self.validator_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if timestamp is not None:
+            self.validator_headers["Last-Modified"] = http_date(timestamp)
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            raise ConditionalResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            for header, value in self.validator_headers.items():
+                exc.response.headers[header] = value
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == 200:
+            for header, value in getattr(self, "validator_headers", {}).items():
+                response.setdefault(header, value)
+        return response
@@ -0,0 +1,122 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode(latitude, longitude, precision=MAX_PRECISION):
+    """위도/경도를 geohash 로. 앞자리가 같으면 가까운 칸이므로 B-tree 인덱스의 범위 검색으로 지역을 찾을 수 있다."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        target, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """precision 자리 geohash 한 칸의 (위도 높이, 경도 너비)."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def split_bbox(west, south, east, north):
+    # 날짜변경선을 넘는 범위(west > east)는 두 상자로 나눈다.
+    if west <= east:
+        return [(west, south, east, north)]
+    return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+
+def count_cells(bbox, precision):
+    height, width = cell_size(precision)
+    total = 0
+    for west, south, east, north in split_bbox(*bbox):
+        rows = math.floor((north + 90) / height) - math.floor((south + 90) / height) + 1
+        columns = math.floor((east + 180) / width) - math.floor((west + 180) / width) + 1
+        total += rows * columns
+    return total
+
+
+def precision_for(bbox, max_cells):
+    """bbox 를 max_cells 개 이하의 칸으로 덮을 수 있는 가장 세밀한 자릿수."""
+    for precision in range(MAX_PRECISION, 0, -1):
+        if count_cells(bbox, precision) <= max_cells:
+            return precision
+    return 1
+
+
+def cover(bbox, precision):
+    """bbox 를 덮는 precision 자리 geohash 칸들."""
+    height, width = cell_size(precision)
+    cells = set()
+    for west, south, east, north in split_bbox(*bbox):
+        first_row = math.floor((south + 90) / height)
+        last_row = min(math.floor((north + 90) / height), round(180 / height) - 1)
+        first_column = math.floor((west + 180) / width)
+        last_column = min(math.floor((east + 180) / width), round(360 / width) - 1)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                cells.add(encode(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision))
+    return sorted(cells)
+
+
+def next_prefix(prefix):
+    """prefix 로 시작하는 모든 geohash 보다 큰 가장 작은 문자열. 모두 z 이면 None."""
+    prefix = prefix.rstrip(BASE32[-1])
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def cover_ranges(bbox, max_cells=32):
+    """
+    bbox 를 덮는 [start, end) geohash 범위 목록. (end 가 None 이면 끝까지)
+    이웃한 칸은 하나의 범위로 합쳐서 조건(OR) 수를 줄인다.
+    """
+    ranges = []
+    for cell in cover(bbox, precision_for(bbox, max_cells)):
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1][1] = next_prefix(cell)
+        else:
+            ranges.append([cell, next_prefix(cell)])
+    return [tuple(value) for value in ranges]
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """중심에서 radius_km 안을 모두 포함하는 (west, south, east, north)."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    if south == -90.0 or north == 90.0:
+        return -180.0, south, 180.0, north
+    lng_delta = lat_delta / max(math.cos(math.radians(max(abs(south), abs(north)))), 1e-12)
+    if lng_delta >= 180:
+        return -180.0, south, 180.0, north
+    west = (longitude - lng_delta + 540) % 360 - 180
+    east = (longitude + lng_delta + 540) % 360 - 180
+    return west, south, east, north
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """두 점 사이의 대원 거리(km, haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,45 @@
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 의존성이다. (poetry install -E compression)
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    br 을 받는 클라이언트의 GET 응답은 brotli 로, 나머지는 GZipMiddleware 대로 gzip 으로 압축한다.
+    brotli 에는 gzip 처럼 BREACH 완화용 임의 바이트를 넣을 자리가 없으므로, 토큰이 담길 수 있는 POST 응답
+    (로그인 등)과 스트리밍 응답에는 쓰지 않는다. brotli 패키지가 없으면 GZipMiddleware 와 같다.
+    """
+
+    min_length = 200
+
+    def process_response(self, request, response):
+        if (
+            brotli is None
+            or request.method != "GET"
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < self.min_length
+            or not re_accepts_brotli.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed_content = brotli.compress(response.content, quality=5)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers["Content-Length"] = str(len(response.content))
+
+        # 압축하면 바이트가 달라지므로 강한 ETag 는 약한 ETag 로 바꾼다. (GZipMiddleware 와 같다)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -1,7 +1,8 @@
-
-
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from common import geo
+
 
 class DateTimeModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -9,3 +10,43 @@ class DateTimeModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class LocationModel(models.Model):
+    """
+    위도/경도와 그로부터 계산한 geohash. geohash 는 save() 에서 채워지며 지도 범위 검색의 인덱스로 쓴다.
+    (bulk_create/update 는 save() 를 거치지 않으므로 geohash 도 직접 채워야 한다)
+    """
+
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        default="",
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def fill_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        self.fill_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,46 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimate_rows(model, using):
+    """DB 통계에 기록된 model 테이블의 행 수 추정치. 통계가 없으면 None."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "sqlite":
+            # ANALYZE 를 한 번도 하지 않았으면 sqlite_stat1 테이블이 없다.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # sqlite_stat1.stat 은 "행수 인덱스열별평균..." 형태의 문자열이다. (reltuples 는 분석 전이면 -1)
+    estimate = int(float(str(row[0]).split()[0]))
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    큰 테이블의 관리자 변경 목록용 페이지네이터. 요청마다 COUNT(*) 로 테이블 전체를 훑지 않는다.
+    - 조건 없는 목록은 DB 통계의 행 수 추정치(PostgreSQL reltuples, SQLite sqlite_stat1)를 쓴다.
+    - 조건이 있거나 추정치가 작으면 count_limit 개까지만 센다. 넘으면 그만큼의 페이지만 보여준다.
+    """
+
+    count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        # 주석(annotate) 서브쿼리와 정렬은 개수와 상관없으므로 pk 만 남겨 센다.
+        return queryset.order_by().values("pk")[: self.count_limit].count()
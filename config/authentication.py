@@ -1,8 +1,11 @@
 import jwt
 from django.conf import settings
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from users.cache import user_cache, get_token_version
 from users.models import User
 
 
@@ -12,27 +15,79 @@ class TrustMeBroAuthentication(BaseAuthentication):
         if not username:
             return None
         try:
-            user = User.objects.get(username=username)
+            user = user_cache.get(username=username)
             return user, None
         except User.DoesNotExist:
             raise AuthenticationFailed(f"No user {username}")
 
 
+class JWTUser(SimpleLazyObject):
+    """
+    pk 는 토큰 클레임으로 DB 없이 돌려주고, 그 외 속성이 필요해지면 그때 user_cache 에서 User 를 꺼내 감싼다.
+    username, is_host 는 토큰이 만료될 때까지 바뀔 수 있으므로(프로필 수정, 관리자 일괄 변경) 클레임으로 답하지 않는다.
+    """
+
+    CLAIM_ATTRS = ("pk", "id")
+
+    def __init__(self, claims):
+        pk = claims["pk"]
+        super().__init__(lambda: user_cache.get(pk=pk))
+        self.__dict__.update(
+            pk=pk,
+            id=pk,
+            is_authenticated=True,
+            is_anonymous=False,
+        )
+
+    def __setattr__(self, name, value):
+        # 값을 바꾸면 토큰에 담긴 예전 값 대신 User 의 값을 읽도록 한다.
+        if name in self.CLAIM_ATTRS:
+            self.__dict__.pop(name, None)
+        super().__setattr__(name, value)
+
+    def __bool__(self):
+        return True
+
+
+def create_jwt(user):
+    # 유저가 복호화 할 수 있기 때문에 중요정보는 넣지 않음
+    now = timezone.now()
+    return jwt.encode(
+        {
+            "pk": user.pk,
+            "username": user.username,
+            "is_host": user.is_host,
+            "ver": user.token_version,
+            "iat": now,
+            "exp": now + settings.JWT_EXPIRATION,
+        },
+        settings.SECRET_KEY,
+        algorithm="HS256",
+    )
+
+
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
         token = request.headers.get("Jwt")
         if not token:
             return None
-        decoded = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"],
-        )
+        try:
+            decoded = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=["HS256"],
+            )
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationFailed("Token Expired")
+        except jwt.InvalidTokenError:
+            raise AuthenticationFailed("Invalid Token")
         pk = decoded.get("pk")
         if not pk:
             raise AuthenticationFailed("Invalid Token")
-        try:
-            user = User.objects.get(pk=pk)
-            return user, None
-        except User.DoesNotExist:
+        version = get_token_version(pk)
+        if version is None:
             raise AuthenticationFailed("User Not Found")
+        # 버전이 없는 예전 토큰은 0 으로 보고, 한 번이라도 폐기(revoke)하면 더는 받지 않는다.
+        if decoded.get("ver", 0) != version:
+            raise AuthenticationFailed("Token Revoked")
+        return JWTUser(decoded), decoded
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 import environ
 import os
+from datetime import timedelta
 from pathlib import Path
 
 env = environ.Env()
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'rest_framework',
     "rest_framework.authtoken",
     "corsheaders",
+    "channels",
 
     # CUSTOM APPS
     'users',
@@ -58,10 +60,13 @@ INSTALLED_APPS = [
     'medias',
     "wishlists",
     'direct_messages',
+    'search',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # 응답 본문을 다루는 다른 미들웨어보다 앞에 두어야 마지막에 압축된다. (brotli 가 있으면 br, 없으면 gzip)
+    "common.middleware.CompressionMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.common.CommonMiddleware',
@@ -91,6 +96,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+ASGI_APPLICATION = "config.asgi.application"
+
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
@@ -99,10 +106,37 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 다른 연결이 쓰는 중이면 바로 "database is locked" 로 실패하지 않고 이 시간(초)까지 기다린다.
+        'OPTIONS': {'timeout': 20},
+        # 테스트도 파일 DB 로 돌린다. 인메모리 공유 캐시 DB 는 잠금을 기다리지 않아 동시 예약 테스트가 500 을 받는다.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
 
+# Cache
+# CACHE_URL 예) locmemcache://, filecache:///var/tmp/django_cache, rediscache://127.0.0.1:6379/1
+
+CACHES = {
+    'default': env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+# 캐시 버전(common.cache)으로 ETag 를 만들지. 버전 키는 만료되지 않으므로 워커마다 따로 갖는 캐시(locmem 등)면
+# 다른 워커의 변경을 모른 채 304 를 계속 돌려줄 수 있다. 그래서 공유 캐시(redis, memcached, db 등)일 때만 켠다.
+# 끄면 방/체험/프로필/달력은 ETag 없이 응답하고, DB 에서 읽는 검증값(편의시설, 카테고리 등)은 그대로 쓴다.
+CACHE_VERSION_ETAGS = env.bool(
+    "CACHE_VERSION_ETAGS",
+    default=not CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache")),
+)
+
+# 방/체험 상세 응답 캐시 유지 시간(초). 변경 시에는 signal 로 즉시 무효화된다.
+DETAIL_CACHE_TIMEOUT = env.int("DETAIL_CACHE_TIMEOUT", default=60 * 10)
+
+# 캐시 버전 키(common.cache) 유지 시간(초). 아무 pk 로나 조회해도 키가 영원히 쌓이지 않도록 만료시킨다.
+# 만료되면 예전과 겹치지 않는 새 버전으로 다시 시작하므로 캐시/ETag 가 한 번 새로 만들어질 뿐이다.
+VERSION_CACHE_TIMEOUT = env.int("VERSION_CACHE_TIMEOUT", default=60 * 60 * 24 * 30)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -168,3 +202,37 @@ CORS_ALLOW_CREDENTIALS = True
 CSRF_TRUSTED_ORIGINS = ["http://127.0.0.1:3000"]
 
 GH_SECRET = env("GH_SECRET")
+
+# 소셜 로그인. URL 은 테스트에서 로컬 스텁 서버로 바꿔 끼울 수 있도록 설정으로 둔다.
+GH_CLIENT_ID = env("GH_CLIENT_ID", default="3429bbb417261e7ad92f")
+GH_TOKEN_URL = env("GH_TOKEN_URL", default="https://github.com/login/oauth/access_token")
+GH_API_URL = env("GH_API_URL", default="https://api.github.com")
+
+KAKAO_CLIENT_ID = env("KAKAO_CLIENT_ID", default="483f1759e6da568fa36ef312e6ea4396")
+KAKAO_REDIRECT_URI = env("KAKAO_REDIRECT_URI", default="http://127.0.0.1:3000/social/kakao")
+KAKAO_TOKEN_URL = env("KAKAO_TOKEN_URL", default="https://kauth.kakao.com/oauth/token")
+KAKAO_API_URL = env("KAKAO_API_URL", default="https://kapi.kakao.com")
+
+# 외부 OAuth 서버 호출 타임아웃(초)
+OAUTH_HTTP_TIMEOUT = env.float("OAUTH_HTTP_TIMEOUT", default=5.0)
+
+# JWT 유효 기간과, 토큰 검증에 쓰는 유저/토큰 버전 캐시 유지 시간(초)
+JWT_EXPIRATION = timedelta(hours=env.int("JWT_EXPIRATION_HOURS", default=24))
+
+JWT_USER_CACHE_TTL = env.int("JWT_USER_CACHE_TTL", default=60)
+
+# 웹소켓(DM) 채널 레이어. 여러 프로세스로 띄울 때는 CHANNEL_REDIS_URL 로 channels_redis 를 쓴다.
+CHANNEL_REDIS_URL = env("CHANNEL_REDIS_URL", default=None)
+if CHANNEL_REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [CHANNEL_REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+# DM 저장 배치: 이 시간(초)마다 또는 이 개수가 모이면 한 번에 저장한다.
+MESSAGE_BATCH_INTERVAL = env.float("MESSAGE_BATCH_INTERVAL", default=0.05)
+MESSAGE_BATCH_SIZE = env.int("MESSAGE_BATCH_SIZE", default=100)
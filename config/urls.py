@@ -26,6 +26,10 @@ urlpatterns = [
     path("api/v1/medias/", include("medias.urls")),
     path("api/v1/wishlists/", include("wishlists.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/direct-messages/", include("direct_messages.urls")),
+    path("api/v1/search/", include("search.urls")),
+    path("api/v1/bookings/", include("bookings.urls")),
+    path("api/v1/reviews/", include("reviews.urls")),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ChattingRoom, Message
+from .models import ChattingRoom, Message, ReadMarker
 
 
 @admin.register(ChattingRoom)
@@ -22,3 +22,14 @@ class MessageAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("created_at",)
+
+
+@admin.register(ReadMarker)
+class ReadMarkerAdmin(admin.ModelAdmin):
+
+    list_display = (
+        "room",
+        "user",
+        "unread_count",
+        "last_read_at",
+    )
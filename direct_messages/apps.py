@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DirectMessagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'direct_messages'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import weakref
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .models import Message
+from .unread import record_new_messages
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBatcher:
+    """
+    웹소켓으로 들어온 메시지를 모아두었다가 MESSAGE_BATCH_INTERVAL 마다(또는 MESSAGE_BATCH_SIZE 개가 차면)
+    bulk_create 한 번으로 저장한다. add() 는 그 배치가 저장되면 끝나는 future 를 돌려주므로,
+    전달(fan-out)은 저장된 메시지만 한다. 저장에 실패하면 future 에 예외가 담긴다.
+    """
+
+    def __init__(self, interval, size):
+        self.interval = interval
+        self.size = size
+        self.pending = []
+        self.lock = asyncio.Lock()
+        self.flusher = None
+
+    def add(self, message):
+        saved = asyncio.get_running_loop().create_future()
+        self.pending.append((message, saved))
+        if len(self.pending) >= self.size:
+            asyncio.ensure_future(self.flush())
+        elif self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.ensure_future(self.flush_later())
+        return saved
+
+    async def flush_later(self):
+        await asyncio.sleep(self.interval)
+        await self.flush()
+
+    async def flush(self):
+        async with self.lock:
+            batch, self.pending = self.pending, []
+            if not batch:
+                return
+            try:
+                await database_sync_to_async(self.save)([message for message, _ in batch])
+            except Exception as error:
+                logger.exception("Failed to save %d direct messages", len(batch))
+                for _, saved in batch:
+                    saved.set_exception(error)
+            else:
+                for _, saved in batch:
+                    saved.set_result(True)
+
+    def save(self, batch):
+        with transaction.atomic():
+            Message.objects.bulk_create(batch)
+            record_new_messages(batch)
+
+
+# 이벤트 루프마다 배처를 하나씩 둔다. (ASGI 서버에서는 프로세스 전체가 하나를 공유한다)
+_batchers = weakref.WeakKeyDictionary()
+
+
+def get_batcher():
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = MessageBatcher(
+            interval=settings.MESSAGE_BATCH_INTERVAL,
+            size=settings.MESSAGE_BATCH_SIZE,
+        )
+        _batchers[loop] = batcher
+    return batcher
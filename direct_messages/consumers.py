@@ -0,0 +1,99 @@
+import asyncio
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .batching import get_batcher
+from .models import ChattingRoom, Message
+
+
+def user_group(user_pk):
+    return f"direct_messages.user.{user_pk}"
+
+
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    유저당 연결마다 그 유저의 그룹 하나에만 가입한다. 방에 메시지가 오면 방 멤버들의 유저 그룹으로 보낸다.
+    연결이 방 개수만큼 구독을 들고 있지 않으므로 유휴 연결은 채널 레이어와 DB 에 부담을 주지 않는다.
+    멤버는 메시지마다 다시 읽으므로 연결 뒤에 초대되거나 나간 멤버도 바로 반영된다.
+    메시지는 배치 저장이 끝난 뒤에 보내고, 저장에 실패하면 보낸 사람에게 error 로 알린다.
+
+    보내기: {"type": "message", "room": <pk>, "text": "..."}
+    받기:   {"type": "message", "room": <pk>, "user": {"pk", "username"}, "text": "...", "created_at": "..."}
+    """
+
+    async def connect(self):
+        self.user = self.scope.get("user")
+        if self.user is None or not self.user.is_authenticated:
+            await self.close()
+            return
+        self.group = user_group(self.user.pk)
+        self.last_delivery = None
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if hasattr(self, "group"):
+            # 저장을 기다리던 메시지는 마저 보낸다.
+            if self.last_delivery is not None:
+                await self.last_delivery
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    @database_sync_to_async
+    def load_members(self, room_pk):
+        return set(
+            ChattingRoom.users.through.objects.filter(chattingroom_id=room_pk).values_list("user_id", flat=True)
+        )
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("type") != "message":
+            await self.send_json({"type": "error", "detail": "Unknown type."})
+            return
+        room_pk = content.get("room")
+        text = content.get("text")
+        if not isinstance(text, str) or not text.strip():
+            await self.send_json({"type": "error", "detail": "text is required."})
+            return
+        members = await self.load_members(room_pk) if isinstance(room_pk, int) else set()
+        if self.user.pk not in members:
+            await self.send_json({"type": "error", "detail": "Not a member of this room."})
+            return
+
+        message = Message(text=text, user_id=self.user.pk, room_id=room_pk)
+        saved = get_batcher().add(message)
+        # 저장을 기다리는 동안에도 다음 메시지를 받아 같은 배치에 넣을 수 있도록 전달은 태스크로 넘기고,
+        # 앞 메시지의 전달이 끝난 뒤에 보내 순서를 지킨다.
+        self.last_delivery = asyncio.ensure_future(self.deliver(message, saved, members, self.last_delivery))
+
+    async def deliver(self, message, saved, members, previous):
+        try:
+            await saved
+        except Exception:
+            failed = True
+        else:
+            failed = False
+        if previous is not None:
+            await previous
+        if failed:
+            await self.send_json({"type": "error", "room": message.room_id, "detail": "Message could not be saved."})
+            return
+        event = {
+            "type": "chat.message",
+            "room": message.room_id,
+            "user": {"pk": self.user.pk, "username": self.user.username},
+            "text": message.text,
+            "created_at": message.created_at.isoformat(),
+        }
+        for member_pk in members:
+            await self.channel_layer.group_send(user_group(member_pk), event)
+
+    async def chat_message(self, event):
+        await self.send_json(
+            {
+                "type": "message",
+                "room": event["room"],
+                "user": event["user"],
+                "text": event["text"],
+                "created_at": event["created_at"],
+            }
+        )
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill_read_markers(apps, schema_editor):
+    ChattingRoom = apps.get_model("direct_messages", "ChattingRoom")
+    Message = apps.get_model("direct_messages", "Message")
+    ReadMarker = apps.get_model("direct_messages", "ReadMarker")
+
+    # 기존 메시지는 모두 안 읽은 것으로 본다. (방 전체 메시지 수 - 내가 보낸 메시지 수)
+    totals = Counter()
+    sent = Counter()
+    counts = Message.objects.order_by().values("room_id", "user_id").annotate(count=Count("pk"))
+    for row in counts:
+        totals[row["room_id"]] += row["count"]
+        sent[(row["room_id"], row["user_id"])] = row["count"]
+
+    memberships = ChattingRoom.users.through.objects.values_list("chattingroom_id", "user_id")
+    ReadMarker.objects.bulk_create(
+        [
+            ReadMarker(
+                room_id=room_pk,
+                user_id=user_pk,
+                unread_count=totals[room_pk] - sent[(room_pk, user_pk)],
+            )
+            for room_pk, user_pk in memberships.iterator(chunk_size=2000)
+        ],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('direct_messages', '0002_read_markers'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_read_markers, migrations.RunPython.noop),
+    ]
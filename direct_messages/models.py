@@ -28,5 +28,36 @@ class Message(DateTimeModel):
         related_name="messages",
     )
 
+    class Meta:
+        indexes = [
+            # 방별 히스토리를 (created_at, id) 키셋으로 거꾸로 읽는다.
+            models.Index(fields=["room", "created_at", "id"], name="message_room_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} says: {self.text}"
+
+
+class ReadMarker(models.Model):
+    """방 멤버마다 하나씩. 안 읽은 메시지 수를 COUNT 대신 카운터로 들고 있는다."""
+
+    room = models.ForeignKey(
+        "direct_messages.ChattingRoom",
+        on_delete=models.CASCADE,
+        related_name="read_markers",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="read_markers",
+    )
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "room"], name="unique_read_marker"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} in {self.room}: {self.unread_count} unread"
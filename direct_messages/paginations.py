@@ -0,0 +1,65 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InboxPagination(PageNumberPagination):
+    page_size = 20
+
+
+class MessageHistoryPagination(BasePagination):
+    """
+    최신 메시지부터 (created_at, id) 키셋으로 거꾸로 넘긴다.
+    OFFSET 없이 message_room_created_idx 를 타고 바로 커서 위치부터 읽으므로 오래된 페이지도 빠르다.
+    """
+
+    page_size = 30
+    cursor_query_param = "before"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            # created_at__lte 로 인덱스 범위를 먼저 자르고, 같은 시각은 id 로 가른다.
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(pk__lt=pk),
+                created_at__lte=created_at,
+            )
+        messages = list(queryset.order_by("-created_at", "-pk")[: self.page_size + 1])
+        self.has_next = len(messages) > self.page_size
+        self.page = messages[: self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(last))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def encode_cursor(self, message):
+        raw = f"{message.created_at.isoformat()}|{message.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, pk = raw.rsplit("|", 1)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
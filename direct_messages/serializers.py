@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from rest_framework.serializers import ModelSerializer
+
+from users.serializers import TinyUserSerializer
+from .models import Message, ReadMarker
+
+
+class MessageSerializer(ModelSerializer):
+
+    user = TinyUserSerializer(read_only=True)
+
+    class Meta:
+        model = Message
+        fields = (
+            "pk",
+            "text",
+            "user",
+            "created_at",
+        )
+
+
+class InboxSerializer(ModelSerializer):
+
+    pk = serializers.IntegerField(source="room_id")
+    users = TinyUserSerializer(source="room.users", many=True, read_only=True)
+    updated_at = serializers.DateTimeField(source="room.updated_at")
+
+    class Meta:
+        model = ReadMarker
+        fields = (
+            "pk",
+            "users",
+            "unread_count",
+            "last_read_at",
+            "updated_at",
+        )
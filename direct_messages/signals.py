@@ -0,0 +1,30 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import ChattingRoom, Message, ReadMarker
+from .unread import create_read_markers, record_new_messages
+
+
+@receiver(m2m_changed, sender=ChattingRoom.users.through)
+def sync_read_markers(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_add":
+        if reverse:
+            create_read_markers((room_pk, instance.pk) for room_pk in pk_set)
+        else:
+            create_read_markers((instance.pk, user_pk) for user_pk in pk_set)
+    elif action == "post_remove":
+        if reverse:
+            ReadMarker.objects.filter(user=instance, room__in=pk_set).delete()
+        else:
+            ReadMarker.objects.filter(room=instance, user__in=pk_set).delete()
+    elif action == "post_clear":
+        if reverse:
+            ReadMarker.objects.filter(user=instance).delete()
+        else:
+            ReadMarker.objects.filter(room=instance).delete()
+
+
+@receiver(post_save, sender=Message)
+def count_unread_message(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_new_messages([instance])
@@ -1,3 +1,173 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.db import DatabaseError
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .batching import MessageBatcher, get_batcher
+from .models import ChattingRoom, Message, ReadMarker
+from .routing import websocket_urlpatterns
+
+
+class TestChatConsumer(TransactionTestCase):
+    # database_sync_to_async 가 연결을 닫으므로 테스트를 트랜잭션으로 감싸지 않는다. (파일 테스트 DB)
+    def setUp(self):
+        self.alice = User.objects.create(username="alice")
+        self.bob = User.objects.create(username="bob")
+        self.eve = User.objects.create(username="eve")
+        self.room = ChattingRoom.objects.create()
+        self.room.users.add(self.alice, self.bob)
+
+    async def connect(self, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/direct-messages/")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        return communicator, connected
+
+    async def test_anonymous_is_rejected(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/direct-messages/")
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+    async def test_message_fans_out_to_members_and_is_saved(self):
+        alice, _ = await self.connect(self.alice)
+        bob, _ = await self.connect(self.bob)
+        eve, _ = await self.connect(self.eve)
+
+        await alice.send_json_to({"type": "message", "room": self.room.pk, "text": "hi"})
+        for communicator in (alice, bob):
+            received = await communicator.receive_json_from()
+            self.assertEqual(received["text"], "hi")
+            self.assertEqual(received["room"], self.room.pk)
+            self.assertEqual(received["user"]["username"], "alice")
+        self.assertTrue(await eve.receive_nothing())
+
+        await get_batcher().flush()
+        self.assertEqual(await Message.objects.filter(room=self.room, user=self.alice).acount(), 1)
+        # 배치 저장도 안 읽은 수를 올린다.
+        bob_marker = await ReadMarker.objects.aget(room=self.room, user=self.bob)
+        alice_marker = await ReadMarker.objects.aget(room=self.room, user=self.alice)
+        self.assertEqual((bob_marker.unread_count, alice_marker.unread_count), (1, 0))
+
+        for communicator in (alice, bob, eve):
+            await communicator.disconnect()
+
+    async def test_non_member_cannot_send(self):
+        eve, _ = await self.connect(self.eve)
+        await eve.send_json_to({"type": "message", "room": self.room.pk, "text": "hi"})
+        received = await eve.receive_json_from()
+        self.assertEqual(received["type"], "error")
+        await get_batcher().flush()
+        self.assertEqual(await Message.objects.acount(), 0)
+        await eve.disconnect()
+
+    async def test_membership_changes_after_connect(self):
+        alice, _ = await self.connect(self.alice)
+        bob, _ = await self.connect(self.bob)
+        eve, _ = await self.connect(self.eve)
+        await self.room.users.aadd(self.eve)
+        await self.room.users.aremove(self.bob)
+
+        await eve.send_json_to({"type": "message", "room": self.room.pk, "text": "joined"})
+        for communicator in (alice, eve):
+            self.assertEqual((await communicator.receive_json_from())["text"], "joined")
+        self.assertTrue(await bob.receive_nothing())
+
+        await bob.send_json_to({"type": "message", "room": self.room.pk, "text": "left"})
+        self.assertEqual((await bob.receive_json_from())["type"], "error")
+        self.assertFalse(await Message.objects.filter(text="left").aexists())
+
+        for communicator in (alice, bob, eve):
+            await communicator.disconnect()
+
+    async def test_unsaved_messages_are_not_delivered(self):
+        alice, _ = await self.connect(self.alice)
+        bob, _ = await self.connect(self.bob)
+        failing_save = mock.patch.object(MessageBatcher, "save", side_effect=DatabaseError("down"))
+        with failing_save, self.assertLogs("direct_messages.batching", "ERROR"):
+            await alice.send_json_to({"type": "message", "room": self.room.pk, "text": "hi"})
+            received = await alice.receive_json_from()
+        self.assertEqual((received["type"], received["room"]), ("error", self.room.pk))
+        self.assertTrue(await bob.receive_nothing())
+        for communicator in (alice, bob):
+            await communicator.disconnect()
+
+    async def test_messages_are_saved_in_batches(self):
+        alice, _ = await self.connect(self.alice)
+        for i in range(10):
+            await alice.send_json_to({"type": "message", "room": self.room.pk, "text": f"m{i}"})
+        for i in range(10):
+            await alice.receive_json_from()
+        await get_batcher().flush()
+        texts = [text async for text in Message.objects.order_by("pk").values_list("text", flat=True)]
+        self.assertEqual(texts, [f"m{i}" for i in range(10)])
+        await alice.disconnect()
+
+
+class TestDirectMessageApi(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username="alice")
+        self.bob = User.objects.create(username="bob")
+        self.room = ChattingRoom.objects.create()
+        self.room.users.add(self.alice, self.bob)
+        self.client.force_authenticate(self.bob)
+
+    def test_history_pages_backward_by_keyset(self):
+        # 같은 시각의 메시지도 id 로 갈라서 빠짐없이 넘어가야 한다.
+        now = timezone.now()
+        messages = Message.objects.bulk_create(
+            [Message(text=f"m{i}", user=self.alice, room=self.room) for i in range(65)]
+        )
+        Message.objects.filter(pk__in=[m.pk for m in messages]).update(created_at=now)
+
+        texts = []
+        url = f"/api/v1/direct-messages/{self.room.pk}/messages"
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            texts += [message["text"] for message in response.json()["results"]]
+            url = response.json()["next"]
+        self.assertEqual(texts, [f"m{i}" for i in reversed(range(65))])
+
+    def test_history_rejects_non_member_and_bad_cursor(self):
+        outsider = User.objects.create(username="eve")
+        self.client.force_authenticate(outsider)
+        response = self.client.get(f"/api/v1/direct-messages/{self.room.pk}/messages")
+        self.assertEqual(response.status_code, 404)
+
+        self.client.force_authenticate(self.bob)
+        response = self.client.get(f"/api/v1/direct-messages/{self.room.pk}/messages?before=nope")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unread_counts_and_mark_read(self):
+        other_room = ChattingRoom.objects.create()
+        other_room.users.add(self.alice, self.bob)
+        for i in range(3):
+            Message.objects.create(text=f"m{i}", user=self.alice, room=self.room)
+        Message.objects.create(text="mine", user=self.bob, room=self.room)
+        Message.objects.create(text="other", user=self.alice, room=other_room)
+
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/direct-messages/")
+        inbox = {room["pk"]: room["unread_count"] for room in response.json()["results"]}
+        self.assertEqual(inbox, {self.room.pk: 3, other_room.pk: 1})
+        self.assertEqual(response.json()["results"][0]["pk"], other_room.pk)
+        self.assertEqual(self.client.get("/api/v1/direct-messages/unread").json(), {"unread_count": 4})
+
+        response = self.client.put(f"/api/v1/direct-messages/{self.room.pk}/read")
+        self.assertEqual(response.json()["unread_count"], 0)
+        self.assertEqual(self.client.get("/api/v1/direct-messages/unread").json(), {"unread_count": 1})
+
+    def test_markers_follow_membership(self):
+        carol = User.objects.create(username="carol")
+        self.room.users.add(carol)
+        self.assertTrue(ReadMarker.objects.filter(room=self.room, user=carol).exists())
+        carol.chatting_rooms.remove(self.room)
+        self.assertFalse(ReadMarker.objects.filter(room=self.room, user=carol).exists())
+        self.room.users.clear()
+        self.assertFalse(ReadMarker.objects.filter(room=self.room).exists())
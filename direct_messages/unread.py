@@ -0,0 +1,33 @@
+from collections import Counter
+
+from django.db.models import F
+
+from .models import ChattingRoom, ReadMarker
+
+
+def create_read_markers(pairs):
+    """(room_pk, user_pk) 쌍마다 ReadMarker 를 만든다. 이미 있으면 그대로 둔다."""
+    ReadMarker.objects.bulk_create(
+        [ReadMarker(room_id=room_pk, user_id=user_pk) for room_pk, user_pk in pairs],
+        ignore_conflicts=True,
+    )
+
+
+def record_new_messages(messages):
+    """
+    새 메시지만큼 보낸 사람을 제외한 멤버들의 unread_count 를 올리고, 방의 updated_at(마지막 활동)을 갱신한다.
+    bulk_create 는 post_save 를 보내지 않으므로 배처도 이 함수를 직접 부른다.
+    """
+    counts = Counter((message.room_id, message.user_id) for message in messages)
+    for (room_pk, sender_pk), count in counts.items():
+        markers = ReadMarker.objects.filter(room_id=room_pk)
+        if sender_pk is not None:
+            markers = markers.exclude(user_id=sender_pk)
+        markers.update(unread_count=F("unread_count") + count)
+
+    latest = {}
+    for message in messages:
+        if message.room_id not in latest or latest[message.room_id] < message.created_at:
+            latest[message.room_id] = message.created_at
+    for room_pk, created_at in latest.items():
+        ChattingRoom.objects.filter(pk=room_pk).update(updated_at=created_at)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import Inbox, UnreadCount, MessageHistory, MarkRead
+
+urlpatterns = [
+    path("", Inbox.as_view()),
+    path("unread", UnreadCount.as_view()),
+    path("<int:pk>/messages", MessageHistory.as_view()),
+    path("<int:pk>/read", MarkRead.as_view()),
+]
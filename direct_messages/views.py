@@ -1,3 +1,58 @@
-from django.shortcuts import render
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .models import ChattingRoom, ReadMarker
+from .paginations import InboxPagination, MessageHistoryPagination
+from .serializers import InboxSerializer, MessageSerializer
+
+
+class Inbox(generics.ListAPIView):
+    # 안 읽은 수는 ReadMarker 카운터를 그대로 읽는다. (방마다 COUNT(*) 하지 않는다)
+    permission_classes = [IsAuthenticated]
+    serializer_class = InboxSerializer
+    pagination_class = InboxPagination
+
+    def get_queryset(self):
+        return (
+            ReadMarker.objects.filter(user=self.request.user)
+            .select_related("room")
+            .prefetch_related("room__users")
+            .order_by("-room__updated_at", "-room_id")
+        )
+
+
+class UnreadCount(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        unread = ReadMarker.objects.filter(user=request.user).aggregate(
+            unread_count=Coalesce(Sum("unread_count"), 0),
+        )
+        return Response(unread)
+
+
+class MessageHistory(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = MessageSerializer
+    pagination_class = MessageHistoryPagination
+
+    def get_queryset(self):
+        room = get_object_or_404(ChattingRoom, pk=self.kwargs["pk"], users=self.request.user)
+        return room.messages.select_related("user")
+
+
+class MarkRead(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk):
+        marker = ReadMarker.objects.filter(room=pk, user=request.user)
+        if not marker.update(unread_count=0, last_read_at=timezone.now()):
+            raise NotFound
+        return Response(InboxSerializer(marker.select_related("room").prefetch_related("room__users").get()).data)
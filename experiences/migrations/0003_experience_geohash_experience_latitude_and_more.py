@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:49
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiences', '0002_experience_rating_sum_experience_review_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['geohash', 'latitude', 'longitude'], name='experience_geohash_idx'),
+        ),
+    ]
@@ -1,10 +1,9 @@
 from django.db import models
-from django.db.models import Avg
 
-from common.models import DateTimeModel
+from common.models import DateTimeModel, LocationModel
 
 
-class Experience(DateTimeModel):
+class Experience(DateTimeModel, LocationModel):
     country = models.CharField(
         max_length=50,
         default="한국",
@@ -39,13 +38,31 @@ class Experience(DateTimeModel):
         on_delete=models.SET_NULL,
         related_name="experiences",
     )
+    # 리뷰 생성/수정/삭제 시 reviews.signals 에서 갱신된다. (rebuild_ratings 커맨드로 재계산)
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["geohash", "latitude", "longitude"], name="experience_geohash_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def total_reviews(self):
+        return self.review_count
+
     def rating(self):
-        average_rating = self.reviews.aggregate(Avg('rating'))['rating__avg']
-        return 0 if average_rating is None else round(average_rating, 2)
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 2)
 
 
 class Perk(DateTimeModel):
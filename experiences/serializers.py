@@ -4,8 +4,9 @@ from rest_framework.relations import PrimaryKeyRelatedField
 from categories.models import Category
 from categories.serializers import CategorySerializer
 from medias.serializers import PhotoSerializer, VideoSerializer
+from reviews.paginations import ExperienceReviewPagination
 from reviews.serializers import ReviewSerializer
-from wishlists.models import Wishlist
+from wishlists.liked import get_liked_ids
 from .models import Perk, Experience
 
 
@@ -33,8 +34,7 @@ class ExperienceWishListSerializer(serializers.ModelSerializer):
         ]
 
     def get_is_liked(self, experience):
-        owner = self.context["request"].user
-        return Wishlist.objects.filter(owner=owner, experiences__pk=experience.pk).exists()
+        return experience.pk in get_liked_ids(self.context["request"])["experiences"]
 
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -66,11 +66,10 @@ class ExperienceSerializer(serializers.ModelSerializer):
 
     def get_is_owner(self, experience):
         request = self.context["request"]
-        return experience.host == request.user
+        return experience.host_id == request.user.pk
 
     def get_is_liked(self, experience):
-        request = self.context["request"]
-        return Wishlist.objects.filter(user=request.user, experiences__pk=experience.pk).exists()
+        return experience.pk in get_liked_ids(self.context["request"])["experiences"]
 
     def create(self, validated_data):
         experience = Experience.objects.create(host=self.context["request"].user, **validated_data)
@@ -79,13 +78,17 @@ class ExperienceSerializer(serializers.ModelSerializer):
 
 class ExperienceDetailSerializer(serializers.ModelSerializer):
     category = PrimaryKeyRelatedField(queryset=Category.objects.all())
-    perks = serializers.PrimaryKeyRelatedField(queryset=Perk.objects.all(), many=True)
+    # 응답에서는 to_representation 에서 PerkSerializer 로 한 번만 직렬화한다.
+    perks = serializers.PrimaryKeyRelatedField(queryset=Perk.objects.all(), many=True, write_only=True)
     rating = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     photos = PhotoSerializer(many=True, read_only=True)
-    video = VideoSerializer(read_only=True)
-    reviews = ReviewSerializer(many=True, read_only=True)
+    video = VideoSerializer(read_only=True, source="videos")
+    # 리뷰는 첫 페이지만 싣고 나머지는 reviews_url 에서 페이지 단위로 읽는다.
+    reviews = serializers.SerializerMethodField()
+    reviews_count = serializers.IntegerField(source="review_count", read_only=True)
+    reviews_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Experience
@@ -97,6 +100,8 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
             "host",
             "price",
             "address",
+            "latitude",
+            "longitude",
             "start",
             "end",
             "description",
@@ -108,18 +113,26 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
             "photos",
             "video",
             "reviews",
+            "reviews_count",
+            "reviews_url",
         ]
 
     def get_rating(self, experience):
         return experience.rating()
 
+    def get_reviews(self, experience):
+        reviews = experience.reviews.select_related("user").order_by("-created_at", "-pk")
+        return ReviewSerializer(reviews[:ExperienceReviewPagination.page_size], many=True).data
+
+    def get_reviews_url(self, experience):
+        return f"/api/v1/experiences/{experience.pk}/reviews"
+
     def get_is_owner(self, experience):
         request = self.context["request"]
-        return experience.host == request.user
+        return experience.host_id == request.user.pk
 
     def get_is_liked(self, experience):
-        request = self.context["request"]
-        return Wishlist.objects.filter(user=request.user, experiences__pk=experience.pk).exists()
+        return experience.pk in get_liked_ids(self.context["request"])["experiences"]
 
     def validate(self, data):
         category = data.get("category")
@@ -160,3 +173,16 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
         data['category'] = CategorySerializer(instance.category).data
         data['perks'] = PerkSerializer(instance.perks, many=True).data
         return data
+
+
+class PublicExperienceDetailSerializer(ExperienceDetailSerializer):
+    """요청한 유저와 무관한 부분만 직렬화한다. 캐시에 저장되고 is_owner, is_liked 는 뷰에서 덧붙인다."""
+
+    is_owner = None
+    is_liked = None
+
+    class Meta(ExperienceDetailSerializer.Meta):
+        fields = [
+            field for field in ExperienceDetailSerializer.Meta.fields
+            if field not in ("is_owner", "is_liked")
+        ]
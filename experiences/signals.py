@@ -0,0 +1,69 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from categories.models import Category
+from common.cache import bump_objects, bump_versions
+from medias.models import Photo, Video
+from reviews.models import Review
+from users.models import User
+from .models import Experience, Perk
+
+# 체험 상세 캐시(ExperiencesDetail) 무효화.
+# 체험 하나에 속한 변경은 "experiences:<pk>" 버전을, 여러 체험이 공유하는 객체의 변경은 "experiences" 버전을 올린다.
+
+
+def bump_experiences(*pks):
+    bump_objects("experiences", pks)
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def invalidate_experience(sender, instance, **kwargs):
+    bump_experiences(instance.pk)
+
+
+@receiver(m2m_changed, sender=Experience.perks.through)
+def invalidate_experience_perks(sender, instance, reverse, pk_set, **kwargs):
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        bump_experiences(instance.pk)
+    elif pk_set:
+        bump_experiences(*pk_set)
+    else:
+        bump_versions("experiences")
+
+
+@receiver(post_save, sender=Perk)
+@receiver(post_delete, sender=Perk)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_all_experiences(sender, **kwargs):
+    bump_versions("experiences")
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def invalidate_experience_of(sender, instance, **kwargs):
+    bump_experiences(instance.experience_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_experience_of_review(sender, instance, **kwargs):
+    # 리뷰가 다른 체험으로 옮겨지면 이전 체험의 평점도 바뀐다. (reviews.signals 가 저장 전 값을 기억해둔다)
+    previous = getattr(instance, "_previous_review", None) or {}
+    bump_experiences(instance.experience_id, previous.get("experience_id"))
+
+
+@receiver(post_save, sender=User)
+def invalidate_experiences_of_host(sender, instance, created, update_fields, **kwargs):
+    # 로그인 시 last_login 만 저장되는 경우처럼 상세 응답에 드러나지 않는 저장은 무시한다.
+    if created or (update_fields and set(update_fields) <= {"last_login", "password", "token_version"}):
+        return
+    bump_experiences(
+        *instance.experiences.values_list("pk", flat=True),
+        *instance.reviews.filter(experience__isnull=False).values_list("experience_id", flat=True),
+    )
@@ -1,3 +1,56 @@
-from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from categories.models import Category
+from medias.models import Photo, Video
+from reviews.models import Review
+from users.models import User
+from .models import Experience, Perk
+
+
+class TestExperienceDetail(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="test")
+        self.experience = Experience.objects.create(
+            name="Experience",
+            host=self.user,
+            price=100,
+            address="address",
+            start="10:00",
+            end="12:00",
+            description="desc",
+            category=Category.objects.create(name="Tour", kind=Category.CategoryKindChoices.EXPERIENCES),
+        )
+        for i in range(3):
+            self.experience.perks.add(Perk.objects.create(name=f"Perk {i}"))
+            Photo.objects.create(file="https://example.com/a.jpg", description="photo", experience=self.experience)
+        Video.objects.create(file="https://example.com/a.mp4", experience=self.experience)
+        for i in range(20):
+            reviewer = User.objects.create(username=f"reviewer{i}")
+            Review.objects.create(user=reviewer, experience=self.experience, payload=f"review {i}", rating=5)
+        self.url = f"/api/v1/experiences/{self.experience.pk}"
+
+    def test_query_count(self):
+        # experience(+category, video) + perks + photos + first page of reviews(+user)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        data = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["category"]["name"], "Tour")
+        self.assertEqual(len(data["perks"]), 3)
+        self.assertEqual(len(data["photos"]), 3)
+        self.assertEqual(data["video"]["file"], "https://example.com/a.mp4")
+        self.assertEqual(data["rating"], 5)
+        self.assertEqual(data["reviews_count"], 20)
+        self.assertEqual(len(data["reviews"]), 3)
+        self.assertEqual(data["reviews"][0]["payload"], "review 19")
+        self.assertEqual(data["reviews_url"], f"{self.url}/reviews")
+
+    def test_reviews_endpoint_continues_preview(self):
+        response = self.client.get(f"{self.url}/reviews", {"page": 2})
+        data = response.json()
+
+        self.assertEqual(data["count"], 20)
+        self.assertEqual([review["payload"] for review in data["results"]], ["review 16", "review 15", "review 14"])
@@ -1,4 +1,3 @@
-from django.utils import timezone
 from rest_framework import status
 from rest_framework import generics
 from rest_framework.exceptions import PermissionDenied, ParseError
@@ -8,16 +7,29 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from bookings.filters import BookingRangeFilter
 from bookings.models import Booking
 from bookings.serializers import PublicBookingSerializer, CreateExperienceBookingSerializer
+from common.cache import detail_cache_key, get_or_build, get_versions, list_version_name
+from common.conditional import ConditionalGetMixin, row_validators, table_validators
 from medias.models import Video
 from medias.serializers import PhotoSerializer, VideoSerializer
+from reviews.paginations import ExperienceReviewPagination
 from reviews.serializers import ReviewSerializer
+from wishlists.liked import get_liked_ids, viewer_versions
 from .models import Perk, Experience
-from .serializers import PerkSerializer, ExperienceSerializer, ExperienceDetailSerializer
+from .serializers import (
+    PerkSerializer,
+    ExperienceSerializer,
+    ExperienceDetailSerializer,
+    PublicExperienceDetailSerializer,
+)
 
 
-class Perks(APIView):
+class Perks(ConditionalGetMixin, APIView):
+    def get_validators(self, request):
+        return table_validators(Perk.objects.all())
+
     def get(self, request):
         all_perks = Perk.objects.all()
         serializer = PerkSerializer(all_perks, many=True)
@@ -30,7 +42,10 @@ class Perks(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class PerkDetail(APIView):
+class PerkDetail(ConditionalGetMixin, APIView):
+    def get_validators(self, request, pk):
+        return row_validators(Perk.objects.all(), pk=pk)
+
     def get_object(self, pk):
         return get_object_or_404(Perk, pk=pk)
 
@@ -52,45 +67,78 @@ class PerkDetail(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class Experiences(generics.ListCreateAPIView):
-    queryset = Experience.objects.all()
+class Experiences(ConditionalGetMixin, generics.ListCreateAPIView):
+    versioned = True
+    queryset = Experience.objects.select_related("videos").prefetch_related("photos").order_by("pk")
     serializer_class = ExperienceSerializer
 
+    def get_validators(self, request):
+        return [*get_versions("experiences", list_version_name("experiences")), *viewer_versions(request)], None
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["request"] = self.request
         return context
 
 
-class ExperiencesDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Experience.objects.all()
+class ExperiencesDetail(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    versioned = True
+    queryset = Experience.objects.select_related("category", "videos").prefetch_related("perks", "photos")
     serializer_class = ExperienceDetailSerializer
 
+    def get_validators(self, request, pk):
+        return [*get_versions("experiences", f"experiences:{pk}"), *viewer_versions(request)], None
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["request"] = self.request
         return context
 
+    def get_public_detail(self):
+        experience = self.get_object()
+        serializer = PublicExperienceDetailSerializer(experience)
+        return {"host": experience.host_id, "data": serializer.data}
+
+    def retrieve(self, request, *args, **kwargs):
+        # 유저와 무관한 부분은 캐시에서 읽고, 유저별 필드만 매 요청 덧붙인다.
+        detail = get_or_build(
+            detail_cache_key("experiences", self.kwargs["pk"]),
+            self.get_public_detail,
+        )
+        data = dict(detail["data"])
+        data["is_owner"] = detail["host"] == request.user.pk
+        data["is_liked"] = self.kwargs["pk"] in get_liked_ids(request)["experiences"]
+        return Response(data)
 
-class ExperiencePerks(generics.ListAPIView):
+
+class ExperiencePerks(ConditionalGetMixin, generics.ListAPIView):
+    versioned = True
     queryset = Perk.objects.all()
     serializer_class = PerkSerializer
 
+    def get_validators(self, request, pk):
+        return get_versions("experiences", f"experiences:{pk}"), None
+
     def get_queryset(self):
         queryset = super().get_queryset()
         queryset = queryset.filter(experiences__pk=self.kwargs["pk"])
         return queryset
 
 
-class ExperienceReviews(APIView):
-    pagination_class = PageNumberPagination
+class ExperienceReviews(ConditionalGetMixin, APIView):
+    versioned = True
+    pagination_class = ExperienceReviewPagination
+
+    def get_validators(self, request, pk):
+        # 리뷰 추가/수정/삭제와 작성자 정보 변경은 experiences.signals 가 체험 버전을 올린다.
+        return get_versions("experiences", f"experiences:{pk}"), None
 
     def get_object(self, pk):
         return get_object_or_404(Experience, pk=pk)
 
     def get(self, request, pk):
         experience = self.get_object(pk)
-        reviews = experience.reviews.all()
+        reviews = experience.reviews.select_related("user").order_by("-created_at", "-pk")
         paginator = self.pagination_class()
         queryset_page = paginator.paginate_queryset(reviews, request)
         serializer = ReviewSerializer(queryset_page, many=True)
@@ -105,7 +153,7 @@ class ExperiencePhotos(APIView):
 
     def post(self, request, pk):
         experience = self.get_object(pk)
-        if request.user != experience.host:
+        if experience.host_id != request.user.pk:
             raise PermissionDenied
         serializer = PhotoSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -121,7 +169,7 @@ class ExperienceVideo(APIView):
 
     def post(self, request, pk):
         experience = self.get_object(pk)
-        if request.user != experience.host:
+        if experience.host_id != request.user.pk:
             raise PermissionDenied
         if Video.objects.filter(experience=experience).exists():
             raise ParseError("비디오가 이미 있습니다.")
@@ -136,6 +184,8 @@ class ExperienceBookings(generics.GenericAPIView):
     queryset = Booking.objects.all()
     serializer_class = PublicBookingSerializer
     pagination_class = PageNumberPagination
+    filter_backends = [BookingRangeFilter]
+    booking_range_fields = ("experience_time", "experience_time")
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -149,12 +199,10 @@ class ExperienceBookings(generics.GenericAPIView):
         experience = self.get_object()
         paginator = self.pagination_class()
 
-        now = timezone.localtime(timezone.now()).date()
         bookings = Booking.objects.filter(
             experience=experience,
             kind=Booking.BookingKindChoices.EXPERIENCE,
-            experience_time__gte=now,
-        )
+        ).order_by("experience_time", "pk")
         filter_queryset = self.filter_queryset(bookings)
         queryset_page = paginator.paginate_queryset(filter_queryset, request)
         serializer = self.get_serializer(queryset_page, many=True)
@@ -16,8 +16,8 @@ class PhotoDetail(APIView):
 
     def delete(self, request, pk):
         photo = self.get_object(pk)
-        if (photo.room and photo.room.owner != request.user) or (
-            photo.experience and photo.experience.host != request.user
+        if (photo.room and photo.room.owner_id != request.user.pk) or (
+            photo.experience and photo.experience.host_id != request.user.pk
         ):
             raise PermissionDenied
         photo.delete()
@@ -1,5 +1,64 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
+from django.utils import timezone
+
+from common.bulk import action_value, chunked, chunked_pks
+from common.cache import bump_objects
+from common.paginators import EstimatedCountPaginator
+from experiences.models import Experience
+from rooms.models import Room
+from search.backends import matching_object_ids
 from .models import Review
+from .ratings import rebuild_ratings
+
+
+class ReviewActionForm(ActionForm):
+    rating = forms.IntegerField(
+        label="Rating",
+        required=False,
+        min_value=1,
+        max_value=5,
+    )
+
+
+@admin.action(description="Set rating")
+def set_rating(model_admin, request, reviews):
+    """
+    평점을 chunk 단위 UPDATE 로 바꾼다. reviews.signals 가 리뷰마다 더하고 빼던 방/체험의 평점 카운터는
+    영향받은 방/체험만 모아 다시 세고, 상세/프로필 캐시도 한 번에 무효화한다.
+    """
+    rating = action_value(model_admin, request, "rating")
+    if rating is None:
+        return
+    now = timezone.now()
+    room_pks, experience_pks, user_pks = set(), set(), set()
+    count = 0
+    with transaction.atomic():
+        for chunk in chunked_pks(reviews.exclude(rating=rating)):
+            selected = Review.objects.filter(pk__in=chunk)
+            for room_pk, owner_pk, experience_pk, user_pk in selected.values_list(
+                "room_id",
+                "room__owner_id",
+                "experience_id",
+                "user_id",
+            ):
+                room_pks.add(room_pk)
+                experience_pks.add(experience_pk)
+                # 호스트 평점과, 작성자의 리뷰 목록에 보이는 평점이 바뀐다.
+                user_pks.update((owner_pk, user_pk))
+            count += selected.update(rating=rating, updated_at=now)
+        room_pks.discard(None)
+        experience_pks.discard(None)
+        for pks in chunked(room_pks):
+            rebuild_ratings(Room, Review, "room", pks)
+        for pks in chunked(experience_pks):
+            rebuild_ratings(Experience, Review, "experience", pks)
+        bump_objects("rooms", room_pks)
+        bump_objects("experiences", experience_pks)
+        bump_objects("users", user_pks)
+    model_admin.message_user(request, f"{count} reviews updated.")
 
 
 class WordFilter(admin.SimpleListFilter):
@@ -18,21 +77,45 @@ class WordFilter(admin.SimpleListFilter):
     def queryset(self, request, reviews):
         word = self.value()
         if word:
-            return reviews.filter(payload__contains=word)
+            # payload 전체를 훑지 않고 검색 색인을 서브쿼리로 걸어 한 번에 찾는다.
+            return reviews.filter(pk__in=matching_object_ids("review", word))
         else:
             return reviews
 
 
+class RatingFilter(admin.SimpleListFilter):
+    """기본 필터는 선택지를 SELECT DISTINCT rating 으로 리뷰 전체를 훑어 구하므로 1~5 를 고정으로 둔다."""
+
+    title = "rating"
+
+    parameter_name = "rating"
+
+    def lookups(self, request, model_admin):
+        return [(str(rating), str(rating)) for rating in range(1, 6)]
+
+    def queryset(self, request, reviews):
+        if self.value():
+            return reviews.filter(rating=self.value())
+        return reviews
+
+
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
 
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ("user",)
+
+    action_form = ReviewActionForm
+    actions = (set_rating,)
+
     list_display = (
         "__str__",
         "payload",
     )
     list_filter = (
         WordFilter,
-        "rating",
+        RatingFilter,
         "user__is_host",
         "room__category",
         "room__pet_friendly",
@@ -0,0 +1,22 @@
+from common.exports import Export
+from .models import Review
+
+REVIEW_EXPORT = Export(
+    "reviews",
+    Review.objects.all(),
+    [
+        ("id", "id"),
+        ("user_id", "user_id"),
+        ("username", "user__username"),
+        ("room_id", "room_id"),
+        ("room_name", "room__name"),
+        ("room_owner_id", "room__owner_id"),
+        ("experience_id", "experience_id"),
+        ("experience_name", "experience__name"),
+        ("experience_host_id", "experience__host_id"),
+        ("rating", "rating"),
+        ("payload", "payload"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    ],
+)
@@ -0,0 +1,7 @@
+from common.exports import ExportCommand
+from reviews.exports import REVIEW_EXPORT
+
+
+class Command(ExportCommand):
+    help = "Stream every review with its room, experience and user fields to CSV or JSONL."
+    export = REVIEW_EXPORT
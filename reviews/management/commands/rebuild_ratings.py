@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from experiences.models import Experience
+from reviews.models import Review
+from reviews.ratings import rebuild_ratings
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = "Rebuild denormalized rating_sum / review_count of rooms and experiences from reviews."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rooms = rebuild_ratings(Room, Review, "room")
+            experiences = rebuild_ratings(Experience, Review, "experience")
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt ratings of {rooms} rooms and {experiences} experiences.")
+        )
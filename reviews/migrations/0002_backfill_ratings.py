@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from reviews.ratings import rebuild_ratings
+
+
+def backfill_ratings(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    rebuild_ratings(apps.get_model("rooms", "Room"), Review, "room")
+    rebuild_ratings(apps.get_model("experiences", "Experience"), Review, "experience")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        ('rooms', '0002_room_rating_sum_room_review_count'),
+        ('experiences', '0002_experience_rating_sum_experience_review_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
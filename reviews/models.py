@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from common.models import DateTimeModel
 from config import settings
 
@@ -26,5 +26,16 @@ class Review(DateTimeModel):
     payload = models.TextField()
     rating = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            # 관리자 목록의 평점 필터(rating = ? ORDER BY id DESC)를 인덱스 순서대로 읽는다.
+            models.Index(fields=["rating", "id"], name="review_rating_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} / {self.rating}"
+
+    def save(self, *args, **kwargs):
+        # post_save 에서 갱신하는 Room/Experience 평점 컬럼이 리뷰와 같은 트랜잭션에 묶이도록 한다.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -3,3 +3,7 @@ from rest_framework.pagination import PageNumberPagination
 
 class ReviewPagination(PageNumberPagination):
     page_size = 10
+
+
+class ExperienceReviewPagination(PageNumberPagination):
+    page_size = 3
@@ -0,0 +1,27 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def rebuild_ratings(model, review_model, field, pks=None):
+    """
+    field(room/experience)로 묶인 리뷰를 집계해 rating_sum, review_count 를 한 번의 UPDATE로 다시 채운다.
+    pks 가 주어지면 그 객체들만 다시 센다.
+    """
+    reviews = (
+        review_model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+    )
+    targets = model.objects.all() if pks is None else model.objects.filter(pk__in=pks)
+    return targets.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("pk")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+    )
@@ -0,0 +1,61 @@
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from experiences.models import Experience
+from rooms.models import Room
+from .models import Review
+
+
+def apply_rating_delta(model, pk, rating, count):
+    if pk is None:
+        return
+    model.objects.filter(pk=pk).update(
+        rating_sum=F("rating_sum") + rating,
+        review_count=F("review_count") + count,
+    )
+
+
+def apply_review(review, sign):
+    apply_rating_delta(Room, review["room_id"], sign * review["rating"], sign)
+    apply_rating_delta(Experience, review["experience_id"], sign * review["rating"], sign)
+
+
+def review_values(review):
+    return {
+        "room_id": review.room_id,
+        "experience_id": review.experience_id,
+        "rating": review.rating,
+    }
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_review(sender, instance, raw, **kwargs):
+    # 수정의 경우 이전 값만큼 빼고 새 값을 더해야 하므로 저장 전 값을 기억해둔다.
+    instance._previous_review = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_review = Review.objects.filter(pk=instance.pk).values(
+        "room_id",
+        "experience_id",
+        "rating",
+    ).first()
+
+
+@receiver(post_save, sender=Review)
+def update_ratings_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_review", None)
+    current = review_values(instance)
+    if previous == current:
+        return
+    if previous:
+        apply_review(previous, -1)
+    apply_review(current, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_ratings_on_delete(sender, instance, **kwargs):
+    # Collector.delete 가 트랜잭션 안에서 post_delete 를 보낸다.
+    apply_review(review_values(instance), -1)
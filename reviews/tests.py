@@ -1,3 +1,115 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from .models import Review
+
+
+class TestRatingCounters(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.experience = Experience.objects.create(
+            name="Experience",
+            host=self.user,
+            price=100,
+            address="address",
+            start="10:00",
+            end="12:00",
+            description="desc",
+        )
+
+    def test_counters_follow_reviews(self):
+        first = Review.objects.create(user=self.user, room=self.room, payload="good", rating=5)
+        Review.objects.create(user=self.user, room=self.room, payload="bad", rating=2)
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.total_reviews(), 2)
+        self.assertEqual(self.room.rating(), 3.5)
+
+        first.rating = 3
+        first.save()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.rating(), 2.5)
+
+        first.room = None
+        first.experience = self.experience
+        first.save()
+        self.room.refresh_from_db()
+        self.experience.refresh_from_db()
+        self.assertEqual(self.room.total_reviews(), 1)
+        self.assertEqual(self.experience.rating(), 3)
+
+        first.delete()
+        self.experience.refresh_from_db()
+        self.assertEqual(self.experience.total_reviews(), 0)
+        self.assertEqual(self.experience.rating(), 0)
+
+    def test_rebuild_ratings_command(self):
+        Review.objects.create(user=self.user, room=self.room, payload="good", rating=4)
+        Room.objects.update(rating_sum=0, review_count=0)
+
+        call_command("rebuild_ratings", stdout=StringIO())
+
+        self.room.refresh_from_db()
+        self.experience.refresh_from_db()
+        self.assertEqual(self.room.rating(), 4)
+        self.assertEqual(self.room.total_reviews(), 1)
+        self.assertEqual(self.experience.total_reviews(), 0)
+
+
+class TestReviewExport(TestCase):
+    def create_room(self, user, name="Room"):
+        return Room.objects.create(
+            name=name,
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=user,
+        )
+
+    def test_command_writes_jsonl(self):
+        user = User.objects.create(username="test")
+        room = self.create_room(user)
+        for rating in (5, 3, 4):
+            Review.objects.create(user=user, room=room, payload="좋아요", rating=rating)
+
+        out = StringIO()
+        call_command("export_reviews", format="jsonl", chunk_size=2, stdout=out, stderr=StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["rating"] for row in rows], [5, 3, 4])
+        self.assertEqual(rows[0]["payload"], "좋아요")
+        self.assertEqual(rows[0]["room_name"], "Room")
+        self.assertIsNone(rows[0]["experience_id"])
+
+    def test_csv_cells_are_not_formulas(self):
+        user = User.objects.create(username="@admin")
+        room = self.create_room(user, name="+Room")
+        Review.objects.create(user=user, room=room, payload='=HYPERLINK("http://evil")', rating=5)
+
+        out = StringIO()
+        call_command("export_reviews", format="csv", stdout=out, stderr=StringIO())
+        row = next(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(row["payload"], """'=HYPERLINK("http://evil")""")
+        self.assertEqual((row["username"], row["room_name"], row["rating"]), ("'@admin", "'+Room", "5"))
+
+        out = StringIO()
+        call_command("export_reviews", format="jsonl", stdout=out, stderr=StringIO())
+        self.assertEqual(json.loads(out.getvalue())["payload"], '=HYPERLINK("http://evil")')
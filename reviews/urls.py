@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ReviewExport
+
+urlpatterns = [
+    path("export", ReviewExport.as_view()),
+]
@@ -1,3 +1,6 @@
-from django.shortcuts import render
+from common.exports import ExportView
+from .exports import REVIEW_EXPORT
 
-# Create your views here.
+
+class ReviewExport(ExportView):
+    export = REVIEW_EXPORT
@@ -1,18 +1,145 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
+from django.db.models import BigIntegerField, Exists, OuterRef
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from categories.models import Category
+from common.bulk import action_value, chunked_pks
+from common.cache import bump_objects, bump_versions
+from common.paginators import EstimatedCountPaginator
+from .facets import FACET_CACHE_VERSION
 from .models import Room, Amenity
+from .stats import with_room_stats
+
+
+class RoomActionForm(ActionForm):
+    percent = forms.IntegerField(
+        label="Price change (%)",
+        required=False,
+        min_value=-100,
+        max_value=1000,
+    )
+    category = forms.ModelChoiceField(
+        Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS),
+        label="Category",
+        required=False,
+    )
+    amenity = forms.ModelChoiceField(
+        Amenity.objects.all(),
+        label="Amenity",
+        required=False,
+    )
+
+
+def update_rooms(rooms, apply=None, **fields):
+    """
+    선택한 방을 chunk 단위로 apply(pks) 하고 fields 로 UPDATE 한다.
+    QuerySet.update 와 through 테이블 직접 조작은 signal 을 보내지 않으므로
+    rooms.signals 가 방마다 하던 캐시 무효화는 끝에 한 번에 한다.
+    """
+    now = timezone.now()
+    pks = []
+    with transaction.atomic():
+        for chunk in chunked_pks(rooms):
+            if apply:
+                apply(chunk)
+            Room.objects.filter(pk__in=chunk).update(updated_at=now, **fields)
+            pks.extend(chunk)
+        bump_objects("rooms", pks)
+        bump_versions(FACET_CACHE_VERSION)
+    return len(pks)
+
+
+def report(model_admin, request, count):
+    model_admin.message_user(request, f"{count} rooms updated.")
 
 
 @admin.action(description="Set all prices to zero")
 def reset_prices(model_admin, request, rooms):
-    for room in rooms.all():
-        room.price = 0
-        room.save()
+    report(model_admin, request, update_rooms(rooms, price=0))
+
+
+@admin.action(description="Change prices by percentage")
+def change_prices(model_admin, request, rooms):
+    percent = action_value(model_admin, request, "percent")
+    if percent is None:
+        return
+    # 정수 연산으로 반올림한다. 곱한 중간값이 int4(PostgreSQL integer)를 넘지 않도록 bigint 로 바꿔 곱한다.
+    price = (Cast("price", BigIntegerField()) * (100 + percent) + 50) / 100
+    report(model_admin, request, update_rooms(rooms, price=price))
+
+
+@admin.action(description="Move to category")
+def set_category(model_admin, request, rooms):
+    category = action_value(model_admin, request, "category")
+    if category is None:
+        return
+    report(model_admin, request, update_rooms(rooms, category=category))
+
+
+@admin.action(description="Add amenity")
+def add_amenity(model_admin, request, rooms):
+    amenity = action_value(model_admin, request, "amenity")
+    if amenity is None:
+        return
+    through = Room.amenities.through
+
+    def apply(pks):
+        through.objects.bulk_create(
+            [through(room_id=pk, amenity_id=amenity.pk) for pk in pks],
+            ignore_conflicts=True,
+        )
+
+    report(model_admin, request, update_rooms(rooms, apply))
+
+
+@admin.action(description="Remove amenity")
+def remove_amenity(model_admin, request, rooms):
+    amenity = action_value(model_admin, request, "amenity")
+    if amenity is None:
+        return
+
+    def apply(pks):
+        Room.amenities.through.objects.filter(room_id__in=pks, amenity=amenity).delete()
+
+    report(model_admin, request, update_rooms(rooms, apply))
+
+
+class AmenityFilter(admin.SimpleListFilter):
+    """기본 M2M 필터는 JOIN 후 DISTINCT 로 방 전체를 다시 정렬하므로, 연결 테이블 EXISTS 로 거른다."""
+
+    title = "amenities"
+
+    parameter_name = "amenity"
+
+    def lookups(self, request, model_admin):
+        return Amenity.objects.order_by("name").values_list("pk", "name")
+
+    def queryset(self, request, rooms):
+        if self.value():
+            through = Room.amenities.through.objects.filter(room=OuterRef("pk"), amenity_id=self.value())
+            return rooms.filter(Exists(through))
+        return rooms
 
 
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
 
-    actions = (reset_prices,)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ("owner",)
+
+    action_form = RoomActionForm
+    actions = (
+        reset_prices,
+        change_prices,
+        set_category,
+        add_amenity,
+        remove_amenity,
+    )
 
     list_display = (
         "name",
@@ -29,7 +156,7 @@ class RoomAdmin(admin.ModelAdmin):
         "city",
         "pet_friendly",
         "kind",
-        "amenities",
+        AmenityFilter,
         "created_at",
         "updated_at",
     )
@@ -39,6 +166,14 @@ class RoomAdmin(admin.ModelAdmin):
         "=owner__username",
     )
 
+    def get_queryset(self, request):
+        # 편의시설 수를 방마다 세지 않고 목록 쿼리의 서브쿼리로 붙인다. 평점은 카운터 컬럼으로 계산된다.
+        return with_room_stats(super().get_queryset(request))
+
+    @admin.display(description="Total amenities", ordering="amenity_count")
+    def total_amenities(self, room):
+        return room.amenity_count
+
 
 @admin.register(Amenity)
 class AmenityAdmin(admin.ModelAdmin):
@@ -0,0 +1,140 @@
+from django.db.models import Count, Exists, OuterRef, Q
+from rest_framework.exceptions import ParseError
+
+from common.cache import get_or_build, get_versions
+from .models import Room
+
+# 방 목록의 패싯 필터와 값별 개수.
+# 같은 패싯 안의 값은 OR, 패싯끼리는 AND 다. (편의시설만 "모두 갖춘" AND)
+# 패싯의 개수는 자기 패싯의 선택만 빼고 나머지 선택을 모두 적용해서 센다. 그래야 다른 값으로 바꿨을 때의 개수가 된다.
+#
+# 값이 고정된 패싯(종류/반려동물/가격대/방 수/화장실 수)은 조건부 COUNT 로 쿼리 한 번에,
+# 카테고리와 편의시설은 각각 GROUP BY 한 번씩 세므로 선택과 관계없이 쿼리 3번이다.
+
+PRICE_BUCKETS = [(0, 50000), (50000, 100000), (100000, 200000), (200000, None)]
+
+
+def price_key(low, high):
+    return f"{low}-{high if high is not None else ''}"
+
+
+def price_q(low, high):
+    return Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+
+
+def count_q(field, last):
+    """1, 2, ... last-1 은 같은 값, "last+" 는 last 이상."""
+    choices = {str(value): Q(**{field: value}) for value in range(1, last)}
+    choices[f"{last}+"] = Q(**{f"{field}__gte": last})
+    return choices
+
+
+FIXED_FACETS = {
+    "kind": {value: Q(kind=value) for value in Room.RoomKindChoices.values},
+    "pet_friendly": {"true": Q(pet_friendly=True), "false": Q(pet_friendly=False)},
+    "price": {price_key(low, high): price_q(low, high) for low, high in PRICE_BUCKETS},
+    "rooms": count_q("rooms", 4),
+    "toilets": count_q("toilets", 3),
+}
+FACETS = [*FIXED_FACETS, "category", "amenities"]
+FACET_CACHE_VERSION = "rooms:facets"
+
+
+def parse_pks(values, name):
+    try:
+        return sorted({int(value) for value in values})
+    except ValueError:
+        raise ParseError(f"{name} should be comma separated integers.")
+
+
+def parse_selection(params):
+    """쿼리 파라미터에서 패싯별로 고른 값. 고르지 않은 패싯은 빠진다."""
+    selection = {}
+    for facet in FACETS:
+        value = params.get(facet)
+        if not value:
+            continue
+        values = value.split(",")
+        if facet in FIXED_FACETS:
+            invalid = set(values) - set(FIXED_FACETS[facet])
+            if invalid:
+                raise ParseError(f"{facet} should be one of {', '.join(FIXED_FACETS[facet])}.")
+            selection[facet] = sorted(set(values))
+        else:
+            selection[facet] = parse_pks(values, facet)
+    return selection
+
+
+def facet_q(facet, values):
+    if facet in FIXED_FACETS:
+        q = Q()
+        for value in values:
+            q |= FIXED_FACETS[facet][value]
+        return q
+    if facet == "category":
+        return Q(category_id__in=values)
+    through = Room.amenities.through.objects.filter(room=OuterRef("pk"))
+    q = Q()
+    for amenity_pk in values:
+        q &= Q(Exists(through.filter(amenity_id=amenity_pk)))
+    return q
+
+
+def selection_q(selection, exclude=None):
+    q = Q()
+    for facet, values in selection.items():
+        if facet != exclude:
+            q &= facet_q(facet, values)
+    return q
+
+
+def filter_rooms(queryset, selection):
+    return queryset.filter(selection_q(selection))
+
+
+def count_facets(queryset, selection):
+    """패싯마다 {값: 개수}. 카테고리/편의시설은 개수가 있는 값만, 이름과 함께 준다."""
+    aggregates = {"total": Count("pk", filter=selection_q(selection))}
+    for facet, choices in FIXED_FACETS.items():
+        others = selection_q(selection, exclude=facet)
+        for value, q in choices.items():
+            aggregates[f"{facet}:{value}"] = Count("pk", filter=others & q)
+    counts = queryset.aggregate(**aggregates)
+
+    facets = {
+        facet: {value: counts[f"{facet}:{value}"] for value in choices}
+        for facet, choices in FIXED_FACETS.items()
+    }
+    categories = (
+        queryset.filter(selection_q(selection, exclude="category"), category__isnull=False)
+        .order_by()
+        .values("category_id", "category__name")
+        .annotate(count=Count("pk"))
+        .order_by("category_id")
+    )
+    facets["category"] = [
+        {"pk": row["category_id"], "name": row["category__name"], "count": row["count"]}
+        for row in categories
+    ]
+    amenities = (
+        Room.amenities.through.objects.filter(room__in=queryset.filter(selection_q(selection)))
+        .order_by()
+        .values("amenity_id", "amenity__name")
+        .annotate(count=Count("room_id"))
+        .order_by("amenity_id")
+    )
+    facets["amenities"] = [
+        {"pk": row["amenity_id"], "name": row["amenity__name"], "count": row["count"]}
+        for row in amenities
+    ]
+    return {"count": counts["total"], "facets": facets}
+
+
+def get_facet_counts(selection):
+    """전체 방 목록의 패싯 개수. 방/편의시설/카테고리가 바뀔 때 올라가는 버전으로 캐시한다."""
+    (version,) = get_versions(FACET_CACHE_VERSION)
+    key = "rooms:facets:{}:{}".format(
+        version,
+        "&".join(f"{facet}={','.join(map(str, values))}" for facet, values in sorted(selection.items())),
+    )
+    return get_or_build(key, lambda: count_facets(Room.objects.all(), selection))
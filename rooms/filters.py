@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from django.db.models import Exists, OuterRef
+from rest_framework import filters
+from rest_framework.exceptions import ParseError
+
+from bookings.models import BookedDay
+from .models import Room
+
+
+class RoomSearchFilter(filters.BaseFilterBackend):
+    """
+    city, country, kind, min_price, max_price, pet_friendly, amenities(콤마 구분 pk),
+    check_in, check_out 으로 방을 거른다.
+    날짜가 주어지면 그 기간에 점유일이 하나라도 있는 방을 NOT EXISTS 로 한 번에 제외한다.
+    """
+
+    def parse_date(self, value, name):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise ParseError(f"{name} should be YYYY-MM-DD.")
+
+    def parse_int(self, value, name):
+        try:
+            return int(value)
+        except ValueError:
+            raise ParseError(f"{name} should be an integer.")
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        for field in ("city", "country"):
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+
+        kind = params.get("kind")
+        if kind:
+            if kind not in Room.RoomKindChoices.values:
+                raise ParseError(f"kind should be one of {', '.join(Room.RoomKindChoices.values)}.")
+            queryset = queryset.filter(kind=kind)
+
+        if params.get("min_price"):
+            queryset = queryset.filter(price__gte=self.parse_int(params["min_price"], "min_price"))
+        if params.get("max_price"):
+            queryset = queryset.filter(price__lte=self.parse_int(params["max_price"], "max_price"))
+
+        pet_friendly = params.get("pet_friendly")
+        if pet_friendly:
+            if pet_friendly not in ("true", "false"):
+                raise ParseError("pet_friendly should be 'true' or 'false'.")
+            queryset = queryset.filter(pet_friendly=pet_friendly == "true")
+
+        amenities = params.get("amenities")
+        if amenities:
+            through = Room.amenities.through.objects.filter(room=OuterRef("pk"))
+            for amenity_pk in amenities.split(","):
+                amenity_pk = self.parse_int(amenity_pk, "amenities")
+                queryset = queryset.filter(Exists(through.filter(amenity_id=amenity_pk)))
+
+        check_in = params.get("check_in")
+        check_out = params.get("check_out")
+        if check_in or check_out:
+            if not (check_in and check_out):
+                raise ParseError("check_in and check_out should be given together.")
+            check_in = self.parse_date(check_in, "check_in")
+            check_out = self.parse_date(check_out, "check_out")
+            if check_out < check_in:
+                raise ParseError("Check in should be smaller than check out.")
+            queryset = queryset.exclude(
+                Exists(
+                    BookedDay.objects.filter(
+                        room=OuterRef("pk"),
+                        day__range=(check_in, check_out),
+                    )
+                )
+            )
+        return queryset
@@ -0,0 +1,230 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from categories.models import Category
+from common.cache import bump_versions, list_version_name
+from medias.models import Photo
+from search.documents import build_document
+from search.models import SearchDocument
+from users.profiles import bump_profiles
+from .facets import FACET_CACHE_VERSION
+from .models import Amenity, Room
+
+# 파트너 숙소 대량 등록. 행을 chunk_size 개씩 검증하고 Room, 편의시설 연결, Photo, 검색 문서를
+# 청크마다 bulk_create 로 넣는다. bulk_create 는 시그널을 보내지 않으므로 시그널이 하던 일(검색 색인,
+# 패싯/프로필 캐시 무효화)도 여기서 직접 한다.
+
+FORMATS = ("csv", "jsonl")
+
+
+class InvalidRow:
+    def __init__(self, message):
+        self.message = message
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidRow(f"Invalid JSON: {e.msg}")
+            continue
+        yield row if isinstance(row, dict) else InvalidRow("Each line should be a JSON object.")
+
+
+def read_rows(stream, format):
+    """텍스트 스트림을 한 줄씩 읽어 행(dict)을 만든다. 파일 전체를 메모리에 올리지 않는다."""
+    if format == "csv":
+        return read_csv(stream)
+    return read_jsonl(stream)
+
+
+def text_stream(binary):
+    # BOM 이 붙은 CSV(엑셀 저장)도 읽을 수 있게 utf-8-sig 로 연다.
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def guess_format(filename):
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension)
+
+
+class Lookup:
+    """카테고리/편의시설을 pk 나 이름(대소문자 무시)으로 찾는 메모리 사전. 가져오기 시작할 때 한 번 읽는다."""
+
+    def __init__(self):
+        self.categories = self.load(Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS))
+        self.amenities = self.load(Amenity.objects.all())
+
+    def load(self, queryset):
+        lookup = {}
+        for pk, name in queryset.values_list("pk", "name"):
+            lookup.setdefault(name.strip().lower(), pk)
+            lookup[str(pk)] = pk
+        return lookup
+
+    def resolve(self, lookup, value):
+        return lookup.get(str(value).strip().lower())
+
+
+class ListOrPipeField(serializers.ListField):
+    """JSONL 에서는 목록, CSV 에서는 "a|b|c" 문자열로 받는다."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [value.strip() for value in data.split("|") if value.strip()]
+        return super().to_internal_value(data)
+
+
+class RoomImportSerializer(serializers.ModelSerializer):
+    category = serializers.CharField(required=False, allow_blank=True)
+    amenities = ListOrPipeField(child=serializers.CharField(), required=False)
+    photos = ListOrPipeField(child=serializers.URLField(), required=False)
+
+    class Meta:
+        model = Room
+        fields = [
+            "name",
+            "country",
+            "city",
+            "price",
+            "rooms",
+            "toilets",
+            "description",
+            "address",
+            "pet_friendly",
+            "kind",
+            "latitude",
+            "longitude",
+            "category",
+            "amenities",
+            "photos",
+        ]
+
+    def to_internal_value(self, data):
+        # CSV 의 빈 칸은 값이 없는 것으로 본다.
+        data = {key: value for key, value in data.items() if key and value not in ("", None)}
+        return super().to_internal_value(data)
+
+    def validate_category(self, value):
+        if not value:
+            return None
+        pk = self.context["lookup"].resolve(self.context["lookup"].categories, value)
+        if pk is None:
+            raise serializers.ValidationError(f"Unknown category: {value}")
+        return pk
+
+    def validate_amenities(self, values):
+        lookup = self.context["lookup"]
+        pks = []
+        for value in values:
+            pk = lookup.resolve(lookup.amenities, value)
+            if pk is None:
+                raise serializers.ValidationError(f"Unknown amenity: {value}")
+            pks.append(pk)
+        return list(dict.fromkeys(pks))
+
+
+class RoomImporter:
+    def __init__(self, owner, chunk_size=1000, max_errors=100, dry_run=False):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.dry_run = dry_run
+        self.lookup = Lookup()
+        # 행마다 시리얼라이저를 새로 만들면 필드 구성 비용이 가져오기 시간의 절반을 차지해 하나를 재사용한다.
+        self.serializer = RoomImportSerializer(context={"lookup": self.lookup})
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "dry_run": self.dry_run,
+        }
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": line, "errors": errors})
+
+    def run(self, rows, progress=None):
+        """rows 를 모두 가져오고 결과(만든 수, 실패 수, 앞쪽 오류 목록)를 돌려준다. 행 번호는 1부터."""
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+            if progress:
+                progress(self)
+        if self.created and not self.dry_run:
+            bump_versions(FACET_CACHE_VERSION, list_version_name("rooms"))
+            bump_profiles(self.owner.pk)
+        return self.report()
+
+    def validate(self, chunk):
+        valid = []
+        for line, row in chunk:
+            if isinstance(row, InvalidRow):
+                self.add_error(line, {"non_field_errors": [row.message]})
+                continue
+            try:
+                valid.append(self.serializer.run_validation(row))
+            except serializers.ValidationError as error:
+                self.add_error(line, serializers.as_serializer_error(error))
+        return valid
+
+    def import_chunk(self, chunk):
+        valid = self.validate(chunk)
+        if not valid:
+            return
+        if self.dry_run:
+            self.created += len(valid)
+            return
+
+        rooms = []
+        for data in valid:
+            data = dict(data)
+            data.pop("amenities", None)
+            data.pop("photos", None)
+            category = data.pop("category", None)
+            room = Room(owner=self.owner, category_id=category, **data)
+            room.fill_geohash()
+            rooms.append(room)
+
+        with transaction.atomic():
+            # SQLite 와 PostgreSQL 은 bulk_create 가 pk 를 채워준다.
+            Room.objects.bulk_create(rooms)
+            Room.amenities.through.objects.bulk_create(
+                [
+                    Room.amenities.through(room_id=room.pk, amenity_id=amenity_pk)
+                    for room, data in zip(rooms, valid)
+                    for amenity_pk in data.get("amenities", [])
+                ]
+            )
+            Photo.objects.bulk_create(
+                [
+                    Photo(room_id=room.pk, file=url, description=room.name[:140])
+                    for room, data in zip(rooms, valid)
+                    for url in data.get("photos", [])
+                ]
+            )
+            SearchDocument.objects.bulk_create(
+                [build_document(SearchDocument, "room", room) for room in rooms]
+            )
+        self.created += len(rooms)
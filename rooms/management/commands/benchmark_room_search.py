@@ -0,0 +1,154 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from bookings.models import Booking, BookedDay
+from rooms.models import Room
+from rooms.views import RoomSearch
+from users.models import User
+
+CITIES = ["서울", "부산", "제주", "강릉", "전주", "여수", "경주", "속초"]
+
+# 겹치지 않는 날짜를 찾아 다시 뽑는 횟수. 방이 꽉 차서 못 찾으면 그 예약은 건너뛴다.
+MAX_ATTEMPTS = 20
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic rooms/bookings and time GET /api/v1/rooms/search "
+        "on the configured database. Data is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=100_000)
+        parser.add_argument("--bookings", type=int, default=5_000_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--budget-ms", type=float, default=100.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                self.seed(options)
+                self.run(options)
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Rolled back seeded data.")
+
+    def seed(self, options):
+        batch_size = options["batch_size"]
+        owner = User.objects.create(username=f"benchmark-{time.time_ns()}")
+        started = time.perf_counter()
+
+        rooms = [
+            Room(
+                name=f"Room {i}",
+                city=random.choice(CITIES),
+                price=random.randint(10, 500) * 1000,
+                rooms=random.randint(1, 5),
+                toilets=random.randint(1, 3),
+                description="benchmark",
+                address="benchmark",
+                pet_friendly=random.random() < 0.3,
+                kind=random.choice(Room.RoomKindChoices.values),
+                owner=owner,
+            )
+            for i in range(options["rooms"])
+        ]
+        Room.objects.bulk_create(rooms, batch_size=batch_size)
+        room_pks = list(Room.objects.filter(owner=owner).values_list("pk", flat=True))
+
+        today = timezone.localtime(timezone.now()).date()
+        # 방마다 점유한 날을 비트로 기억해서 (room, day) 유니크 제약에 걸리는 겹치는 예약은 만들지 않는다.
+        occupied = dict.fromkeys(room_pks, 0)
+        created = 0
+        remaining = options["bookings"]
+        while remaining:
+            size = min(batch_size, remaining)
+            remaining -= size
+            bookings = []
+            for _ in range(size):
+                for _ in range(MAX_ATTEMPTS):
+                    room_pk = random.choice(room_pks)
+                    offset = random.randint(-365, 730)
+                    nights = random.randint(1, 6)
+                    days = ((1 << (nights + 1)) - 1) << (offset + 365)
+                    if not occupied[room_pk] & days:
+                        break
+                else:
+                    continue
+                occupied[room_pk] |= days
+                check_in = today + timedelta(days=offset)
+                bookings.append(
+                    Booking(
+                        kind=Booking.BookingKindChoices.ROOM,
+                        user=owner,
+                        room_id=room_pk,
+                        check_in=check_in,
+                        check_out=check_in + timedelta(days=nights),
+                        guests=1,
+                    )
+                )
+            created += len(bookings)
+            # bulk_create 는 post_save 를 보내지 않으므로 점유일도 직접 만든다.
+            bookings = Booking.objects.bulk_create(bookings)
+            BookedDay.objects.bulk_create(
+                [day for booking in bookings for day in booking.booked_days()],
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(
+            f"Seeded {len(room_pks)} rooms / {created} bookings "
+            f"in {time.perf_counter() - started:.1f}s on {connection.vendor}."
+        )
+
+    def run(self, options):
+        today = timezone.localtime(timezone.now()).date()
+        factory = RequestFactory()
+        view = RoomSearch.as_view()
+        scenarios = {
+            "city + dates": {
+                "city": "제주",
+                "check_in": today + timedelta(days=30),
+                "check_out": today + timedelta(days=33),
+            },
+            "city + kind + price + dates": {
+                "city": "서울",
+                "kind": Room.RoomKindChoices.ENTIRE_PLACE,
+                "min_price": 50000,
+                "max_price": 200000,
+                "check_in": today + timedelta(days=7),
+                "check_out": today + timedelta(days=14),
+            },
+            "dates only": {
+                "check_in": today + timedelta(days=1),
+                "check_out": today + timedelta(days=2),
+            },
+        }
+        for name, params in scenarios.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                request = factory.get("/api/v1/rooms/search", params, HTTP_HOST="localhost")
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            style = self.style.SUCCESS if median <= options["budget_ms"] else self.style.ERROR
+            self.stdout.write(
+                style(f"{name}: median {median:.1f}ms, max {max(timings):.1f}ms ({len(response.data['results'])} rooms)")
+            )
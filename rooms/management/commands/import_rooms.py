@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rooms.imports import FORMATS, RoomImporter, guess_format, read_rows
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import rooms (with amenities and photo URLs) from a CSV or JSONL file, validating in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="Username of the host who will own the rooms.")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--max-errors", type=int, default=100)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only.")
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with that username({options['owner']}) exists.")
+        format = options["format"] or guess_format(options["path"])
+        if format is None:
+            raise CommandError("Could not tell the file format; pass --format.")
+
+        importer = RoomImporter(
+            owner,
+            chunk_size=options["chunk_size"],
+            max_errors=options["max_errors"],
+            dry_run=options["dry_run"],
+        )
+        started = time.perf_counter()
+
+        def progress(importer):
+            self.stdout.write(
+                f"{importer.created} imported, {importer.failed} failed "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            report = importer.run(read_rows(stream, format), progress=progress)
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        style = self.style.SUCCESS if not report["failed"] else self.style.WARNING
+        verb = "Validated" if report["dry_run"] else "Imported"
+        self.stdout.write(style(f"{verb} {report['created']} rooms, {report['failed']} rows failed."))
@@ -0,0 +1,93 @@
+import math
+
+from django.db.models import Avg, Count, ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import Substr
+from rest_framework.exceptions import ParseError
+
+from common import geo
+
+# 지도 화면에서 이보다 많은 방이 잡히면 점 대신 geohash 칸별 묶음을 돌려준다.
+MAP_POINT_LIMIT = 300
+MAP_CLUSTER_CELLS = 64
+MAX_RADIUS_KM = 50
+
+
+def parse_float(value, name, low, high):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ParseError(f"{name} should be a number.")
+    if not low <= number <= high:
+        raise ParseError(f"{name} should be between {low} and {high}.")
+    return number
+
+
+def parse_bbox(value):
+    """"west,south,east,north" (경도, 위도 순). west > east 면 날짜변경선을 넘는 범위다."""
+    parts = (value or "").split(",")
+    if len(parts) != 4:
+        raise ParseError("bbox should be west,south,east,north.")
+    west = parse_float(parts[0], "west", -180, 180)
+    south = parse_float(parts[1], "south", -90, 90)
+    east = parse_float(parts[2], "east", -180, 180)
+    north = parse_float(parts[3], "north", -90, 90)
+    if south > north:
+        raise ParseError("south should not be greater than north.")
+    return west, south, east, north
+
+
+def within_bbox(queryset, bbox):
+    """
+    geohash 범위(인덱스)로 후보를 좁힌 뒤 위도/경도로 정확히 자른다.
+    geohash 조건은 "geohash >= 시작 AND geohash < 끝" 이라 어느 DB 의 B-tree 인덱스로도 범위 검색이 된다.
+    """
+    cells = Q()
+    for start, end in geo.cover_ranges(bbox):
+        cells |= Q(geohash__gte=start, geohash__lt=end) if end else Q(geohash__gte=start)
+    west, south, east, north = bbox
+    if west <= east:
+        longitude = Q(longitude__range=(west, east))
+    else:
+        longitude = Q(longitude__gte=west) | Q(longitude__lte=east)
+    return queryset.filter(cells, longitude, latitude__range=(south, north))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    반경 안의 방을 가까운 순으로. 정렬은 등장방형 근사 거리의 제곱으로 DB 에서 하고,
+    정확한 거리는 직렬화할 때 haversine 으로 계산한다.
+    """
+    bbox = geo.radius_bbox(latitude, longitude, radius_km)
+    scale = max(math.cos(math.radians(latitude)), 1e-12)
+    distance = ExpressionWrapper(
+        (F("latitude") - latitude) * (F("latitude") - latitude)
+        + (F("longitude") - longitude) * (F("longitude") - longitude) * (scale * scale),
+        output_field=FloatField(),
+    )
+    return (
+        within_bbox(queryset, bbox)
+        .annotate(distance_sq=distance)
+        .filter(distance_sq__lte=(radius_km / geo.KM_PER_DEGREE) ** 2)
+        .order_by("distance_sq", "pk")
+    )
+
+
+def clusters(queryset, bbox):
+    """bbox 를 MAP_CLUSTER_CELLS 칸 이하로 나누는 자릿수의 geohash 앞자리로 묶는다. (GROUP BY 한 번)"""
+    precision = geo.precision_for(bbox, MAP_CLUSTER_CELLS)
+    rows = (
+        queryset.annotate(cell=Substr("geohash", 1, precision))
+        .order_by()
+        .values("cell")
+        .annotate(count=Count("pk"), latitude=Avg("latitude"), longitude=Avg("longitude"))
+        .order_by("cell")
+    )
+    return [
+        {
+            "geohash": row["cell"],
+            "count": row["count"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+        }
+        for row in rows
+    ]
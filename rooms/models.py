@@ -1,12 +1,10 @@
 from django.db import models
-from django.db.models import Avg, FloatField
-from django.db.models.functions import Coalesce
 
-from common.models import DateTimeModel
+from common.models import DateTimeModel, LocationModel
 from config import settings
 
 
-class Room(DateTimeModel):
+class Room(DateTimeModel, LocationModel):
     class RoomKindChoices(models.TextChoices):
         ENTIRE_PLACE = ("entire_place", "Entire Place")
         PRIVATE_ROOM = ("private_room", "Private Room")
@@ -54,6 +52,26 @@ class Room(DateTimeModel):
         on_delete=models.SET_NULL,
         related_name="rooms",
     )
+    # 리뷰 생성/수정/삭제 시 reviews.signals 에서 갱신된다. (rebuild_ratings 커맨드로 재계산)
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["country", "city", "price"], name="room_location_price_idx"),
+            # 지도 묶음(GROUP BY geohash 앞자리, AVG 좌표)을 인덱스만으로 계산할 수 있도록 좌표까지 넣는다.
+            models.Index(fields=["geohash", "latitude", "longitude"], name="room_geohash_idx"),
+            # 관리자 목록의 도시 필터 선택지(DISTINCT city)와 등록/수정일 필터.
+            models.Index(fields=["city"], name="room_city_idx"),
+            models.Index(fields=["created_at"], name="room_created_idx"),
+            models.Index(fields=["updated_at"], name="room_updated_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -62,11 +80,12 @@ class Room(DateTimeModel):
         return self.amenities.count()
 
     def total_reviews(self):
-        return self.reviews.count()
+        return self.review_count
 
     def rating(self):
-        average_rating = self.reviews.aggregate(Avg('rating'))['rating__avg']
-        return 0 if average_rating is None else round(average_rating, 2)
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 2)
 
 
 class Amenity(DateTimeModel):
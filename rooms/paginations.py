@@ -1,5 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 
 
 class HostRoomPagination(PageNumberPagination):
     page_size = 10
+
+
+class RoomListPagination(CursorPagination):
+    # pk는 단조 증가하므로 새 방이 추가되어도 커서 위치가 밀리지 않는다.
+    page_size = 20
+    ordering = "-pk"
@@ -3,9 +3,10 @@ from rest_framework.relations import PrimaryKeyRelatedField
 
 from categories.models import Category
 from categories.serializers import CategorySerializer
+from common.geo import distance_km
 from medias.serializers import PhotoSerializer
 from users.serializers import TinyUserSerializer
-from wishlists.models import Wishlist
+from wishlists.liked import get_liked_ids
 from .models import Amenity, Room
 
 
@@ -31,21 +32,21 @@ class RoomDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Room
-        fields = "__all__"
+        exclude = (
+            "rating_sum",
+            "review_count",
+            "geohash",
+        )
 
     def get_rating(self, room):
         return room.rating()
 
     def get_is_owner(self, room):
         request = self.context["request"]
-        return room.owner == request.user
+        return room.owner_id == request.user.pk
 
     def get_is_liked(self, room):
-        request = self.context["request"]
-        if request.user.is_authenticated:
-            return Wishlist.objects.filter(user=request.user, rooms__pk=room.pk).exists()
-        else:
-            return False
+        return room.pk in get_liked_ids(self.context["request"])["rooms"]
 
     def validate(self, data):
         category = data.get("category")
@@ -98,6 +99,13 @@ class RoomDetailSerializer(serializers.ModelSerializer):
         return data
 
 
+class PublicRoomDetailSerializer(RoomDetailSerializer):
+    """요청한 유저와 무관한 부분만 직렬화한다. 캐시에 저장되고 is_owner, is_liked 는 뷰에서 덧붙인다."""
+
+    is_owner = None
+    is_liked = None
+
+
 class RoomListSerializer(serializers.ModelSerializer):
     rating = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
@@ -121,12 +129,40 @@ class RoomListSerializer(serializers.ModelSerializer):
 
     def get_is_owner(self, room):
         request = self.context["request"]
-        return room.owner == request.user
+        return room.owner_id == request.user.pk
+
+
+class RoomNearbySerializer(RoomListSerializer):
+    # context["center"] = (위도, 경도) 에서의 거리(km)
+    distance = serializers.SerializerMethodField()
+
+    class Meta(RoomListSerializer.Meta):
+        fields = RoomListSerializer.Meta.fields + (
+            "latitude",
+            "longitude",
+            "distance",
+        )
+
+    def get_distance(self, room):
+        return round(distance_km(*self.context["center"], room.latitude, room.longitude), 3)
+
+
+class RoomMapSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Room
+        fields = (
+            "pk",
+            "name",
+            "price",
+            "latitude",
+            "longitude",
+        )
 
 
 class HostRoomSerializer(serializers.ModelSerializer):
-    total_amenities = serializers.SerializerMethodField()
-    total_reviews = serializers.SerializerMethodField()
+    # rooms.stats.with_room_stats 로 주석을 붙인 쿼리셋을 받는다.
+    total_amenities = serializers.IntegerField(source="amenity_count", read_only=True)
+    total_reviews = serializers.IntegerField(source="review_count", read_only=True)
     rating = serializers.SerializerMethodField()
 
     class Meta:
@@ -148,11 +184,22 @@ class HostRoomSerializer(serializers.ModelSerializer):
             "rating",
         ]
 
-    def get_total_amenities(self, room):
-        return room.total_amenities()
-
-    def get_total_reviews(self, room):
-        return room.total_reviews()
-
     def get_rating(self, room):
         return room.rating()
+
+
+class HostDashboardSerializer(HostRoomSerializer):
+    # rooms.stats.with_dashboard_stats 로 주석을 붙인 쿼리셋과 context["period_days"] 를 받는다.
+    upcoming_bookings = serializers.IntegerField(read_only=True)
+    booked_days = serializers.IntegerField(source="booked_day_count", read_only=True)
+    occupancy = serializers.SerializerMethodField()
+
+    class Meta(HostRoomSerializer.Meta):
+        fields = HostRoomSerializer.Meta.fields + [
+            "upcoming_bookings",
+            "booked_days",
+            "occupancy",
+        ]
+
+    def get_occupancy(self, room):
+        return round(room.booked_day_count / self.context["period_days"], 4)
@@ -0,0 +1,68 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from categories.models import Category
+from common.cache import bump_objects, bump_versions
+from medias.models import Photo
+from reviews.models import Review
+from users.models import User
+from .facets import FACET_CACHE_VERSION
+from .models import Room, Amenity
+
+# 방 상세 캐시(RoomDetail) 무효화.
+# 방 하나에 속한 변경은 "rooms:<pk>" 버전을, 여러 방이 공유하는 객체의 변경은 "rooms" 버전을 올린다.
+# 방 목록/리뷰 목록의 ETag 도 이 버전들로 만든다.
+
+
+def bump_rooms(*pks):
+    bump_objects("rooms", pks)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room(sender, instance, **kwargs):
+    bump_rooms(instance.pk)
+    bump_versions(FACET_CACHE_VERSION)
+
+
+@receiver(m2m_changed, sender=Room.amenities.through)
+def invalidate_room_amenities(sender, instance, reverse, pk_set, **kwargs):
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+    bump_versions(FACET_CACHE_VERSION)
+    if not reverse:
+        bump_rooms(instance.pk)
+    elif pk_set:
+        bump_rooms(*pk_set)
+    else:
+        bump_versions("rooms")
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(post_delete, sender=Amenity)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_all_rooms(sender, **kwargs):
+    bump_versions("rooms", FACET_CACHE_VERSION)
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_room_of(sender, instance, **kwargs):
+    # 리뷰가 다른 방으로 옮겨지면 이전 방의 평점도 바뀐다. (reviews.signals 가 저장 전 값을 기억해둔다)
+    previous = getattr(instance, "_previous_review", None) or {}
+    bump_rooms(instance.room_id, previous.get("room_id"))
+
+
+@receiver(post_save, sender=User)
+def invalidate_rooms_of_owner(sender, instance, created, update_fields, **kwargs):
+    # 로그인 시 last_login 만 저장되는 경우처럼 상세 응답에 드러나지 않는 저장은 무시한다.
+    if created or (update_fields and set(update_fields) <= {"last_login", "password", "token_version"}):
+        return
+    # 방 리뷰 목록에 보이는 리뷰 작성자 정보도 바뀌므로 리뷰를 남긴 방도 함께 무효화한다.
+    bump_rooms(
+        *instance.rooms.values_list("pk", flat=True),
+        *instance.reviews.filter(room__isnull=False).values_list("room_id", flat=True),
+    )
@@ -0,0 +1,34 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from bookings.models import Booking, BookedDay
+from .models import Room
+
+
+def count_rows(queryset, field="room"):
+    """queryset 에서 바깥 방(pk)에 속한 행 수를 세는 서브쿼리. 없으면 0."""
+    rows = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(rows), 0, output_field=IntegerField())
+
+
+def with_room_stats(queryset):
+    # 리뷰 수/평점은 Room 의 rating_sum, review_count 컬럼으로 바로 계산된다.
+    return queryset.annotate(amenity_count=count_rows(Room.amenities.through.objects.all()))
+
+
+def with_dashboard_stats(queryset, start, end):
+    """start ~ end(포함) 기간의 점유일 수와 오늘 이후 체크인 예약 수를 붙인다."""
+    today = timezone.localdate()
+    return with_room_stats(queryset).annotate(
+        upcoming_bookings=count_rows(
+            Booking.objects.filter(kind=Booking.BookingKindChoices.ROOM, check_in__gte=today),
+        ),
+        booked_day_count=count_rows(BookedDay.objects.filter(day__range=(start, end))),
+    )
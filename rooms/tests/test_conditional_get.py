@@ -0,0 +1,120 @@
+import gzip
+import unittest
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from common.middleware import brotli
+from reviews.models import Review
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+@override_settings(CACHE_VERSION_ETAGS=True)
+class TestConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.guest = User.objects.create(username="guest", name="Guest")
+        self.room = self.create_room("Room")
+        self.amenities = [Amenity.objects.create(name=f"amenity {i}", description="desc " * 10) for i in range(20)]
+
+    def create_room(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Room.objects.create(
+                name=name,
+                price=100,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="address",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.owner,
+            )
+
+    def get(self, url, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(url, **headers)
+
+    def assertNotModified(self, url, etag, **headers):
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_room_detail_is_not_modified_until_it_changes(self):
+        url = f"/api/v1/rooms/{self.room.pk}"
+        response = self.get(url)
+        etag = response["ETag"]
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        with self.assertNumQueries(0):
+            self.assertNotModified(url, etag)
+
+        # is_owner/is_liked 가 다른 유저에게는 같은 ETag 를 주지 않는다.
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.client.force_authenticate(None)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(user=self.guest, room=self.room, payload="good", rating=5)
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_lists_follow_related_changes(self):
+        rooms_etag = self.get("/api/v1/rooms/")["ETag"]
+        other = self.create_room("Other")
+        self.assertEqual(self.get("/api/v1/rooms/", HTTP_IF_NONE_MATCH=rooms_etag).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(user=self.guest, room=other, payload="good", rating=5)
+        url = f"/api/v1/rooms/{other.pk}/reviews"
+        etag = self.get(url)["ETag"]
+        self.assertNotModified(url, etag)
+        # 리뷰 목록에 보이는 작성자 이름이 바뀌면 다시 받아야 한다.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guest.name = "Renamed"
+            self.guest.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["user"]["name"], "Renamed")
+
+    @override_settings(CACHE_VERSION_ETAGS=False)
+    def test_cache_versions_need_a_shared_cache(self):
+        # 워커마다 따로인 캐시(locmem)의 버전으로는 다른 워커의 변경을 모르므로 ETag 를 주지 않는다.
+        for url in (f"/api/v1/rooms/{self.room.pk}", "/api/v1/rooms/", f"/api/v1/rooms/{self.room.pk}/calendar"):
+            response = self.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header("ETag"))
+        # DB 에서 읽는 검증값은 그대로 쓴다.
+        self.assertTrue(self.get("/api/v1/rooms/amenities/").has_header("ETag"))
+
+    def test_table_and_row_validators(self):
+        etag = self.get("/api/v1/rooms/amenities/")["ETag"]
+        self.assertNotModified("/api/v1/rooms/amenities/", etag)
+        self.amenities[-1].delete()
+        self.assertEqual(self.get("/api/v1/rooms/amenities/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        url = f"/api/v1/rooms/amenities/{self.amenities[0].pk}"
+        response = self.get(url)
+        last_modified = response["Last-Modified"]
+        response = self.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.get("/api/v1/rooms/amenities/0").status_code, 404)
+
+    def test_gzip_keeps_etags_usable(self):
+        response = self.get("/api/v1/rooms/amenities/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(gzip.decompress(response.content).decode().split('"pk"')), 21)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        response = self.get("/api/v1/rooms/amenities/", HTTP_IF_NONE_MATCH=etag, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 304)
+
+    @unittest.skipUnless(brotli, "brotli is not installed")
+    def test_brotli_for_get_responses(self):
+        response = self.get("/api/v1/rooms/amenities/", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn(b"amenity 19", brotli.decompress(response.content))
+        self.assertIn("Accept-Encoding", response["Vary"])
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from bookings.models import Booking
+from reviews.models import Review
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+class TestHostDashboard(APITestCase):
+    def setUp(self):
+        self.host = User.objects.create(username="host")
+        self.guest = User.objects.create(username="guest")
+        self.today = timezone.localdate()
+        amenities = [Amenity.objects.create(name=f"amenity {i}") for i in range(3)]
+        self.rooms = []
+        for i in range(4):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="address",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.host,
+            )
+            room.amenities.add(*amenities[:i])
+            self.rooms.append(room)
+        room = self.rooms[1]
+        Review.objects.create(user=self.guest, room=room, payload="good", rating=4)
+        Review.objects.create(user=self.guest, room=room, payload="ok", rating=3)
+        for offset, nights in ((-3, 1), (2, 4), (10, 0)):
+            Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.guest,
+                room=room,
+                check_in=self.today + timedelta(days=offset),
+                check_out=self.today + timedelta(days=offset + nights),
+                guests=1,
+            )
+
+    def test_stats_in_constant_queries(self):
+        self.client.force_authenticate(self.host)
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/v1/rooms/dashboard?to={self.today + timedelta(days=9)}")
+        self.assertEqual(response.status_code, 200)
+        stats = {room["name"]: room for room in response.json()["results"]}
+        room = stats["Room 1"]
+        self.assertEqual(room["total_amenities"], 1)
+        self.assertEqual(room["total_reviews"], 2)
+        self.assertEqual(room["rating"], 3.5)
+        self.assertEqual(room["upcoming_bookings"], 2)
+        # 오늘부터 10일 중 2~6일째 점유 (어제 이전 예약과 10일 뒤 예약은 제외)
+        self.assertEqual(room["booked_days"], 5)
+        self.assertEqual(room["occupancy"], 0.5)
+        self.assertEqual(stats["Room 2"]["occupancy"], 0)
+
+    def test_requires_login_and_valid_period(self):
+        self.assertEqual(self.client.get("/api/v1/rooms/dashboard").status_code, 403)
+        self.client.force_authenticate(self.host)
+        response = self.client.get("/api/v1/rooms/dashboard?from=2026-02-01&to=2026-01-01")
+        self.assertEqual(response.status_code, 400)
+
+    def test_host_rooms_uses_annotations(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/v1/users/@{self.host.username}/rooms")
+        amenities = {room["name"]: room["total_amenities"] for room in response.json()["results"]}
+        self.assertEqual(amenities, {f"Room {i}": i for i in range(4)})
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from categories.models import Category
+from rooms.facets import get_facet_counts
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+class TestRoomAdminActions(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username="admin", password="password")
+        self.client.force_login(self.admin)
+        self.category = Category.objects.create(name="Hanok", kind=Category.CategoryKindChoices.ROOMS)
+        self.wifi = Amenity.objects.create(name="wifi")
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {i}",
+                price=10000 * (i + 1),
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="address",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.admin,
+            )
+            for i in range(5)
+        ]
+
+    def run_action(self, action, rooms, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/admin/rooms/room/",
+                {"action": action, "_selected_action": [room.pk for room in rooms], **data},
+            )
+
+    def test_change_prices_updates_and_invalidates_detail(self):
+        room = self.rooms[0]
+        self.assertEqual(self.client.get(f"/api/v1/rooms/{room.pk}").json()["price"], 10000)
+
+        self.run_action("change_prices", self.rooms[:2], percent="-15")
+        self.assertEqual(
+            list(Room.objects.order_by("pk").values_list("price", flat=True)),
+            [8500, 17000, 30000, 40000, 50000],
+        )
+        self.assertEqual(self.client.get(f"/api/v1/rooms/{room.pk}").json()["price"], 8500)
+
+        self.run_action("reset_prices", self.rooms)
+        self.assertFalse(Room.objects.exclude(price=0).exists())
+
+    def test_change_prices_of_large_prices(self):
+        # 20억 x 105 는 int4 범위를 넘지만 결과는 범위 안이다.
+        Room.objects.filter(pk=self.rooms[0].pk).update(price=2_000_000_000)
+        self.run_action("change_prices", self.rooms[:1], percent="5")
+        self.assertEqual(Room.objects.get(pk=self.rooms[0].pk).price, 2_100_000_000)
+
+    def test_missing_action_value_changes_nothing(self):
+        response = self.run_action("change_prices", self.rooms, percent="")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Room.objects.get(pk=self.rooms[0].pk).price, 10000)
+
+    def test_category_and_amenities_refresh_facets(self):
+        self.assertEqual(get_facet_counts({})["facets"]["amenities"], [])
+        self.run_action("set_category", self.rooms[:3], category=self.category.pk)
+        self.run_action("add_amenity", self.rooms, amenity=self.wifi.pk)
+        self.run_action("add_amenity", self.rooms, amenity=self.wifi.pk)
+        self.run_action("remove_amenity", self.rooms[:1], amenity=self.wifi.pk)
+
+        self.assertEqual(Room.objects.filter(category=self.category).count(), 3)
+        self.assertEqual(self.wifi.rooms.count(), 4)
+        facets = get_facet_counts({})["facets"]
+        self.assertEqual([(row["pk"], row["count"]) for row in facets["amenities"]], [(self.wifi.pk, 4)])
+        self.assertEqual([(row["pk"], row["count"]) for row in facets["category"]], [(self.category.pk, 3)])
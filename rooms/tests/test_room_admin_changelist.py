@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from common.paginators import EstimatedCountPaginator
+from reviews.models import Review
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+class TestRoomAdminChangelist(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password")
+        self.client.force_login(self.admin)
+        self.amenities = [Amenity.objects.create(name=name) for name in ("wifi", "parking", "pool")]
+
+    def seed(self, count):
+        start = Room.objects.count()
+        for i in range(start, start + count):
+            owner = User.objects.create(username=f"host{i}")
+            room = Room.objects.create(
+                name=f"Room {i}",
+                price=10000,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="address",
+                city=("서울", "부산")[i % 2],
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=owner,
+            )
+            room.amenities.add(*self.amenities[: i % 4])
+            Review.objects.create(user=owner, room=room, payload="review", rating=i % 5 + 1)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.seed(5)
+        _, few = self.get("/admin/rooms/room/")
+        self.seed(40)
+        response, many = self.get("/admin/rooms/room/")
+        self.assertEqual(few, many)
+
+        rooms = {room.name: room for room in response.context["cl"].result_list}
+        self.assertEqual(len(rooms), 45)
+        self.assertEqual(rooms["Room 3"].amenity_count, 3)
+
+        # 조건이 있으면 통계 조회 없이 상한까지만 센다.
+        _, filtered = self.get(f"/admin/rooms/room/?amenity={self.amenities[2].pk}")
+        self.assertEqual(filtered, many - 1)
+
+        _, reviews = self.get("/admin/reviews/review/?rating=3")
+        self.seed(20)
+        _, more_reviews = self.get("/admin/reviews/review/?rating=3")
+        self.assertEqual(reviews, more_reviews)
+
+    def test_amenity_filter(self):
+        self.seed(8)
+        response, _ = self.get(f"/admin/rooms/room/?amenity={self.amenities[2].pk}")
+        self.assertEqual(
+            sorted(room.name for room in response.context["cl"].result_list),
+            ["Room 3", "Room 7"],
+        )
+
+    @mock.patch.object(EstimatedCountPaginator, "count_limit", 10)
+    def test_counts_are_estimated_or_capped(self):
+        self.seed(25)
+        response, _ = self.get("/admin/rooms/room/")
+        # 통계가 없으면 count_limit 까지만 센다.
+        self.assertEqual(response.context["cl"].result_count, 10)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        response, _ = self.get("/admin/rooms/room/")
+        self.assertEqual(response.context["cl"].result_count, 25)
+        response, _ = self.get("/admin/rooms/room/?city=부산")
+        self.assertEqual(response.context["cl"].result_count, 10)
@@ -0,0 +1,78 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from bookings.models import Booking
+from rooms.models import Room
+from users.models import User
+
+
+@override_settings(CACHE_VERSION_ETAGS=True)
+class TestRoomCalendar(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.owner,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}/calendar"
+        self.booking = self.book(date(2026, 1, 30), date(2026, 2, 2))
+
+    def book(self, check_in, check_out):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.owner,
+                room=self.room,
+                check_in=check_in,
+                check_out=check_out,
+                guests=1,
+            )
+
+    def get(self, query, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(f"{self.url}?{query}", **headers)
+
+    def test_bitmap_spans_months(self):
+        response = self.get("month=2026-01&months=2")
+        self.assertEqual(response.status_code, 200)
+        january, february = response.json()["months"]
+        self.assertEqual(january["month"], "2026-01")
+        self.assertEqual(january["days"], "0" * 29 + "11")
+        self.assertEqual(february["days"], "11" + "0" * 26)
+
+    def test_etag_revalidation_and_invalidation(self):
+        etag = self.get("month=2026-01")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.get("month=2026-01", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((response["ETag"], response["Cache-Control"]), (etag, "no-cache"))
+        # 다른 달은 다른 ETag 다.
+        self.assertEqual(self.get("month=2026-02", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.book(date(2026, 1, 10), date(2026, 1, 10))
+        response = self.get("month=2026-01", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["months"][0]["days"][9], "1")
+
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.delete()
+        response = self.get("month=2026-01", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["months"][0]["days"][29:], "00")
+
+    def test_invalid_params(self):
+        self.assertEqual(self.get("month=2026-13").status_code, 400)
+        self.assertEqual(self.get("month=2026-01&months=13").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/rooms/999/calendar").status_code, 404)
@@ -0,0 +1,126 @@
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from common.cache import version_key
+from medias.models import Photo
+from rooms.models import Amenity, Room
+from users.models import User
+from wishlists.models import Wishlist
+
+
+class RoomDetailCacheMixin:
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.guest = User.objects.create(username="guest")
+        self.category = Category.objects.create(name="Hotel", kind=Category.CategoryKindChoices.ROOMS)
+        self.amenity = Amenity.objects.create(name="wifi")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.owner,
+            category=self.category,
+        )
+        self.room.amenities.add(self.amenity)
+        self.url = f"/api/v1/rooms/{self.room.pk}"
+
+    def get(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def change(self, func):
+        with self.captureOnCommitCallbacks(execute=True):
+            func()
+
+    def test_cached_after_first_hit(self):
+        self.get()
+        with self.assertNumQueries(0):
+            data = self.get()
+        self.assertEqual(data["name"], "Room")
+        self.assertFalse(data["is_owner"])
+        self.assertFalse(data["is_liked"])
+
+    def test_per_user_fields_overlaid(self):
+        self.get()
+        wishlist = Wishlist.objects.create(name="list", user=self.guest)
+        wishlist.rooms.add(self.room)
+
+        self.client.force_authenticate(self.owner)
+        data = self.get()
+        self.assertTrue(data["is_owner"])
+        self.assertFalse(data["is_liked"])
+
+        self.client.force_authenticate(self.guest)
+        data = self.get()
+        self.assertFalse(data["is_owner"])
+        self.assertTrue(data["is_liked"])
+
+    def test_invalidation(self):
+        self.get()
+
+        def rename_room():
+            self.room.name = "Renamed"
+            self.room.save()
+
+        self.change(rename_room)
+        self.assertEqual(self.get()["name"], "Renamed")
+
+        self.change(lambda: Photo.objects.create(file="https://example.com/a.jpg", description="photo", room=self.room))
+        self.assertEqual(len(self.get()["photos"]), 1)
+
+        self.change(lambda: Amenity.objects.filter(pk=self.amenity.pk).first().delete())
+        self.assertEqual(self.get()["amenities"], [])
+
+        def rename_category():
+            self.category.name = "Motel"
+            self.category.save()
+
+        self.change(rename_category)
+        self.assertEqual(self.get()["category"]["name"], "Motel")
+
+    def test_not_found(self):
+        response = self.client.get("/api/v1/rooms/999")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(VERSION_CACHE_TIMEOUT=60)
+    def test_version_keys_expire(self):
+        # 없는 pk 로 조회해도 버전 키가 만들어지므로 영원히 남지 않아야 한다.
+        self.client.get("/api/v1/rooms/999")
+        self.assertIsNotNone(cache.get(version_key("rooms:999")))
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get(version_key("rooms:999")))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestRoomDetailLocMemCache(RoomDetailCacheMixin, APITestCase):
+    pass
+
+
+class TestRoomDetailFileCache(RoomDetailCacheMixin, APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory.name,
+                }
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        super().setUp()
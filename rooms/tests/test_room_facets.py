@@ -0,0 +1,85 @@
+import itertools
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from rooms import facets
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+class TestRoomFacets(APITestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create(username="owner")
+        self.categories = [
+            Category.objects.create(name=name, kind=Category.CategoryKindChoices.ROOMS)
+            for name in ("Hotel", "Hanok")
+        ]
+        self.amenities = [Amenity.objects.create(name=name) for name in ("wifi", "parking", "pool")]
+        kinds = itertools.cycle(Room.RoomKindChoices.values)
+        prices = itertools.cycle([30000, 70000, 150000, 300000, 90000])
+        for i in range(30):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                price=next(prices),
+                rooms=i % 5 + 1,
+                toilets=i % 3 + 1,
+                description="desc",
+                address="address",
+                pet_friendly=i % 2 == 0,
+                kind=next(kinds),
+                owner=owner,
+                category=self.categories[i % 2] if i % 7 else None,
+            )
+            room.amenities.add(*self.amenities[: i % 4])
+
+    def expected(self, selection):
+        """패싯 값마다 따로 COUNT 해서 구한 기대값."""
+        result = {}
+        for facet, choices in facets.FIXED_FACETS.items():
+            result[facet] = {}
+            for value in choices:
+                narrowed = {**selection, facet: [value]}
+                result[facet][value] = facets.filter_rooms(Room.objects.all(), narrowed).count()
+        return result
+
+    def test_counts_match_per_value_counts_in_three_queries(self):
+        selections = [
+            {},
+            {"kind": ["entire_place", "shared_room"], "price": ["50000-100000"]},
+            {"pet_friendly": ["true"], "amenities": [self.amenities[0].pk], "rooms": ["4+"]},
+            {"category": [self.categories[0].pk], "toilets": ["1", "3+"]},
+        ]
+        for selection in selections:
+            with self.assertNumQueries(3):
+                counts = facets.count_facets(Room.objects.all(), selection)
+            expected = self.expected(selection)
+            for facet in facets.FIXED_FACETS:
+                self.assertEqual(counts["facets"][facet], expected[facet], (selection, facet))
+            self.assertEqual(counts["count"], facets.filter_rooms(Room.objects.all(), selection).count())
+            for row in counts["facets"]["category"]:
+                narrowed = {**selection, "category": [row["pk"]]}
+                self.assertEqual(row["count"], facets.filter_rooms(Room.objects.all(), narrowed).count())
+            for row in counts["facets"]["amenities"]:
+                narrowed = {**selection, "amenities": [*selection.get("amenities", []), row["pk"]]}
+                self.assertEqual(row["count"], facets.filter_rooms(Room.objects.all(), narrowed).count())
+
+    def test_browse_endpoint_caches_counts(self):
+        url = f"/api/v1/rooms/browse?pet_friendly=true&amenities={self.amenities[1].pk}"
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.client.get(url).json()
+        self.assertEqual(len(data["results"]), data["count"])
+        self.assertTrue(all(amenity["count"] <= data["count"] for amenity in data["facets"]["amenities"]))
+        # 목록(2) + 캐시된 패싯(0)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.filter(pet_friendly=True).first().amenities.add(self.amenities[1])
+        self.assertEqual(self.client.get(url).json()["count"], data["count"] + 1)
+
+    def test_invalid_selection(self):
+        self.assertEqual(self.client.get("/api/v1/rooms/browse?kind=castle").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/rooms/browse?amenities=a").status_code, 400)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from common import geo
+from rooms.models import Room
+from users.models import User
+
+
+class TestGeohash(APITestCase):
+    def test_encode_and_cover(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 9), "u4pruydqq")
+        bbox = (126.9, 37.5, 127.1, 37.6)
+        point = geo.encode(37.55, 127.0)
+        self.assertTrue(any(start <= point < end for start, end in geo.cover_ranges(bbox)))
+        # 날짜변경선을 넘는 범위는 양쪽 끝을 모두 덮는다.
+        ranges = geo.cover_ranges((179.5, -1, -179.5, 1))
+        for point in (geo.encode(0, 179.9), geo.encode(0, -179.9)):
+            self.assertTrue(any(start <= point < (end or "~") for start, end in ranges))
+
+
+class TestRoomGeoSearch(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        # 서울 시청 근처 격자 5 x 5 (약 1km 간격) + 부산 한 곳 + 좌표 없는 방
+        self.seoul = [
+            self.create_room(f"Seoul {i}-{j}", 37.5665 + i * 0.009, 126.978 + j * 0.0113)
+            for i in range(5)
+            for j in range(5)
+        ]
+        self.busan = self.create_room("Busan", 35.1796, 129.0756)
+        self.unknown = self.create_room("Unknown", None, None)
+
+    def create_room(self, name, latitude, longitude):
+        return Room.objects.create(
+            name=name,
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.owner,
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+    def test_geohash_follows_coordinates(self):
+        self.assertEqual(self.busan.geohash, geo.encode(35.1796, 129.0756))
+        self.assertEqual(self.unknown.geohash, "")
+        self.busan.latitude = 33.4996
+        self.busan.longitude = 126.5312
+        self.busan.save(update_fields=["latitude", "longitude"])
+        self.busan.refresh_from_db()
+        self.assertEqual(self.busan.geohash, geo.encode(33.4996, 126.5312))
+
+    def test_map_points_and_clusters(self):
+        response = self.client.get("/api/v1/rooms/map", {"bbox": "126.97,37.56,127.0,37.58"})
+        names = {room["name"] for room in response.json()["results"]}
+        self.assertFalse(response.json()["clustered"])
+        self.assertEqual(names, {"Seoul 0-0", "Seoul 0-1", "Seoul 1-0", "Seoul 1-1"})
+
+        with mock.patch("rooms.maps.MAP_POINT_LIMIT", 10):
+            response = self.client.get("/api/v1/rooms/map", {"bbox": "124,33,131,39"})
+        data = response.json()
+        self.assertTrue(data["clustered"])
+        self.assertEqual(sum(cluster["count"] for cluster in data["results"]), 26)
+
+    def test_nearby_sorted_by_distance(self):
+        response = self.client.get("/api/v1/rooms/nearby", {"lat": 37.5665, "lng": 126.978, "radius": 1.2})
+        results = response.json()["results"]
+        self.assertEqual([room["name"] for room in results], ["Seoul 0-0", "Seoul 0-1", "Seoul 1-0"])
+        distances = [room["distance"] for room in results]
+        self.assertEqual(distances, sorted(distances))
+        self.assertLessEqual(distances[-1], 1.2)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get("/api/v1/rooms/map", {"bbox": "1,2,3"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/rooms/map", {"bbox": "0,10,1,5"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/rooms/nearby", {"lat": 91, "lng": 0}).status_code, 400)
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from common import geo
+from medias.models import Photo
+from rooms.models import Amenity, Room
+from search.models import SearchDocument
+from users.models import User
+
+CSV = """name,price,rooms,toilets,description,address,kind,category,amenities,photos,latitude,longitude
+Hanok stay,120000,2,1,Quiet hanok,Jongno,entire_place,hanok,WiFi|parking,https://example.com/1.jpg|https://example.com/2.jpg,37.58,126.98
+Bad price,abc,1,1,desc,addr,entire_place,,,,,
+Unknown amenity,50000,1,1,desc,addr,private_room,,sauna,,,
+Studio,80000,1,1,Small studio,Mapo,private_room,{category},,,,
+"""
+
+
+class TestRoomImport(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(username="host")
+        self.category = Category.objects.create(name="Hanok", kind=Category.CategoryKindChoices.ROOMS)
+        self.wifi = Amenity.objects.create(name="wifi")
+        self.parking = Amenity.objects.create(name="parking")
+
+    def test_api_imports_valid_rows_and_reports_errors(self):
+        self.client.force_authenticate(self.host)
+        upload = SimpleUploadedFile("rooms.csv", CSV.format(category=self.category.pk).encode())
+        response = self.client.post("/api/v1/rooms/import", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertIn("price", report["errors"][0]["errors"])
+        self.assertIn("amenities", report["errors"][1]["errors"])
+
+        hanok = Room.objects.get(name="Hanok stay")
+        self.assertEqual(hanok.owner, self.host)
+        self.assertEqual(hanok.category, self.category)
+        self.assertEqual(set(hanok.amenities.all()), {self.wifi, self.parking})
+        self.assertEqual(Photo.objects.filter(room=hanok).count(), 2)
+        self.assertEqual(hanok.geohash, geo.encode(37.58, 126.98))
+        self.assertEqual(Room.objects.get(name="Studio").category, self.category)
+        self.assertEqual(SearchDocument.objects.filter(kind="room").count(), 2)
+
+    def test_command_streams_jsonl_in_chunks(self):
+        rows = [
+            {
+                "name": f"Room {i}",
+                "price": 1000 + i,
+                "rooms": 1,
+                "toilets": 1,
+                "description": "desc",
+                "address": "addr",
+                "kind": "shared_room",
+                "amenities": ["wifi"],
+            }
+            for i in range(25)
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as file:
+            file.write("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+        try:
+            # 유저/카테고리/편의시설 조회 3번 + 청크마다 (SAVEPOINT, Room, 편의시설 연결, 검색 문서, RELEASE) 5번
+            with self.assertNumQueries(3 + 3 * 5):
+                call_command("import_rooms", file.name, owner="host", chunk_size=10, stdout=StringIO(), stderr=StringIO())
+        finally:
+            os.unlink(file.name)
+        self.assertEqual(Room.objects.count(), 25)
+        self.assertEqual(self.wifi.rooms.count(), 25)
+
+    def test_dry_run_and_auth(self):
+        upload = SimpleUploadedFile("rooms.csv", CSV.format(category=self.category.pk).encode())
+        self.assertEqual(self.client.post("/api/v1/rooms/import", {"file": upload}).status_code, 403)
+        self.client.force_authenticate(self.host)
+        upload = SimpleUploadedFile("rooms.csv", CSV.format(category=self.category.pk).encode())
+        report = self.client.post("/api/v1/rooms/import?dry_run=true", {"file": upload}).json()
+        self.assertEqual((report["created"], report["failed"]), (2, 2))
+        self.assertFalse(Room.objects.exists())
+        upload = SimpleUploadedFile("rooms.txt", CSV.format(category=self.category.pk).encode())
+        response = self.client.post("/api/v1/rooms/import?file_format=csv&dry_run=true", {"file": upload})
+        self.assertEqual(response.json()["created"], 2)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from bookings.models import Booking
+from rooms.models import Amenity, Room
+from users.models import User
+
+
+class TestRoomSearch(APITestCase):
+    URL = "/api/v1/rooms/search"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.today = timezone.localtime(timezone.now()).date()
+        self.wifi = Amenity.objects.create(name="wifi")
+        self.seoul = self.create_room("Seoul", city="서울", price=100)
+        self.busan = self.create_room("Busan", city="부산", price=300, pet_friendly=False)
+        self.booked = self.create_room("Booked", city="서울", price=200)
+        self.seoul.amenities.add(self.wifi)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.booked,
+            check_in=self.today + timedelta(days=2),
+            check_out=self.today + timedelta(days=4),
+            guests=1,
+        )
+
+    def create_room(self, name, **kwargs):
+        return Room.objects.create(
+            name=name,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+            **kwargs,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(room["name"] for room in response.json()["results"])
+
+    def test_filters(self):
+        self.assertEqual(self.search(city="서울"), ["Booked", "Seoul"])
+        self.assertEqual(self.search(min_price=150, max_price=300), ["Booked", "Busan"])
+        self.assertEqual(self.search(pet_friendly="false"), ["Busan"])
+        self.assertEqual(self.search(amenities=str(self.wifi.pk)), ["Seoul"])
+
+    def test_excludes_booked_rooms(self):
+        self.assertEqual(
+            self.search(city="서울", check_in=self.today + timedelta(days=4), check_out=self.today + timedelta(days=6)),
+            ["Seoul"],
+        )
+        self.assertEqual(
+            self.search(city="서울", check_in=self.today + timedelta(days=5), check_out=self.today + timedelta(days=6)),
+            ["Booked", "Seoul"],
+        )
+
+    def test_invalid_params(self):
+        response = self.client.get(self.URL, {"check_in": self.today})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.URL, {"min_price": "cheap"})
+        self.assertEqual(response.status_code, 400)
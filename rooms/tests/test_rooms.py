@@ -1,8 +1,13 @@
 from rest_framework.test import APITestCase
+from medias.models import Photo
+from reviews.models import Review
+from rooms.models import Room
 from users.models import User
 
 
 class TestRooms(APITestCase):
+    URL = "/api/v1/rooms/"
+
     def setUp(self):
         user = User.objects.create(
             username="test",
@@ -11,11 +16,65 @@ class TestRooms(APITestCase):
         user.save()
         self.user = user
 
+    def create_rooms(self, count):
+        for i in range(count):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="address",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.user,
+            )
+            Photo.objects.create(file="https://example.com/a.jpg", description="photo", room=room)
+            Review.objects.create(user=self.user, room=room, payload="good", rating=4)
+
     def test_create_room(self):
 
-        response = self.client.post("/api/v1/rooms/")
+        response = self.client.post(self.URL)
         self.assertEqual(response.status_code, 403)
 
         self.client.force_login(self.user)
-        response = self.client.post("/api/v1/rooms/")
+        response = self.client.post(self.URL)
         self.assertNotEqual(response.status_code, 403)
+
+    def test_list_rooms_without_cursor_keeps_list_shape(self):
+        self.create_rooms(25)
+
+        response = self.client.get(self.URL)
+        data = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data), 25)
+        self.assertEqual(data[0]["rating"], 4)
+
+    def test_list_rooms_paginated(self):
+        self.create_rooms(25)
+
+        response = self.client.get(self.URL, {"cursor": ""})
+        data = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data["results"]), 20)
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(data["results"][0]["name"], "Room 24")
+        self.assertEqual(data["results"][0]["rating"], 4)
+        self.assertEqual(len(data["results"][0]["photos"]), 1)
+        self.assertFalse(data["results"][0]["is_owner"])
+
+        response = self.client.get(data["next"])
+        data = response.json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertIsNone(data["next"])
+
+    def test_list_rooms_query_count(self):
+        self.create_rooms(20)
+        self.client.force_login(self.user)
+
+        # session + user + rooms + photos
+        with self.assertNumQueries(4):
+            response = self.client.get(self.URL, {"cursor": ""})
+
+        self.assertTrue(response.json()["results"][0]["is_owner"])
@@ -1,21 +1,36 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import ParseError, PermissionDenied
 from rest_framework.generics import get_object_or_404, GenericAPIView
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from bookings.filters import YearFilter, MonthFilter, DayFilter
+from bookings.calendar import build_calendar, get_calendar_version, parse_month, parse_months
+from bookings.filters import BookingRangeFilter
 from bookings.models import Booking
 from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
+from common.cache import detail_cache_key, get_or_build, get_versions, list_version_name
+from common.conditional import ConditionalGetMixin, row_validators, table_validators
 from medias.serializers import PhotoSerializer
 from reviews.serializers import ReviewSerializer
-from rooms import serializers
+from rooms import facets, maps, serializers
+from rooms.filters import RoomSearchFilter
+from rooms.imports import FORMATS, RoomImporter, guess_format, read_rows, text_stream
 from rooms.models import Amenity, Room
+from rooms.paginations import HostRoomPagination, RoomListPagination
+from rooms.stats import with_dashboard_stats
+from wishlists.liked import get_liked_ids, viewer_versions
+
 
+class Amenities(ConditionalGetMixin, APIView):
+    def get_validators(self, request):
+        return table_validators(Amenity.objects.all())
 
-class Amenities(APIView):
     def get(self, request):
         all_amenities = Amenity.objects.all()
         serializer = serializers.AmenitySerializer(all_amenities, many=True)
@@ -28,7 +43,10 @@ class Amenities(APIView):
         return Response(serializer.data)
 
 
-class AmenityDetail(APIView):
+class AmenityDetail(ConditionalGetMixin, APIView):
+    def get_validators(self, request, pk):
+        return row_validators(Amenity.objects.all(), pk=pk)
+
     def get_object(self, pk):
         return get_object_or_404(Amenity, pk=pk)
 
@@ -54,17 +72,35 @@ class AmenityDetail(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class Rooms(APIView):
+class Rooms(ConditionalGetMixin, APIView):
+    versioned = True
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = RoomListPagination
+
+    def get_validators(self, request):
+        return [*get_versions("rooms", list_version_name("rooms")), *viewer_versions(request)], None
+
+    def get_queryset(self):
+        # 평점은 Room 컬럼에서 읽으므로 사진만 prefetch 하면 페이지당 쿼리 수가 일정하다.
+        return Room.objects.prefetch_related("photos")
 
     def get(self, request):
-        all_rooms = Room.objects.all()
+        paginator = self.pagination_class()
+        if paginator.cursor_query_param not in request.query_params:
+            # 페이지 단위 목록은 ?cursor= 로 고른다. 없으면 예전 클라이언트처럼 전체 배열을 준다.
+            serializer = serializers.RoomListSerializer(
+                self.get_queryset(),
+                many=True,
+                context={"request": request},
+            )
+            return Response(serializer.data)
+        queryset_page = paginator.paginate_queryset(self.get_queryset(), request, view=self)
         serializer = serializers.RoomListSerializer(
-            all_rooms,
+            queryset_page,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = serializers.RoomDetailSerializer(data=request.data, context={"request": request})
@@ -73,23 +109,189 @@ class Rooms(APIView):
         return Response(serializer.data)
 
 
-class RoomDetail(APIView):
+class RoomImport(APIView):
+    """
+    CSV/JSONL 파일(multipart "file")로 방을 한꺼번에 등록한다. 형식은 ?file_format= 이나 파일 확장자로 정한다.
+    (?format= 은 DRF 가 응답 형식 지정에 쓰므로 피한다.) ?dry_run=true 면 검증만 한다. 잘못된 행은 건너뛰고 행 번호와 오류를 돌려준다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ParseError("file is required.")
+        format = request.query_params.get("file_format") or guess_format(upload.name)
+        if format not in FORMATS:
+            raise ParseError(f"file_format should be one of {', '.join(FORMATS)}.")
+        importer = RoomImporter(request.user, dry_run=request.query_params.get("dry_run") == "true")
+        report = importer.run(read_rows(text_stream(upload.file), format))
+        return Response(report)
+
+
+class RoomBrowse(APIView):
+    """
+    패싯으로 거른 방 목록과 패싯별 개수. ?kind=a,b&pet_friendly=true&price=0-50000&rooms=1,4+
+    &toilets=2&category=1&amenities=1,2 (같은 패싯은 OR, 편의시설은 모두 갖춘 방)
+    개수는 rooms.facets 가 쿼리 3번으로 세고 캐시한다.
+    """
+
+    pagination_class = RoomListPagination
+
+    def get(self, request):
+        selection = facets.parse_selection(request.query_params)
+        rooms = facets.filter_rooms(Room.objects.prefetch_related("photos"), selection)
+        paginator = self.pagination_class()
+        queryset_page = paginator.paginate_queryset(rooms, request, view=self)
+        serializer = serializers.RoomListSerializer(
+            queryset_page,
+            many=True,
+            context={"request": request},
+        )
+        response = paginator.get_paginated_response(serializer.data)
+        response.data.update(facets.get_facet_counts(selection))
+        return response
+
+
+class RoomMap(APIView):
+    """
+    ?bbox=west,south,east,north 지도 화면 안의 방.
+    MAP_POINT_LIMIT 개 이하면 방 목록을, 넘으면 geohash 칸별 묶음(개수, 평균 좌표)을 돌려준다.
+    """
+
+    def get(self, request):
+        bbox = maps.parse_bbox(request.query_params.get("bbox"))
+        rooms = maps.within_bbox(Room.objects.all(), bbox)
+        # 한도보다 하나 더 읽어보고 넘치면 묶는다. (COUNT 없이 판단)
+        # SQL 에서 pk 로 정렬하면 geohash 인덱스 대신 테이블 전체를 pk 순으로 훑게 되므로 읽은 뒤에 정렬한다.
+        points = sorted(rooms.order_by()[: maps.MAP_POINT_LIMIT + 1], key=lambda room: room.pk)
+        if len(points) <= maps.MAP_POINT_LIMIT:
+            return Response(
+                {
+                    "clustered": False,
+                    "results": serializers.RoomMapSerializer(points, many=True).data,
+                }
+            )
+        return Response({"clustered": True, "results": maps.clusters(rooms, bbox)})
+
+
+class RoomsNearby(APIView):
+    """?lat=&lng=&radius=km(기본 5) 반경 안의 방을 가까운 순으로."""
+
+    pagination_class = PageNumberPagination
+
+    def get(self, request):
+        params = request.query_params
+        latitude = maps.parse_float(params.get("lat"), "lat", -90, 90)
+        longitude = maps.parse_float(params.get("lng"), "lng", -180, 180)
+        radius = maps.parse_float(params.get("radius", 5), "radius", 0, maps.MAX_RADIUS_KM)
+        rooms = maps.within_radius(Room.objects.prefetch_related("photos"), latitude, longitude, radius)
+        paginator = self.pagination_class()
+        queryset_page = paginator.paginate_queryset(rooms, request, view=self)
+        serializer = serializers.RoomNearbySerializer(
+            queryset_page,
+            many=True,
+            context={"request": request, "center": (latitude, longitude)},
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class HostDashboard(APIView):
+    """
+    로그인한 호스트의 방별 통계. ?from=YYYY-MM-DD&to=YYYY-MM-DD (기본 오늘부터 30일) 기간의 점유율을 같이 준다.
+    통계는 모두 서브쿼리 주석으로 계산하므로 방 개수와 관계없이 쿼리 수가 일정하다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = HostRoomPagination
+    default_period_days = 30
+    max_period_days = 366
+
+    def parse_date(self, value, name):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise ParseError(f"{name} should be YYYY-MM-DD.")
+
+    def get_period(self, params):
+        start = self.parse_date(params["from"], "from") if params.get("from") else timezone.localdate()
+        if params.get("to"):
+            end = self.parse_date(params["to"], "to")
+        else:
+            end = start + timedelta(days=self.default_period_days - 1)
+        if end < start:
+            raise ParseError("to should not be before from.")
+        if (end - start).days + 1 > self.max_period_days:
+            raise ParseError(f"The period should be at most {self.max_period_days} days.")
+        return start, end
+
+    def get(self, request):
+        start, end = self.get_period(request.query_params)
+        rooms = with_dashboard_stats(
+            Room.objects.filter(owner=request.user).order_by("-created_at", "-pk"),
+            start,
+            end,
+        )
+        paginator = self.pagination_class()
+        queryset_page = paginator.paginate_queryset(rooms, request, view=self)
+        serializer = serializers.HostDashboardSerializer(
+            queryset_page,
+            many=True,
+            context={"period_days": (end - start).days + 1},
+        )
+        response = paginator.get_paginated_response(serializer.data)
+        response.data["from"] = start
+        response.data["to"] = end
+        return response
+
+
+class RoomSearch(GenericAPIView):
+    queryset = Room.objects.prefetch_related("photos")
+    serializer_class = serializers.RoomListSerializer
+    pagination_class = RoomListPagination
+    filter_backends = [RoomSearchFilter]
+
+    def get(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset_page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset_page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class RoomDetail(ConditionalGetMixin, APIView):
+    versioned = True
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_validators(self, request, pk):
+        # 상세 캐시와 같은 버전이라 바뀌지 않았으면 캐시 조회도 없이 304 를 돌려준다.
+        return [*get_versions("rooms", f"rooms:{pk}"), *viewer_versions(request)], None
+
     def get_object(self, pk):
         return get_object_or_404(Room, pk=pk)
 
+    def get_public_detail(self, pk):
+        room = get_object_or_404(
+            Room.objects.select_related("owner", "category").prefetch_related("amenities", "photos"),
+            pk=pk,
+        )
+        serializer = serializers.PublicRoomDetailSerializer(room)
+        return {"owner": room.owner_id, "data": serializer.data}
+
     def get(self, request, pk):
-        room = self.get_object(pk)
-        serializer = serializers.RoomDetailSerializer(
-            room,
-            context={"request": request},
+        # 유저와 무관한 부분은 캐시에서 읽고, 유저별 필드만 매 요청 덧붙인다.
+        detail = get_or_build(
+            detail_cache_key("rooms", pk),
+            lambda: self.get_public_detail(pk),
         )
-        return Response(serializer.data)
+        data = dict(detail["data"])
+        data["is_owner"] = detail["owner"] == request.user.pk
+        data["is_liked"] = pk in get_liked_ids(request)["rooms"]
+        return Response(data)
 
     def put(self, request, pk):
         room = self.get_object(pk)
-        if room.owner != request.user:
+        if room.owner_id != request.user.pk:
             raise PermissionDenied
 
         serializer = serializers.RoomDetailSerializer(
@@ -104,16 +306,21 @@ class RoomDetail(APIView):
 
     def delete(self, request, pk):
         room = self.get_object(pk)
-        if room.owner != request.user:
+        if room.owner_id != request.user.pk:
             raise PermissionDenied
         room.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class RoomReviews(APIView):
+class RoomReviews(ConditionalGetMixin, APIView):
+    versioned = True
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = PageNumberPagination
 
+    def get_validators(self, request, pk):
+        # 리뷰 추가/수정/삭제와 작성자 정보 변경은 rooms.signals 가 방 버전을 올린다.
+        return get_versions("rooms", f"rooms:{pk}"), None
+
     def get_object(self, pk):
         return get_object_or_404(Room, pk=pk)
 
@@ -146,9 +353,13 @@ class RoomReviews(APIView):
         return Response(serializer.data)
 
 
-class RoomAmenities(APIView):
+class RoomAmenities(ConditionalGetMixin, APIView):
+    versioned = True
     pagination_class = PageNumberPagination
 
+    def get_validators(self, request, pk):
+        return get_versions("rooms", f"rooms:{pk}"), None
+
     def get_object(self, pk):
         return get_object_or_404(Room, pk=pk)
 
@@ -170,7 +381,7 @@ class RoomPhotos(APIView):
 
     def post(self, request, pk):
         room = self.get_object(pk)
-        if request.user != room.owner:
+        if room.owner_id != request.user.pk:
             raise PermissionDenied
         serializer = PhotoSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -178,13 +389,44 @@ class RoomPhotos(APIView):
         return Response(serializer.data)
 
 
+class RoomCalendar(ConditionalGetMixin, APIView):
+    """
+    ?month=YYYY-MM(기본 이번 달)&months=N(기본 1) 동안 하루 한 글자("1" = 예약됨)짜리 달력.
+    ETag 는 예약이 바뀔 때 올라가는 방별 달력 버전으로 만들어서, 바뀌지 않았으면 304 를 돌려준다.
+    """
+
+    versioned = True
+
+    def get_range(self, request):
+        month = request.query_params.get("month")
+        first = parse_month(month) if month else timezone.localdate().replace(day=1)
+        return first, parse_months(request.query_params.get("months", "1"))
+
+    def get_validators(self, request, pk):
+        first, months = self.get_range(request)
+        return [pk, get_calendar_version(pk), f"{first:%Y-%m}", months], None
+
+    def build(self, pk, first, months):
+        get_object_or_404(Room, pk=pk)
+        return {"room": pk, "months": build_calendar(pk, first, months)}
+
+    def get(self, request, pk):
+        first, months = self.get_range(request)
+        version = get_calendar_version(pk)
+        data = get_or_build(
+            f"rooms:calendar:{pk}:{version}:{first:%Y-%m}:{months}",
+            lambda: self.build(pk, first, months),
+        )
+        return Response(data)
+
+
 class RoomBookings(GenericAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = Booking.objects.all()
     serializer_class = PublicBookingSerializer
     pagination_class = PageNumberPagination
-    filter_backends = [DayFilter, MonthFilter, YearFilter]
+    filter_backends = [BookingRangeFilter]
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -201,7 +443,7 @@ class RoomBookings(GenericAPIView):
         bookings = Booking.objects.filter(
             room=room,
             kind=Booking.BookingKindChoices.ROOM,
-        )
+        ).order_by("check_in", "pk")
         filter_queryset = self.filter_queryset(bookings)
         queryset_page = paginator.paginate_queryset(filter_queryset, request)
         serializer = self.get_serializer(queryset_page, many=True)
@@ -0,0 +1,166 @@
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+from .tokens import tokenize_query
+
+# 제목 토큰이 본문 토큰보다 순위에 크게 반영되도록 하는 가중치
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+class SQLiteBackend:
+    """search_fts(FTS5, external content) 테이블을 bm25 로 정렬한다. bm25 는 작을수록 관련도가 높다."""
+
+    def match_expression(self, terms):
+        # 토큰은 글자/숫자로만 되어 있어서 따옴표로 감싸기만 하면 된다. 공백은 AND.
+        return " ".join(f'"{token}"*' if prefix else f'"{token}"' for token, prefix in terms)
+
+    def where(self, terms, kinds):
+        sql = "search_fts MATCH %s"
+        params = [self.match_expression(terms)]
+        if kinds:
+            sql += f" AND d.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params += list(kinds)
+        return sql, params
+
+    def documents(self, terms, kinds):
+        match = RawSQL("SELECT rowid FROM search_fts WHERE search_fts MATCH %s", [self.match_expression(terms)])
+        return SearchDocument.objects.filter(kind__in=kinds, pk__in=match)
+
+    def count(self, terms, kinds):
+        where, params = self.where(terms, kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM search_fts JOIN search_searchdocument d ON d.id = search_fts.rowid "
+                f"WHERE {where}",
+                params,
+            )
+            return cursor.fetchone()[0]
+
+    def ranked_ids(self, terms, kinds, offset, limit):
+        where, params = self.where(terms, kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT d.id, -bm25(search_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score "
+                "FROM search_fts JOIN search_searchdocument d ON d.id = search_fts.rowid "
+                f"WHERE {where} ORDER BY score DESC, d.id DESC LIMIT %s OFFSET %s",
+                params + [limit, offset],
+            )
+            return cursor.fetchall()
+
+
+class PostgreSQLBackend:
+    """search_vector(가중치 A: 제목, B: 본문) 의 GIN 인덱스로 찾고 ts_rank_cd 로 정렬한다."""
+
+    def tsquery(self, terms):
+        return " & ".join(f"{token}:*" if prefix else token for token, prefix in terms)
+
+    def where(self, terms, kinds):
+        sql = "d.search_vector @@ to_tsquery('simple', %s)"
+        params = [self.tsquery(terms)]
+        if kinds:
+            sql += " AND d.kind = ANY(%s)"
+            params.append(list(kinds))
+        return sql, params
+
+    def documents(self, terms, kinds):
+        match = RawSQL("search_vector @@ to_tsquery('simple', %s)", [self.tsquery(terms)], output_field=BooleanField())
+        return SearchDocument.objects.filter(match, kind__in=kinds)
+
+    def count(self, terms, kinds):
+        where, params = self.where(terms, kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM search_searchdocument d WHERE {where}", params)
+            return cursor.fetchone()[0]
+
+    def ranked_ids(self, terms, kinds, offset, limit):
+        where, params = self.where(terms, kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT d.id, ts_rank_cd(d.search_vector, to_tsquery('simple', %s)) AS score "
+                f"FROM search_searchdocument d WHERE {where} ORDER BY score DESC, d.id DESC LIMIT %s OFFSET %s",
+                [self.tsquery(terms)] + params + [limit, offset],
+            )
+            return cursor.fetchall()
+
+
+class FallbackBackend:
+    """역색인이 없는 DB 용. 토큰 컬럼을 LIKE 로 훑으므로 느리고 순위도 없다."""
+
+    def queryset(self, terms, kinds):
+        queryset = SearchDocument.objects.all()
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        for token, _ in terms:
+            queryset = queryset.filter(Q(title_tokens__contains=token) | Q(body_tokens__contains=token))
+        return queryset
+
+    def documents(self, terms, kinds):
+        return self.queryset(terms, kinds)
+
+    def count(self, terms, kinds):
+        return self.queryset(terms, kinds).count()
+
+    def ranked_ids(self, terms, kinds, offset, limit):
+        ids = self.queryset(terms, kinds).order_by("-pk").values_list("pk", flat=True)[offset:offset + limit]
+        return [(pk, 0.0) for pk in ids]
+
+
+def get_backend():
+    if connection.vendor == "sqlite":
+        return SQLiteBackend()
+    if connection.vendor == "postgresql":
+        return PostgreSQLBackend()
+    return FallbackBackend()
+
+
+class SearchResults:
+    """
+    페이지네이터가 count() 와 슬라이싱만 하도록 만든 지연 결과.
+    슬라이스한 구간만 DB 에서 순위대로 읽고, rank 를 붙인 SearchDocument 목록을 돌려준다.
+    """
+
+    ordered = True
+
+    def __init__(self, query, kinds=None):
+        self.terms = tokenize_query(query)
+        self.kinds = list(kinds or [])
+        self.backend = get_backend()
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count(self.terms, self.kinds) if self.terms else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step is not None:
+            raise TypeError("SearchResults only supports slicing without a step.")
+        offset = index.start or 0
+        limit = (index.stop if index.stop is not None else self.count()) - offset
+        if not self.terms or limit <= 0:
+            return []
+        ranked = self.backend.ranked_ids(self.terms, self.kinds, offset, limit)
+        documents = SearchDocument.objects.in_bulk([pk for pk, score in ranked])
+        results = []
+        for pk, score in ranked:
+            document = documents[pk]
+            document.rank = score
+            results.append(document)
+        return results
+
+
+def matching_object_ids(kind, query):
+    """
+    kind 종류에서 query 에 맞는 원본 객체 pk 의 values() 쿼리셋. (순위 무관)
+    pk__in=... 에 넣으면 id 목록을 파이썬으로 읽지 않고 서브쿼리 한 번으로 걸러진다.
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return SearchDocument.objects.none().values("object_id")
+    return get_backend().documents(terms, [kind]).values("object_id")
@@ -0,0 +1,59 @@
+from .tokens import tokenize
+
+SUMMARY_LENGTH = 250
+
+# 종류별 원본 모델과 색인할 필드. 제목 필드가 본문 필드보다 높은 가중치로 순위에 반영된다.
+SOURCES = {
+    "room": {
+        "model": "rooms.Room",
+        "title": ["name"],
+        "body": ["country", "city", "address", "description"],
+    },
+    "experience": {
+        "model": "experiences.Experience",
+        "title": ["name"],
+        "body": ["country", "city", "address", "description"],
+    },
+    "review": {
+        "model": "reviews.Review",
+        "title": [],
+        "body": ["payload"],
+    },
+}
+
+
+def join_fields(instance, fields):
+    return " ".join(str(getattr(instance, field) or "") for field in fields).strip()
+
+
+def build_document(document_model, kind, instance):
+    """instance 로 (저장하지 않은) 검색 문서를 만든다. 마이그레이션의 과거 모델로도 쓸 수 있다."""
+    source = SOURCES[kind]
+    title = join_fields(instance, source["title"])
+    body = join_fields(instance, source["body"])
+    return document_model(
+        kind=kind,
+        object_id=instance.pk,
+        title=title[:SUMMARY_LENGTH],
+        summary=body[:SUMMARY_LENGTH],
+        title_tokens=" ".join(tokenize(title)),
+        body_tokens=" ".join(tokenize(body)),
+    )
+
+
+def rebuild_documents(get_model, document_model, kinds=None, batch_size=2000):
+    """kinds 종류의 검색 문서를 모두 지우고 원본 모델에서 다시 만든다."""
+    total = 0
+    for kind in kinds or SOURCES:
+        model = get_model(*SOURCES[kind]["model"].split("."))
+        document_model.objects.filter(kind=kind).delete()
+        documents = []
+        for instance in model.objects.order_by("pk").iterator(chunk_size=batch_size):
+            documents.append(build_document(document_model, kind, instance))
+            if len(documents) >= batch_size:
+                document_model.objects.bulk_create(documents)
+                total += len(documents)
+                documents = []
+        document_model.objects.bulk_create(documents)
+        total += len(documents)
+    return total
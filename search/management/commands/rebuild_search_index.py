@@ -0,0 +1,18 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.documents import SOURCES, rebuild_documents
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents (and the database full-text index) from rooms, experiences and reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", choices=list(SOURCES))
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_documents(apps.get_model, SearchDocument, kinds=options["kind"])
+        self.stdout.write(f"Indexed {total} documents.")
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from search.documents import rebuild_documents
+
+
+def backfill_documents(apps, schema_editor):
+    rebuild_documents(apps.get_model, apps.get_model("search", "SearchDocument"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_full_text_index'),
+        ('rooms', '0003_room_room_location_price_idx'),
+        ('experiences', '0002_experience_rating_sum_experience_review_count'),
+        ('reviews', '0002_backfill_ratings'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    검색 대상 객체(방/체험/리뷰) 하나당 한 행. 토큰 컬럼은 search.tokens 로 만든 n-gram 을 공백으로 이은 것이다.
+    실제 역색인은 DB 가 이 토큰 컬럼으로 유지한다. (SQLite FTS5 테이블 search_fts, PostgreSQL search_vector 컬럼)
+    """
+
+    class KindChoices(models.TextChoices):
+        ROOM = "room", "Room"
+        EXPERIENCE = "experience", "Experience"
+        REVIEW = "review", "Review"
+
+    kind = models.CharField(
+        max_length=15,
+        choices=KindChoices.choices,
+    )
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(
+        max_length=250,
+        blank=True,
+    )
+    summary = models.CharField(
+        max_length=250,
+        blank=True,
+    )
+    title_tokens = models.TextField(blank=True)
+    body_tokens = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from rest_framework.serializers import ModelSerializer
+
+from .models import SearchDocument
+
+
+class SearchResultSerializer(ModelSerializer):
+
+    pk = serializers.IntegerField(source="object_id")
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = (
+            "kind",
+            "pk",
+            "title",
+            "summary",
+            "rank",
+        )
@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .documents import SOURCES, build_document
+from .models import SearchDocument
+
+# 원본이 저장/삭제될 때마다 그 객체의 검색 문서 한 행만 고친다. 색인(FTS5/tsvector)은 DB 가 따라 갱신한다.
+
+
+def index_object(kind, instance):
+    document = build_document(SearchDocument, kind, instance)
+    SearchDocument.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={
+            "title": document.title,
+            "summary": document.summary,
+            "title_tokens": document.title_tokens,
+            "body_tokens": document.body_tokens,
+        },
+    )
+
+
+def connect_source(kind, model):
+    def index_on_save(sender, instance, raw=False, **kwargs):
+        if not raw:
+            index_object(kind, instance)
+
+    def remove_on_delete(sender, instance, **kwargs):
+        SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+    post_save.connect(index_on_save, sender=model, weak=False, dispatch_uid=f"search.index.{kind}")
+    post_delete.connect(remove_on_delete, sender=model, weak=False, dispatch_uid=f"search.remove.{kind}")
+
+
+for kind, source in SOURCES.items():
+    connect_source(kind, apps.get_model(source["model"]))
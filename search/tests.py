@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from experiences.models import Experience
+from reviews.models import Review
+from rooms.models import Room
+from users.models import User
+from .backends import matching_object_ids
+from .models import SearchDocument
+from .tokens import tokenize, tokenize_query
+
+
+class TestTokens(TestCase):
+    def test_korean_bigrams_and_words(self):
+        self.assertEqual(
+            tokenize("서울역 근처 Cozy_Room 101호"),
+            ["서울", "울역", "근처", "cozy", "room", "101", "호"],
+        )
+        self.assertEqual(tokenize_query("서 서울 서울"), [("서", True), ("서울", False)])
+
+
+class TestSearch(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="host")
+        self.station = self.create_room("서울역 앞 아파트", "조용한 숙소", city="서울")
+        self.beach = self.create_room("Ocean view", "부산 해운대 바로 앞, 서울역에서 KTX", city="부산")
+        self.experience = Experience.objects.create(
+            name="한강 자전거 투어",
+            description="서울 한강을 달려요",
+            host=self.user,
+            price=10,
+            address="서울",
+            start="10:00",
+            end="12:00",
+        )
+        self.review = Review.objects.create(user=self.user, room=self.beach, payload="Great ocean view", rating=5)
+
+    def create_room(self, name, description, city):
+        return Room.objects.create(
+            name=name,
+            description=description,
+            city=city,
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+
+    def search(self, query, **params):
+        response = self.client.get("/api/v1/search/", {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(result["kind"], result["pk"]) for result in response.json()["results"]]
+
+    def test_ranked_korean_search(self):
+        # 제목에서 맞은 방이 본문에서 맞은 방보다 앞선다.
+        self.assertEqual(self.search("서울역"), [("room", self.station.pk), ("room", self.beach.pk)])
+        self.assertIn(("experience", self.experience.pk), self.search("한강"))
+        self.assertEqual(self.search("ocean", kind="review"), [("review", self.review.pk)])
+        self.assertEqual(self.search("해"), [("room", self.beach.pk)])
+        self.assertEqual(self.search("없는말"), [])
+
+    def test_index_follows_changes(self):
+        self.station.name = "강남 오피스텔"
+        self.station.save()
+        self.assertEqual(self.search("서울역"), [("room", self.beach.pk)])
+        self.assertEqual(self.search("오피스텔"), [("room", self.station.pk)])
+
+        self.beach.delete()
+        self.assertEqual(self.search("서울역"), [])
+        self.assertFalse(SearchDocument.objects.filter(kind="review").exists())
+
+    def test_paginated_and_rebuildable(self):
+        for i in range(25):
+            self.create_room(f"Studio {i}", "studio", city="서울")
+        response = self.client.get("/api/v1/search/", {"q": "studio"})
+        self.assertEqual(response.json()["count"], 25)
+        self.assertEqual(len(response.json()["results"]), 20)
+
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(len(self.client.get("/api/v1/search/", {"q": "studio", "page": 2}).json()["results"]), 5)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get("/api/v1/search/").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/search/", {"q": "a", "kind": "user"}).status_code, 400)
+
+    def test_matching_object_ids_is_a_subquery(self):
+        Review.objects.create(user=self.user, room=self.station, payload="good", rating=4)
+        with self.assertNumQueries(1):
+            reviews = list(Review.objects.filter(pk__in=matching_object_ids("review", "great")))
+        self.assertEqual(reviews, [self.review])
+        self.assertFalse(Review.objects.filter(pk__in=matching_object_ids("review", "!!")).exists())
@@ -0,0 +1,42 @@
+import re
+import unicodedata
+
+# 한글/한자/가나는 띄어쓰기만으로는 검색이 잘 안 되므로(조사, 복합어) 두 글자씩 끊어서 색인한다.
+CJK_CHARS = "\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+WORD = re.compile(r"[^\W_]+")
+RUN = re.compile(rf"[{CJK_CHARS}]+|[^{CJK_CHARS}]+")
+CJK_RUN = re.compile(rf"[{CJK_CHARS}]+")
+
+
+def normalize(text):
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def iter_runs(text):
+    for word in WORD.findall(normalize(text)):
+        yield from RUN.findall(word)
+
+
+def tokenize(text):
+    """색인용 토큰. 한글 등은 2-gram, 나머지(영문/숫자)는 단어 그대로."""
+    tokens = []
+    for run in iter_runs(text):
+        if CJK_RUN.fullmatch(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def tokenize_query(text):
+    """
+    검색어 토큰. (토큰, 접두어 여부) 목록이며 모두 만족해야 한다.
+    한 글자짜리 한글은 2-gram 의 앞 글자로 찾도록 접두어 검색을 한다.
+    """
+    terms = []
+    for run in iter_runs(text):
+        if CJK_RUN.fullmatch(run) and len(run) == 1:
+            terms.append((run, True))
+        else:
+            terms.extend((token, False) for token in tokenize(run))
+    return list(dict.fromkeys(terms))
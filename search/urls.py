@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import Search
+
+urlpatterns = [
+    path("", Search.as_view()),
+]
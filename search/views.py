@@ -0,0 +1,35 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.views import APIView
+
+from .backends import SearchResults
+from .models import SearchDocument
+from .paginations import SearchPagination
+from .serializers import SearchResultSerializer
+
+
+class Search(APIView):
+    """
+    ?q=검색어(&kind=room,experience,review) 로 방/체험/리뷰를 한 번에 찾는다. 관련도 순으로 페이지를 나눈다.
+    응답의 pk 는 각 종류 원본 객체의 pk 다.
+    """
+
+    pagination_class = SearchPagination
+
+    def get_kinds(self, value):
+        if not value:
+            return []
+        kinds = value.split(",")
+        invalid = set(kinds) - set(SearchDocument.KindChoices.values)
+        if invalid:
+            raise ParseError(f"kind should be one of {', '.join(SearchDocument.KindChoices.values)}.")
+        return kinds
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ParseError("q is required.")
+        results = SearchResults(query, kinds=self.get_kinds(request.query_params.get("kind")))
+        paginator = self.pagination_class()
+        queryset_page = paginator.paginate_queryset(results, request, view=self)
+        serializer = SearchResultSerializer(queryset_page, many=True)
+        return paginator.get_paginated_response(serializer.data)
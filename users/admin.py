@@ -1,10 +1,44 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+
+from common.bulk import chunked_pks
+from common.cache import bump_objects
+from .cache import forget_users
 from .models import User
 
 
+def set_host(model_admin, request, users, is_host):
+    """
+    is_host 를 chunk 단위 UPDATE 로 바꾼다. users.signals 가 유저마다 하던 인증 캐시 정리와
+    공개 프로필 무효화를 한 번에 한다. (방 상세의 owner 에는 is_host 가 없어 방 캐시는 그대로 둔다)
+    """
+    changed = []
+    with transaction.atomic():
+        for chunk in chunked_pks(users.exclude(is_host=is_host)):
+            selected = User.objects.filter(pk__in=chunk)
+            changed += [User(pk=pk, username=username) for pk, username in selected.values_list("pk", "username")]
+            selected.update(is_host=is_host)
+        bump_objects("users", [user.pk for user in changed])
+        transaction.on_commit(lambda: forget_users(changed))
+    model_admin.message_user(request, f"{len(changed)} users updated.")
+
+
+@admin.action(description="Mark as hosts")
+def make_hosts(model_admin, request, users):
+    set_host(model_admin, request, users, True)
+
+
+@admin.action(description="Unmark as hosts")
+def remove_hosts(model_admin, request, users):
+    set_host(model_admin, request, users, False)
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
+
+    actions = (make_hosts, remove_hosts)
+
     fieldsets = (
         (
             "Profile",
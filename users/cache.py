@@ -0,0 +1,81 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import User
+
+
+class UserCache:
+    """
+    프로세스 안에서만 쓰는 작은 TTL 캐시. 인증 때마다 users 테이블을 읽지 않도록
+    pk/username 으로 User 를 잠깐 들고 있는다. 꺼낼 때는 복사본을 주어 요청끼리 객체를 공유하지 않는다.
+    """
+
+    def __init__(self, ttl, max_size=10_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, **lookup):
+        (field, value), = lookup.items()
+        key = (field, value)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry[0] > now:
+            return copy.copy(entry[1])
+        user = User.objects.get(**lookup)
+        with self.lock:
+            if len(self.entries) >= self.max_size:
+                self.entries.clear()
+            expires = now + self.ttl
+            self.entries[("pk", user.pk)] = (expires, user)
+            self.entries[("username", user.username)] = (expires, user)
+        return copy.copy(user)
+
+    def evict(self, user):
+        with self.lock:
+            entry = self.entries.pop(("pk", user.pk), None)
+            if entry:
+                # username 이 바뀐 경우 예전 username 으로 들어있는 항목도 지운다.
+                self.entries.pop(("username", entry[1].username), None)
+            self.entries.pop(("username", user.username), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(ttl=settings.JWT_USER_CACHE_TTL)
+
+
+def token_version_key(pk):
+    return f"users:{pk}:token_version"
+
+
+def get_token_version(pk):
+    """현재 유효한 토큰 버전. 없는(또는 비활성) 유저면 None. 공유 캐시에 TTL 동안 보관한다."""
+    key = token_version_key(pk)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=pk, is_active=True).values_list("token_version", flat=True).first()
+        )
+        # None 도 "없음" 으로 캐시해두기 위해 -1 로 저장한다.
+        cache.set(key, -1 if version is None else version, settings.JWT_USER_CACHE_TTL)
+    return None if version == -1 else version
+
+
+def forget_user(user):
+    user_cache.evict(user)
+    cache.delete(token_version_key(user.pk))
+
+
+def forget_users(users):
+    for user in users:
+        user_cache.evict(user)
+    cache.delete_many([token_version_key(user.pk) for user in users])
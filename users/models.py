@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import AbstractUser
 
 
@@ -41,6 +42,11 @@ class User(AbstractUser):
         max_length=5,
         choices=CurrencyChoices.choices,
     )
+    # JWT 에 함께 담기는 버전. 올리면 그 전에 발급된 토큰이 모두 무효가 된다.
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
 
     def total_reviews(self):
         return self.reviews.count()
@@ -48,3 +54,7 @@ class User(AbstractUser):
     def total_rooms(self):
         return self.rooms.count()
 
+    def revoke_tokens(self):
+        self.token_version = F("token_version") + 1
+        self.save(update_fields=["token_version"])
+        self.refresh_from_db(fields=["token_version"])
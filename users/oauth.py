@@ -0,0 +1,91 @@
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+
+# 이벤트 루프마다 커넥션 풀을 하나씩 둔다. (ASGI 서버에서는 루프가 하나라 프로세스 전체가 풀을 공유한다)
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.OAUTH_HTTP_TIMEOUT),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _clients[loop] = client
+    return client
+
+
+class OAuthError(Exception):
+    pass
+
+
+async def request_json(method, url, **kwargs):
+    try:
+        response = await get_http_client().request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        raise OAuthError(f"{method} {url} failed: {e}") from e
+
+
+async def fetch_github_profile(code):
+    """code 로 access token 을 받은 뒤 유저 정보와 이메일을 동시에 가져온다."""
+    token = await request_json(
+        "POST",
+        settings.GH_TOKEN_URL,
+        params={
+            "code": code,
+            "client_id": settings.GH_CLIENT_ID,
+            "client_secret": settings.GH_SECRET,
+        },
+        headers={"Accept": "application/json"},
+    )
+    access_token = token.get("access_token")
+    if not access_token:
+        raise OAuthError("GitHub did not return an access token")
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/json",
+    }
+    user_data, user_emails = await asyncio.gather(
+        request_json("GET", f"{settings.GH_API_URL}/user", headers=headers),
+        # github email이 private인 것을 받아오기 위함
+        request_json("GET", f"{settings.GH_API_URL}/user/emails", headers=headers),
+    )
+    if not user_emails:
+        raise OAuthError("GitHub user has no email")
+    return user_data, user_emails
+
+
+async def fetch_kakao_account(code):
+    token = await request_json(
+        "POST",
+        settings.KAKAO_TOKEN_URL,
+        headers={"Content-type": "application/x-www-form-urlencoded;charset=utf-8"},
+        data={
+            "grant_type": "authorization_code",
+            "client_id": settings.KAKAO_CLIENT_ID,
+            "redirect_uri": settings.KAKAO_REDIRECT_URI,
+            "code": code,
+        },
+    )
+    access_token = token.get("access_token")
+    if not access_token:
+        raise OAuthError("Kakao did not return an access token")
+    user_data = await request_json(
+        "POST",
+        f"{settings.KAKAO_API_URL}/v2/user/me",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
+        },
+    )
+    kakao_account = user_data.get("kakao_account")
+    if not kakao_account:
+        raise OAuthError("Kakao did not return an account")
+    return kakao_account
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+from common.cache import bump_versions, detail_cache_key, get_or_build
+from reviews.models import Review
+from rooms.models import Room
+from rooms.stats import count_rows
+from .models import User
+from .serializers import PublicUserSerializer
+
+# 공개 프로필(PublicUser) 캐시.
+# username -> pk 는 따로 캐시하고, 프로필은 "users:<pk>" 버전으로 무효화한다.
+
+
+def bump_profiles(*pks):
+    bump_versions(*(f"users:{pk}" for pk in pks if pk is not None))
+
+
+def user_pk_cache_key(username):
+    return f"users:pk:{username}"
+
+
+def sum_rows(queryset, field, owner_field):
+    rows = (
+        queryset.filter(**{owner_field: OuterRef("pk")})
+        .order_by()
+        .values(owner_field)
+        .annotate(total=Sum(field))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def with_profile_stats(queryset):
+    """리뷰 수, 방 수, 호스트 평점(모든 방 리뷰의 평균)을 붙인다. 방 평점은 Room 의 카운터 컬럼을 더한다."""
+    queryset = queryset.annotate(
+        review_total=count_rows(Review.objects.all(), "user"),
+        room_total=count_rows(Room.objects.all(), "owner"),
+        host_rating_sum=sum_rows(Room.objects.all(), "rating_sum", "owner"),
+        host_review_count=sum_rows(Room.objects.all(), "review_count", "owner"),
+    )
+    return queryset.annotate(
+        host_rating=Coalesce(
+            Round(
+                # 리뷰가 없는 호스트는 0 으로 나누지 않고 NULL -> 0.0 이 되게 한다. (PostgreSQL 은 0 으로 나누면 에러)
+                Cast(F("host_rating_sum"), FloatField()) / NullIf(F("host_review_count"), 0),
+                2,
+            ),
+            0.0,
+        ),
+    )
+
+
+def get_user_pk(username):
+    key = user_pk_cache_key(username)
+    pk = cache.get(key)
+    if pk is None:
+        pk = User.objects.filter(username=username).values_list("pk", flat=True).first()
+        if pk is not None:
+            cache.set(key, pk, settings.DETAIL_CACHE_TIMEOUT)
+    return pk
+
+
+def build_profile(pk):
+    user = with_profile_stats(User.objects.filter(pk=pk)).first()
+    if user is None:
+        return None
+    return {"username": user.username, "data": PublicUserSerializer(user).data}
+
+
+def get_public_profile(username):
+    """캐시된 공개 프로필. 없는 유저면 None."""
+    pk = get_user_pk(username)
+    if pk is None:
+        return None
+    profile = get_or_build(detail_cache_key("users", pk), lambda: build_profile(pk) or {})
+    if profile.get("username") != username:
+        # 이름이 바뀌었거나 지워진 유저. 예전 username 의 pk 캐시를 버리고 DB 에서 다시 찾는다.
+        cache.delete(user_pk_cache_key(username))
+        pk = User.objects.filter(username=username).values_list("pk", flat=True).first()
+        profile = build_profile(pk) if pk is not None else None
+    return profile["data"] if profile else None
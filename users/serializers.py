@@ -41,8 +41,10 @@ class PrivateUserSerializer(ModelSerializer):
 
 
 class PublicUserSerializer(serializers.ModelSerializer):
-    total_reviews = serializers.SerializerMethodField()
-    total_rooms = serializers.SerializerMethodField()
+    # users.profiles.with_profile_stats 로 주석을 붙인 유저를 받는다.
+    total_reviews = serializers.IntegerField(source="review_total", read_only=True)
+    total_rooms = serializers.IntegerField(source="room_total", read_only=True)
+    host_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = User
@@ -55,11 +57,6 @@ class PublicUserSerializer(serializers.ModelSerializer):
             "currency",
             "total_reviews",
             "total_rooms",
+            "host_rating",
         ]
 
-    def get_total_reviews(self, user):
-        return user.total_reviews()
-
-    def get_total_rooms(self, user):
-        return user.total_rooms()
-
@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from reviews.models import Review
+from rooms.models import Room
+from .cache import forget_user
+from .models import User
+from .profiles import bump_profiles
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_user(instance))
+
+
+# 공개 프로필 캐시 무효화. 리뷰 수/방 수/호스트 평점이 바뀌는 유저의 버전을 올린다.
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields and set(update_fields) <= {"last_login", "password", "token_version"}):
+        return
+    bump_profiles(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_profile(sender, instance, **kwargs):
+    bump_profiles(instance.pk)
+
+
+@receiver(pre_save, sender=Room)
+def remember_previous_owner(sender, instance, raw, **kwargs):
+    instance._previous_owner_id = None
+    if not raw and instance.pk is not None:
+        instance._previous_owner_id = Room.objects.filter(pk=instance.pk).values_list("owner_id", flat=True).first()
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_owner_profile(sender, instance, **kwargs):
+    bump_profiles(instance.owner_id, getattr(instance, "_previous_owner_id", None))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewer_and_host_profiles(sender, instance, **kwargs):
+    # 리뷰가 다른 방으로 옮겨지면 이전 방 호스트의 평점도 바뀐다. (reviews.signals 가 저장 전 값을 기억해둔다)
+    previous = getattr(instance, "_previous_review", None) or {}
+    room_pks = {pk for pk in (instance.room_id, previous.get("room_id")) if pk is not None}
+    owners = Room.objects.filter(pk__in=room_pks).values_list("owner_id", flat=True) if room_pks else []
+    bump_profiles(instance.user_id, *owners)
@@ -1,3 +1,320 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from reviews.models import Review
+from rooms.models import Room
+from .cache import user_cache
+from .models import User
+
+
+class TestJWTAuthentication(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create(username="test", is_host=True)
+        self.user.set_password("password")
+        self.user.save()
+
+    def log_in(self):
+        response = self.client.post(
+            "/api/v1/users/jwt-login",
+            data={"username": "test", "password": "password"},
+        )
+        return response.json()["token"]
+
+    def test_token_carries_claims(self):
+        claims = jwt.decode(self.log_in(), settings.SECRET_KEY, algorithms=["HS256"])
+
+        self.assertEqual(claims["pk"], self.user.pk)
+        self.assertEqual(claims["username"], "test")
+        self.assertTrue(claims["is_host"])
+        self.assertEqual(claims["ver"], 0)
+        self.assertIn("exp", claims)
+
+    def test_users_table_read_once(self):
+        token = self.log_in()
+        self.client.get("/api/v1/users/me", HTTP_JWT=token)
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/users/me", HTTP_JWT=token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["is_host"], True)
+
+    def test_me_follows_changes_during_token_lifetime(self):
+        token = self.log_in()
+        self.client.get("/api/v1/users/me", HTTP_JWT=token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put("/api/v1/users/me", {"is_host": False}, HTTP_JWT=token)
+        self.assertFalse(self.client.get("/api/v1/users/me", HTTP_JWT=token).json()["is_host"])
+
+        admin = User.objects.create_superuser(username="admin", password="password")
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/admin/users/user/", {"action": "make_hosts", "_selected_action": [self.user.pk]})
+        self.client.logout()
+        self.assertTrue(self.client.get("/api/v1/users/me", HTTP_JWT=token).json()["is_host"])
+
+    def test_revoked_on_log_out(self):
+        token = self.log_in()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/users/log-out", HTTP_JWT=token)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=token)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["detail"], "Token Revoked")
+
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=self.log_in())
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(JWT_EXPIRATION=timedelta(seconds=-1))
+    def test_expired(self):
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=self.log_in())
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["detail"], "Token Expired")
+
+    def test_invalid(self):
+        response = self.client.get("/api/v1/users/me", HTTP_JWT="not-a-token")
+        self.assertEqual(response.status_code, 403)
+
+
+class TestPublicProfile(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(username="host", name="Host")
+        self.guest = User.objects.create(username="guest")
+        self.rooms = [self.create_room(f"Room {i}") for i in range(2)]
+
+    def create_room(self, name):
+        return Room.objects.create(
+            name=name,
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.host,
+        )
+
+    def get(self, username):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(f"/api/v1/users/@{username}")
+
+    def review(self, room, rating):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Review.objects.create(user=self.guest, room=room, payload="review", rating=rating)
+
+    def test_counts_and_host_rating(self):
+        self.review(self.rooms[0], 5)
+        self.review(self.rooms[0], 4)
+        self.review(self.rooms[1], 3)
+        host = self.get("host").json()
+        self.assertEqual((host["total_rooms"], host["total_reviews"], host["host_rating"]), (2, 0, 4.0))
+        guest = self.get("guest").json()
+        self.assertEqual((guest["total_rooms"], guest["total_reviews"], guest["host_rating"]), (0, 3, 0))
+
+    def test_cached_and_invalidated(self):
+        self.get("host")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get("host").json()["host_rating"], 0)
+
+        review = self.review(self.rooms[0], 2)
+        self.assertEqual(self.get("host").json()["host_rating"], 2.0)
+        self.assertEqual(self.get("guest").json()["total_reviews"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+            self.create_room("Room 2")
+        host = self.get("host").json()
+        self.assertEqual((host["total_rooms"], host["host_rating"]), (3, 0))
+
+    def test_admin_bulk_actions_refresh_profile(self):
+        reviews = [self.review(self.rooms[0], 5), self.review(self.rooms[1], 3)]
+        self.assertEqual(self.get("host").json()["host_rating"], 4.0)
+
+        admin = User.objects.create_superuser(username="admin", password="password")
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/admin/reviews/review/",
+                {"action": "set_rating", "_selected_action": [review.pk for review in reviews], "rating": "1"},
+            )
+            self.client.post(
+                "/admin/users/user/",
+                {"action": "make_hosts", "_selected_action": [self.host.pk]},
+            )
+        self.client.logout()
+
+        self.assertEqual(
+            list(Room.objects.filter(pk__in=[room.pk for room in self.rooms]).values_list("rating_sum", "review_count")),
+            [(1, 1), (1, 1)],
+        )
+        host = self.get("host").json()
+        self.assertEqual((host["host_rating"], host["is_host"]), (1.0, True))
+
+    def test_renamed_and_missing_users(self):
+        self.get("host")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.host.username = "renamed"
+            self.host.save()
+        self.assertEqual(self.get("host").status_code, 404)
+        self.assertEqual(self.get("renamed").json()["name"], "Host")
+        self.assertEqual(self.get("nobody").status_code, 404)
+
+
+class StubOAuthHandler(BaseHTTPRequestHandler):
+    """GitHub/Kakao 대신 응답하는 로컬 스텁. 모든 응답을 DELAY 초 늦게 돌려준다."""
+
+    DELAY = 0.2
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, payload):
+        time.sleep(self.DELAY)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def login_name(self):
+        return self.headers["Authorization"].removeprefix("Bearer token-")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/github/token"):
+            code = self.path.split("code=")[1].split("&")[0]
+            self.reply({"access_token": f"token-{code}"})
+        elif self.path == "/kakao/token":
+            self.reply({"access_token": f"token-{parse_qs(body.decode())['code'][0]}"})
+        elif self.path == "/kakao/api/v2/user/me":
+            # 코드가 "no-email" 이면 이메일 제공에 동의하지 않은 계정처럼 답한다.
+            account = {"profile": {"nickname": "kakao"}}
+            if self.login_name() != "no-email":
+                account["email"] = "kakao@example.com"
+            self.reply({"kakao_account": account})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        if self.path == "/github/api/user":
+            self.reply({"login": self.login_name(), "name": "GitHub User", "avatar_url": ""})
+        elif self.path == "/github/api/user/emails":
+            self.reply([{"email": f"{self.login_name()}@example.com"}])
+        else:
+            self.send_error(404)
+
+
+class StubOAuthServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class TestSocialLogIn(TestCase):
+    CONCURRENT_LOGINS = 10
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubOAuthServer(("127.0.0.1", 0), StubOAuthHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.stub_settings = override_settings(
+            GH_TOKEN_URL=f"{base}/github/token",
+            GH_API_URL=f"{base}/github/api",
+            KAKAO_TOKEN_URL=f"{base}/kakao/token",
+            KAKAO_API_URL=f"{base}/kakao/api",
+        )
+        cls.stub_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    async def log_in(self, url, code):
+        started = time.perf_counter()
+        response = await self.async_client.post(url, {"code": code}, content_type="application/json")
+        return response.status_code, time.perf_counter() - started
+
+    async def test_github_log_in(self):
+        status_code, _ = await self.log_in("/api/v1/users/github", "octocat")
+
+        self.assertEqual(status_code, 200)
+        user = await User.objects.aget(username="octocat")
+        self.assertEqual(user.email, "octocat@example.com")
+        self.assertFalse(user.has_usable_password())
+
+        status_code, _ = await self.log_in("/api/v1/users/github", "octocat")
+        self.assertEqual(status_code, 200)
+        self.assertEqual(await User.objects.filter(email="octocat@example.com").acount(), 1)
+
+    async def test_kakao_log_in(self):
+        status_code, _ = await self.log_in("/api/v1/users/kakao", "code")
+
+        self.assertEqual(status_code, 200)
+        self.assertTrue(await User.objects.filter(email="kakao@example.com").aexists())
+
+    async def test_rejected_accounts(self):
+        await User.objects.acreate(username="taken", email="other@example.com")
+        status_code, _ = await self.log_in("/api/v1/users/github", "taken")
+        self.assertEqual(status_code, 400)
+
+        status_code, _ = await self.log_in("/api/v1/users/kakao", "no-email")
+        self.assertEqual(status_code, 400)
+        self.assertFalse(await User.objects.filter(email=None).aexists())
+
+    async def test_missing_code(self):
+        response = await self.async_client.post("/api/v1/users/github", {}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_concurrent_log_ins_do_not_block_the_worker(self):
+        delay = StubOAuthHandler.DELAY
+        ticks = []
+        done = asyncio.Event()
+
+        async def ticker():
+            # 이벤트 루프가 막혀 있으면 틱 사이 간격이 벌어진다.
+            while not done.is_set():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        # 커넥션 풀(과 SSL 컨텍스트)은 프로세스에서 처음 한 번만 만들어지므로 미리 데워두고 잰다.
+        await self.log_in("/api/v1/users/github", "warm-up")
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.log_in("/api/v1/users/github", f"user{i}") for i in range(self.CONCURRENT_LOGINS))
+        )
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ticking
+
+        latencies = [latency for _, latency in results]
+        longest_block = max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+
+        self.assertEqual([status_code for status_code, _ in results], [200] * self.CONCURRENT_LOGINS)
+        # 로그인 하나는 업스트림 왕복 두 번(토큰, 유저/이메일 동시 요청)이고,
+        # 동기 뷰였다면 전체가 10 * 3 * delay 걸린다. 로그인들이 대기 시간을 서로 겹쳐 쓴다.
+        self.assertLess(max(latencies), self.CONCURRENT_LOGINS * delay)
+        self.assertLess(elapsed, self.CONCURRENT_LOGINS * delay)
+        # 업스트림을 기다리는 동안 워커(이벤트 루프)는 다른 일을 할 수 있어야 한다.
+        self.assertLess(longest_block, delay)
@@ -1,23 +1,34 @@
-import jwt
-import requests
-from django.conf import settings
+import json
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import logout, authenticate, login
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status, generics
-from rest_framework.exceptions import ParseError
-from rest_framework.generics import get_object_or_404, GenericAPIView
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.generics import GenericAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import get_versions
+from common.conditional import ConditionalGetMixin
+from config.authentication import create_jwt
 from reviews.models import Review
 from reviews.paginations import ReviewPagination
 from reviews.serializers import ReviewSerializer
 from rooms.models import Room
 from rooms.paginations import HostRoomPagination
 from rooms.serializers import HostRoomSerializer
+from rooms.stats import with_room_stats
 from . import serializers
 from .models import User
+from .oauth import OAuthError, fetch_github_profile, fetch_kakao_account
+from .profiles import get_public_profile, get_user_pk
 
 
 class Me(APIView):
@@ -51,11 +62,25 @@ class Users(APIView):
         return Response(serializer.data)
 
 
-class PublicUser(APIView):
+def profile_validators(username):
+    # 프로필과 유저가 쓴 리뷰 목록은 users.signals 가 올리는 프로필 버전으로 바뀜을 안다.
+    pk = get_user_pk(username)
+    if pk is None:
+        return None, None
+    return get_versions("users", f"users:{pk}"), None
+
+
+class PublicUser(ConditionalGetMixin, APIView):
+    versioned = True
+
+    def get_validators(self, request, username):
+        return profile_validators(username)
+
     def get(self, request, username):
-        user = get_object_or_404(User, username=username)
-        serializer = serializers.PublicUserSerializer(user)
-        return Response(serializer.data)
+        profile = get_public_profile(username)
+        if profile is None:
+            raise NotFound
+        return Response(profile)
 
 
 class ChangePassword(APIView):
@@ -71,6 +96,7 @@ class ChangePassword(APIView):
         if user.check_password(old_password):
             user.set_password(new_password)
             user.save()
+            user.revoke_tokens()
             return Response(status=status.HTTP_200_OK)
         else:
             raise ParseError
@@ -99,14 +125,20 @@ class LogOut(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        # 이미 발급된 JWT 도 더는 쓰지 못하게 한다.
+        request.user.revoke_tokens()
         logout(request)
         return Response({"ok": "bye!"})
 
 
-class UserReviews(generics.ListAPIView):
+class UserReviews(ConditionalGetMixin, generics.ListAPIView):
+    versioned = True
     serializer_class = ReviewSerializer
     pagination_class = ReviewPagination
 
+    def get_validators(self, request, username):
+        return profile_validators(username)
+
     def get_queryset(self):
         username = self.kwargs.get("username")
         if User.objects.filter(username=username).exists():
@@ -124,7 +156,7 @@ class HostRooms(generics.ListAPIView):
         username = self.kwargs.get("username")
         if User.objects.filter(username=username).exists():
             queryset = Room.objects.filter(owner__username=username).order_by("-created_at")
-            return queryset
+            return with_room_stats(queryset)
         else:
             raise ParseError(f"No user with that nickname({username}) exists.")
 
@@ -141,96 +173,89 @@ class JWTLogIn(APIView):
             password=password,
         )
         if user:
-            # 유저가 복호화 할 수 있기 때문에 중요정보는 넣지 않음
-            token = jwt.encode(
-                {"pk": user.pk},
-                settings.SECRET_KEY,
-                algorithm="HS256",
-            )
-            return Response({"token": token})
+            return Response({"token": create_jwt(user)})
         else:
             return Response({"error": "wrong password"})
 
 
-class GithubLogIn(APIView):
-    def post(self, request):
+def get_code(request):
+    if request.content_type == "application/json":
         try:
-            code = request.data.get("code")
-            url = f"https://github.com/login/oauth/access_token?code={code}&client_id=3429bbb417261e7ad92f&client_secret={settings.GH_SECRET}"
-            gh_response = requests.post(url, headers={"Accept": "application/json"})
-            access_token = gh_response.json().get('access_token')
-            user_data = requests.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json"
-                }
-            )
-            user_data = user_data.json()
-            # github email이 private인 것을 받아오기 위함
-            user_emails = requests.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json"
-                }
-            )
-            user_emails = user_emails.json()
-            try:
-                user = User.objects.get(email=user_emails[0]["email"])
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=user_data.get('login'),
-                    email=user_emails[0]['email'],
-                    name=user_data.get('name'),
-                    avatar=user_data.get('avatar_url'),
-                )
-                user.set_unusable_password()
-                user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-
-
-class KakaoLogIn(APIView):
-    def post(self, request):
-        code = request.data.get("code")
-        access_token = requests.post(
-            "https://kauth.kakao.com/oauth/token",
-            headers={"Content-type": "application/x-www-form-urlencoded;charset=utf-8"},
-            data={
-                "grant_type": "authorization_code",
-                "client_id": "483f1759e6da568fa36ef312e6ea4396",
-                "redirect_uri": "http://127.0.0.1:3000/social/kakao",
-                "code": code
-            }
-        )
-        access_token = access_token.json().get('access_token')
-        user_data = requests.post(
-            "https://kapi.kakao.com/v2/user/me",
-            headers={
-                "Authorization": f"Bearer ${access_token}",
-                "Content-type": "application/x-www-form-urlencoded;charset=utf-8"
-            }
+            return json.loads(request.body).get("code")
+        except (ValueError, AttributeError):
+            return None
+    return request.POST.get("code")
+
+
+async def log_in_social_user(request, email, **fields):
+    """
+    email 로 유저를 찾아 로그인시키고, 없으면 만든다. email 이 없거나 username 이 이미 쓰여
+    만들 수 없으면 False 를 돌려준다. (뷰는 400 으로 답한다)
+    """
+    if not email:
+        return False
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        user = await sync_to_async(create_social_user)(email, **fields)
+        if user is None:
+            return False
+    await sync_to_async(login)(request, user)
+    return True
+
+
+def create_social_user(email, **fields):
+    user = User(email=email, **fields)
+    user.set_unusable_password()
+    try:
+        # 실패해도 바깥 트랜잭션을 깨지 않도록 savepoint 안에서 저장한다.
+        with transaction.atomic():
+            user.save()
+    except IntegrityError:
+        return None
+    return user
+
+
+# 외부 OAuth 서버를 기다리는 동안 워커를 붙잡지 않도록 async 뷰로 둔다. (config.asgi 로 서빙)
+@method_decorator(csrf_exempt, name="dispatch")
+class GithubLogIn(View):
+    async def post(self, request):
+        code = get_code(request)
+        if not code:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user_data, user_emails = await fetch_github_profile(code)
+        except OAuthError:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        logged_in = await log_in_social_user(
+            request,
+            email=user_emails[0].get("email") if user_emails else None,
+            username=user_data.get("login"),
+            name=user_data.get("name") or "",
+            avatar=user_data.get("avatar_url") or "",
         )
-        user_data = user_data.json()
-        kakao_account = user_data.get('kakao_account')
-        profile = kakao_account.get('profile')
+        if not logged_in:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        return HttpResponse(status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class KakaoLogIn(View):
+    async def post(self, request):
+        code = get_code(request)
+        if not code:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
         try:
-            user = User.objects.get(email=kakao_account.get('email'))
-            login(request, user)
-            return Response(status=status.HTTP_200_OK)
-        except User.DoesNotExist:
-            user = User.objects.create(
-                email=kakao_account.get('email'),
-                username=profile.get('nickname'),
-                name=profile.get('nickname'),
-                avatar=profile.get('profile_image_url')
-            )
-            user.set_unusable_password()
-            user.save()
-            login(request, user)
-        return Response(status=status.HTTP_200_OK)
+            kakao_account = await fetch_kakao_account(code)
+        except OAuthError:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        profile = kakao_account.get("profile", {})
+        logged_in = await log_in_social_user(
+            request,
+            email=kakao_account.get("email"),
+            username=profile.get("nickname"),
+            name=profile.get("nickname") or "",
+            avatar=profile.get("profile_image_url") or "",
+        )
+        if not logged_in:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        return HttpResponse(status=status.HTTP_200_OK)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from common.cache import bump_versions, get_versions
+from .models import Wishlist
+
+
+def liked_version_name(user_pk):
+    return f"wishlists:user:{user_pk}"
+
+
+def load_liked_ids(user):
+    """유저의 모든 위시리스트에 담긴 방/체험 pk 를 두 번의 쿼리로 읽어온다."""
+    return {
+        "rooms": set(
+            Wishlist.rooms.through.objects.filter(wishlist__user=user).values_list("room_id", flat=True)
+        ),
+        "experiences": set(
+            Wishlist.experiences.through.objects.filter(wishlist__user=user).values_list("experience_id", flat=True)
+        ),
+    }
+
+
+def get_liked_ids(request):
+    """
+    is_liked 판단에 쓰는 {"rooms": set, "experiences": set}.
+    요청 하나에서는 한 번만 만들고, 유저별로 캐시해두었다가 위시리스트가 바뀌면 버전을 올려 무효화한다.
+    """
+    liked = getattr(request, "_liked_ids", None)
+    if liked is not None:
+        return liked
+    user = request.user
+    if not user.is_authenticated:
+        liked = {"rooms": set(), "experiences": set()}
+    else:
+        (version,) = get_versions(liked_version_name(user.pk))
+        key = f"wishlists:liked:{user.pk}:{version}"
+        liked = cache.get(key)
+        if liked is None:
+            liked = load_liked_ids(user)
+            cache.set(key, liked, settings.DETAIL_CACHE_TIMEOUT)
+    request._liked_ids = liked
+    return liked
+
+
+def viewer_versions(request):
+    """is_owner/is_liked 처럼 보는 사람마다 다른 필드가 있는 응답의 ETag 에 넣는 값. (유저, 위시리스트 버전)"""
+    user = request.user
+    if not user.is_authenticated:
+        return ["anonymous"]
+    return [user.pk, *get_versions(liked_version_name(user.pk))]
+
+
+def invalidate_liked_ids(*user_pks):
+    bump_versions(*(liked_version_name(pk) for pk in user_pks))
@@ -1,3 +1,4 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 
 from experiences.serializers import ExperienceWishListSerializer
@@ -25,3 +26,31 @@ class WishlistSerializer(ModelSerializer):
             "rooms",
             "experiences",
         )
+
+
+class WishlistSummarySerializer(ModelSerializer):
+    """목록 화면용(?summary=1). 전체 항목 대신 개수와 앞쪽 몇 개(preview)만 싣는다. (Wishlists.get_queryset 의 annotate/prefetch 필요)"""
+
+    rooms_count = serializers.IntegerField(read_only=True)
+    experiences_count = serializers.IntegerField(read_only=True)
+    rooms = RoomListSerializer(
+        source="preview_rooms",
+        many=True,
+        read_only=True,
+    )
+    experiences = ExperienceWishListSerializer(
+        source="preview_experiences",
+        many=True,
+        read_only=True,
+    )
+
+    class Meta:
+        model = Wishlist
+        fields = (
+            "pk",
+            "name",
+            "rooms_count",
+            "experiences_count",
+            "rooms",
+            "experiences",
+        )
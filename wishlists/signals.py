@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .liked import invalidate_liked_ids
+from .models import Wishlist
+
+
+@receiver(m2m_changed, sender=Wishlist.rooms.through)
+@receiver(m2m_changed, sender=Wishlist.experiences.through)
+def invalidate_liked_on_change(sender, instance, reverse, pk_set, **kwargs):
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_liked_ids(instance.user_id)
+    elif pk_set:
+        invalidate_liked_ids(*Wishlist.objects.filter(pk__in=pk_set).values_list("user_id", flat=True))
+
+
+@receiver(post_delete, sender=Wishlist)
+def invalidate_liked_on_delete(sender, instance, **kwargs):
+    invalidate_liked_ids(instance.user_id)
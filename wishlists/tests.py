@@ -1,3 +1,137 @@
-from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from .models import Wishlist
+
+
+class TestLikedIds(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="address",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.experiences = [
+            Experience.objects.create(
+                name=f"Experience {i}",
+                host=self.user,
+                price=100,
+                address="address",
+                start="10:00",
+                end="12:00",
+                description="desc",
+            )
+            for i in range(5)
+        ]
+        self.wishlist = Wishlist.objects.create(name="list", user=self.user)
+        self.wishlist.experiences.add(self.experiences[0], self.experiences[1])
+        self.client.force_authenticate(self.user)
+
+    def test_experience_list_resolves_is_liked_once(self):
+        with self.assertNumQueries(5):
+            # count + experiences + photos + liked rooms + liked experiences
+            response = self.client.get("/api/v1/experiences/")
+        liked = [experience["is_liked"] for experience in response.json()["results"]]
+        self.assertEqual(liked, [True, True, False])
+
+        with self.assertNumQueries(3):
+            # 두 번째 요청부터는 liked set 을 캐시에서 읽는다.
+            self.client.get("/api/v1/experiences/")
+
+    def test_toggle_invalidates_liked_set(self):
+        url = f"/api/v1/rooms/{self.room.pk}"
+        self.assertFalse(self.client.get(url).json()["is_liked"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.room.pk}")
+        self.assertTrue(self.client.get(url).json()["is_liked"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.room.pk}")
+        self.assertFalse(self.client.get(url).json()["is_liked"])
+
+
+class TestWishlists(APITestCase):
+    LISTS = 3
+    ITEMS = 10
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="test")
+        for i in range(self.LISTS):
+            wishlist = Wishlist.objects.create(name=f"list {i}", user=self.user)
+            for j in range(self.ITEMS):
+                wishlist.rooms.add(
+                    Room.objects.create(
+                        name=f"Room {i}-{j}",
+                        price=100,
+                        rooms=1,
+                        toilets=1,
+                        description="desc",
+                        address="address",
+                        kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                        owner=self.user,
+                    )
+                )
+                wishlist.experiences.add(
+                    Experience.objects.create(
+                        name=f"Experience {i}-{j}",
+                        host=self.user,
+                        price=100,
+                        address="address",
+                        start="10:00",
+                        end="12:00",
+                        description="desc",
+                    )
+                )
+        self.wishlist = Wishlist.objects.order_by("pk").first()
+        self.client.force_authenticate(self.user)
+
+    def test_full_lists_without_summary(self):
+        with self.assertNumQueries(7):
+            response = self.client.get("/api/v1/wishlists/")
+        data = response.json()
+
+        self.assertEqual(len(data), self.LISTS)
+        for wishlist in data:
+            self.assertNotIn("rooms_count", wishlist)
+            self.assertEqual(len(wishlist["rooms"]), self.ITEMS)
+            self.assertEqual(len(wishlist["experiences"]), self.ITEMS)
+
+    def test_summary_query_count(self):
+        # wishlists + preview rooms + their photos + preview experiences + their photos + liked rooms/experiences
+        with self.assertNumQueries(7):
+            response = self.client.get("/api/v1/wishlists/?summary=1")
+        data = response.json()
+
+        self.assertEqual(len(data), self.LISTS)
+        for wishlist in data:
+            self.assertEqual(wishlist["rooms_count"], self.ITEMS)
+            self.assertEqual(wishlist["experiences_count"], self.ITEMS)
+            self.assertEqual(len(wishlist["rooms"]), 4)
+            self.assertEqual(len(wishlist["experiences"]), 4)
+            self.assertTrue(all(experience["is_liked"] for experience in wishlist["experiences"]))
+
+    def test_items_paginated(self):
+        response = self.client.get(f"/api/v1/wishlists/{self.wishlist.pk}/rooms")
+        data = response.json()
+        self.assertEqual(data["count"], self.ITEMS)
+        self.assertEqual(data["results"][0]["name"], "Room 0-9")
+
+        response = self.client.get(f"/api/v1/wishlists/{self.wishlist.pk}/experiences")
+        self.assertEqual(response.json()["count"], self.ITEMS)
+
+        other = User.objects.create(username="other")
+        self.client.force_authenticate(other)
+        response = self.client.get(f"/api/v1/wishlists/{self.wishlist.pk}/rooms")
+        self.assertEqual(response.status_code, 404)
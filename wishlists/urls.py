@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import Wishlists, WishlistDetail, WishlistToggle
+from .views import Wishlists, WishlistDetail, WishlistRooms, WishlistExperiences, WishlistToggle
 
 urlpatterns = [
     path("", Wishlists.as_view()),
     path("<int:pk>", WishlistDetail.as_view()),
+    path("<int:pk>/rooms", WishlistRooms.as_view()),
+    path("<int:pk>/experiences", WishlistExperiences.as_view()),
     path("<int:pk>/rooms/<int:room_pk>", WishlistToggle.as_view()),
 ]
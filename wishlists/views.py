@@ -1,22 +1,73 @@
-from rest_framework import status
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import status, generics
 from rest_framework.generics import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from experiences.models import Experience
+from experiences.serializers import ExperienceWishListSerializer
 from rooms.models import Room
+from rooms.serializers import RoomListSerializer
 from .models import Wishlist
-from .serializers import WishlistSerializer
+from .paginations import WishlistItemPagination
+from .serializers import WishlistSerializer, WishlistSummarySerializer
+
+
+def count_items(through):
+    items = (
+        through.objects.filter(wishlist=OuterRef("pk"))
+        .order_by()
+        .values("wishlist")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(items), 0, output_field=IntegerField())
+
+
+def wishlist_rooms():
+    return Room.objects.prefetch_related("photos").order_by("-pk")
+
+
+def wishlist_experiences():
+    return Experience.objects.prefetch_related("photos").order_by("-pk")
 
 
 class Wishlists(APIView):
 
     permission_classes = [IsAuthenticated]
+    preview_size = 4
+
+    def get_queryset(self):
+        # 리스트/항목 수와 상관없이 쿼리 수가 일정하도록 개수는 서브쿼리, 미리보기는 잘린 prefetch 로 읽는다.
+        return Wishlist.objects.filter(user=self.request.user).annotate(
+            rooms_count=count_items(Wishlist.rooms.through),
+            experiences_count=count_items(Wishlist.experiences.through),
+        ).prefetch_related(
+            Prefetch(
+                "rooms",
+                queryset=wishlist_rooms()[:self.preview_size],
+                to_attr="preview_rooms",
+            ),
+            Prefetch(
+                "experiences",
+                queryset=wishlist_experiences()[:self.preview_size],
+                to_attr="preview_experiences",
+            ),
+        ).order_by("-pk")
 
     def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
-        serializer = WishlistSerializer(
-            all_wishlists,
+        if request.query_params.get("summary") not in ("1", "true"):
+            # 개수 + 미리보기 목록은 ?summary=1 로 고른다. 없으면 예전 클라이언트처럼 전체 항목을 싣는다.
+            wishlists = Wishlist.objects.filter(user=request.user).prefetch_related(
+                Prefetch("rooms", queryset=wishlist_rooms()),
+                Prefetch("experiences", queryset=wishlist_experiences()),
+            )
+            serializer = WishlistSerializer(wishlists, many=True, context={"request": request})
+            return Response(serializer.data)
+        serializer = WishlistSummarySerializer(
+            self.get_queryset(),
             many=True,
             context={"request": request},
         )
@@ -33,7 +84,14 @@ class WishlistDetail(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self, pk, user):
-        return get_object_or_404(Wishlist, pk=pk, user=user)
+        return get_object_or_404(
+            Wishlist.objects.prefetch_related(
+                Prefetch("rooms", queryset=wishlist_rooms()),
+                Prefetch("experiences", queryset=wishlist_experiences()),
+            ),
+            pk=pk,
+            user=user,
+        )
 
     def get(self, request, pk):
         wishlist = self.get_object(pk, request.user)
@@ -61,6 +119,26 @@ class WishlistDetail(APIView):
         return Response(serializer.data)
 
 
+class WishlistRooms(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = RoomListSerializer
+    pagination_class = WishlistItemPagination
+
+    def get_queryset(self):
+        wishlist = get_object_or_404(Wishlist, pk=self.kwargs["pk"], user=self.request.user)
+        return wishlist_rooms().filter(wishlists=wishlist)
+
+
+class WishlistExperiences(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ExperienceWishListSerializer
+    pagination_class = WishlistItemPagination
+
+    def get_queryset(self):
+        wishlist = get_object_or_404(Wishlist, pk=self.kwargs["pk"], user=self.request.user)
+        return wishlist_experiences().filter(wishlists=wishlist)
+
+
 class WishlistToggle(APIView):
     def get_list(self, pk, user):
         return get_object_or_404(Wishlist, pk=pk, user=user)